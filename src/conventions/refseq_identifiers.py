@@ -3,6 +3,7 @@ import re
 from exceptions.utils import (
     InvalidAccessionError,
     InvalidSequenceTypeError,
+    UnknownAccessionError,
 )
 
 
@@ -78,15 +79,23 @@ def translate_sequence_id(dp, expression):
         expression: An object containing sequence location info.
 
     Raises:
-        ValueError: If translation fails or if format is unexpected.
+        UnknownAccessionError: If the sequence is unknown to the data proxy or has no RefSeq alias.
+        ValueError: If the format is unexpected.
 
     Returns:
         str: A valid RefSeq identifier (e.g., NM_000123.3).
     """
     sequence = f"ga4gh:{expression.location.get_refget_accession()}"
-    translated_ids = dp.translate_sequence_identifier(sequence, namespace="refseq")
+    try:
+        translated_ids = dp.translate_sequence_identifier(sequence, namespace="refseq")
+    except KeyError as e:
+        raise UnknownAccessionError(
+            f"Unknown sequence ID '{sequence}'.", accession=sequence
+        ) from e
     if not translated_ids:
-        raise ValueError(f"No RefSeq ID found for sequence ID '{sequence}'.")
+        raise UnknownAccessionError(
+            f"No RefSeq ID found for sequence ID '{sequence}'.", accession=sequence
+        )
 
     translated_id = translated_ids[0]
     if not translated_id.startswith("refseq:"):
@@ -79,3 +79,8 @@ class InvalidFocusCodingSystem(FocusError):
 
 class InvalidFocusCodingDisplay(FocusError):
     """Raised when 'focus.coding.display' does not match its fixed value."""
+
+
+####################### PROFILE DISPATCH ######################################
+class UnknownProfileError(FHIRException):
+    """Raised when a MolecularDefinition cannot be matched to a supported profile."""
@@ -17,5 +17,29 @@ class InvalidAccessionError(Exception):
     """Raised when the provided RefSeq ID does not match the expected format."""
 
 
+class UnknownAccessionError(ValueError):
+    """Raised when a sequence accession is unknown to the data proxy or has no RefSeq alias."""
+
+    def __init__(self, message, accession=None):
+        super().__init__(message)
+        self.accession = accession
+
+    def __reduce__(self):
+        # Keep `accession` when the error is pickled back from a worker process.
+        return type(self), (*self.args, self.accession)
+
+
 class InvalidCoordinateSystemError(Exception):
     """Raised when an invalid coordinate system is specified."""
+
+
+class ReferenceWindowExhaustedError(Exception):
+    """Raised when normalization needs reference bases outside the in-memory window it was given."""
+
+    def __init__(self, message, side=None):
+        super().__init__(message)
+        self.side = side
+
+    def __reduce__(self):
+        # Keep `side` when the error is pickled back from a worker process.
+        return type(self), (*self.args, self.side)
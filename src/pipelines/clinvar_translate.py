@@ -1,15 +1,30 @@
 import argparse
 import gzip
 import logging
+import sys
 import time
-from dataclasses import dataclass
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 import orjson
 from ga4gh.vrs.models import Allele
 
+from conventions.refseq_identifiers import translate_sequence_id
+from exceptions.utils import UnknownAccessionError
+from pipelines.progress import ProgressReporter
+from pipelines.sharding import ShardedJsonlWriter, shard_for, shard_key
+from translators.translation_cache import TranslationCache
 from translators.vrs_to_fhir_allele import VrsToFhirAlleleTranslator
+from vrs_tools.alias_index import AliasIndexDataProxy, RefgetAliasIndex
+from vrs_tools.dataproxy import (
+    NegativeCacheDataProxy,
+    PersistentCacheDataProxy,
+    seqrepo_snapshot_id,
+)
 
 
 @dataclass
@@ -27,105 +42,436 @@ class ClinvarTranslationSummary:
     failed_vrs_allele_validation: int
     failed_vrs_to_fhir_translation: int
     total_failed: int
+    quarantined: int = 0
+    unknown_accessions: dict = field(default_factory=dict)
+
+
+def expanded_sequence_length(vo):
+    """Return the length of the sequence an Allele's state expands to when translated.
+
+    For a ReferenceLengthExpression this is the length of the denormalized repeat, which is what
+    makes huge RLEs expensive to translate; for a LiteralSequenceExpression it is the literal.
+    """
+    state = vo.state
+    if state.type == "ReferenceLengthExpression":
+        return state.length
+    sequence = getattr(state, "sequence", None)
+    return len(sequence.root) if sequence is not None else 0
+
+
+def parse_partition(value):
+    """Parse an `i/M` partition spec into `(i, M)`.
+
+    Args:
+        value (str): The partition spec, with `0 <= i < M`.
+
+    Raises:
+        argparse.ArgumentTypeError: If the spec is malformed or out of range.
+
+    Returns:
+        tuple[int, int]: The partition index and the number of partitions.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"Invalid partition {value!r}, expected i/M."
+        ) from e
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError(
+            f"Invalid partition {value!r}, expected 0 <= i < M."
+        )
+    return index, count
+
+
+def partition_owner(line_num, record, num_partitions):
+    """Return the partition that owns an input line.
+
+    Records are assigned by a stable hash of their variation id; lines that are not
+    records with an id (including undecodable ones) fall back to line-number modulo.
+
+    Args:
+        line_num (int): The 1-based input line number.
+        record (dict | None): The decoded record, or None to assign by line number.
+        num_partitions (int): The number of partitions.
+
+    Returns:
+        int: The owning partition in `range(num_partitions)`.
+    """
+    variation_id = record.get("id") if isinstance(record, dict) else None
+    if variation_id is None:
+        return (line_num - 1) % num_partitions
+    return shard_for(str(variation_id), num_partitions)
+
+
+def load_summary(path):
+    """Load a `ClinvarTranslationSummary` written by `ClinvarTranslationPipeline.run`."""
+    with open(path, "rb") as f:
+        return ClinvarTranslationSummary(**orjson.loads(f.read()))
+
+
+def merge_unknown_accessions(summaries):
+    """Sum the per-accession failure counts of several summaries, most frequent first."""
+    counts = Counter()
+    for summary in summaries:
+        counts.update(summary.unknown_accessions)
+    return dict(counts.most_common())
+
+
+def merge_summaries(summaries):
+    """Combine the summaries of partitioned runs over one input into a single summary.
+
+    Counts are summed; the merged run spans from the earliest start to the latest end.
+
+    Args:
+        summaries (list[ClinvarTranslationSummary]): The per-partition summaries.
+
+    Raises:
+        ValueError: If no summaries are given or they describe different input files.
+
+    Returns:
+        ClinvarTranslationSummary: The combined summary.
+    """
+    if not summaries:
+        raise ValueError("No summaries to merge.")
+    file_names = {summary.file_name for summary in summaries}
+    if len(file_names) != 1:
+        raise ValueError(f"Summaries describe different inputs: {sorted(file_names)}.")
+
+    started = min(
+        datetime.fromisoformat(f"{s.start_date}T{s.start_time}") for s in summaries
+    )
+    ended = max(datetime.fromisoformat(f"{s.end_date}T{s.end_time}") for s in summaries)
+
+    allele_types = {}
+    for summary in summaries:
+        for key, count in summary.vrs_allele_types.items():
+            allele_types[key] = allele_types.get(key, 0) + count
+
+    def total(field):
+        return sum(getattr(summary, field) for summary in summaries)
+
+    return ClinvarTranslationSummary(
+        file_name=file_names.pop(),
+        start_date=started.date().isoformat(),
+        start_time=started.time().isoformat(timespec="seconds"),
+        end_date=ended.date().isoformat(),
+        end_time=ended.time().isoformat(timespec="seconds"),
+        duration_seconds=round((ended - started).total_seconds(), 2),
+        total_lines_read=total("total_lines_read"),
+        vrs_allele_seen=total("vrs_allele_seen"),
+        vrs_allele_types=allele_types,
+        total_translated=total("total_translated"),
+        failed_vrs_allele_validation=total("failed_vrs_allele_validation"),
+        failed_vrs_to_fhir_translation=total("failed_vrs_to_fhir_translation"),
+        total_failed=total("total_failed"),
+        quarantined=total("quarantined"),
+        unknown_accessions=merge_unknown_accessions(summaries),
+    )
+
+
+def merge_summaries_main():
+    parser = argparse.ArgumentParser(
+        prog="merge-translation-summaries",
+        description="Combine the runtime summaries of partitioned ClinVar translation runs",
+    )
+    parser.add_argument("summaries", nargs="+", help="Per-partition summary files")
+    parser.add_argument("--output", default="runtime_stats.txt")
+    args = parser.parse_args()
+
+    merged = merge_summaries([load_summary(path) for path in args.summaries])
+    with open(args.output, "wb") as f:
+        f.write(orjson.dumps(merged, option=orjson.OPT_INDENT_2) + b"\n")
+
+
+@dataclass
+class TranslationResult:
+    """The outcome of translating one ClinVar Allele member.
+
+    `kind` is one of "translated", "invalid_allele", "invalid_fhir", "quarantined" or
+    "decode_error". `record`
+    is the JSON record `run` writes for it (None for decode errors), `state_type` the VRS state
+    type of the allele before denormalization, and `allele` the validated VRS Allele, if any.
+    """
+
+    kind: str
+    line: int
+    record: dict | None = None
+    state_type: str | None = None
+    allele: Allele | None = field(default=None, repr=False)
 
 
 class ClinvarTranslationPipeline:
-    def __init__(self):
-        self.vrs_translator = VrsToFhirAlleleTranslator()
+    """Translate ClinVar variation records to FHIR Alleles.
+
+    Pathological members can be kept out of the main stream with a per-record budget. Members
+    whose state expands to more than `max_sequence_length` bases are quarantined before they
+    are translated, and members whose translation takes longer than `time_budget` seconds are
+    quarantined (with their timing and translation) instead of being written to the output.
+    """
+
+    def __init__(
+        self,
+        dp=None,
+        uri: str | None = None,
+        cache=None,
+        max_sequence_length: int | None = None,
+        time_budget: float | None = None,
+    ):
+        self.vrs_translator = VrsToFhirAlleleTranslator(dp=dp, uri=uri, cache=cache)
+        self.max_sequence_length = max_sequence_length
+        self.time_budget = time_budget
+        # refget accession -> RefSeq accession (or None), for the columnar output.
+        self._refseq_ids = {}
+
+    def _lookup_refseq_id(self, vo):
+        """Return the RefSeq accession for an allele's sequence, or None if it has no alias.
+
+        Results are remembered per refget accession, so the data proxy is asked once per
+        sequence rather than once per translated record.
+        """
+        refget_accession = vo.location.get_refget_accession()
+        try:
+            return self._refseq_ids[refget_accession]
+        except KeyError:
+            pass
+        try:
+            refseq_id = translate_sequence_id(dp=self.vrs_translator.dp, expression=vo)
+        except (KeyError, ValueError):
+            refseq_id = None
+        self._refseq_ids[refget_accession] = refseq_id
+        return refseq_id
+
+    def iter_translations(self, source, first_line=1, numbered=False):
+        """Lazily translate ClinVar variation records, yielding one result per Allele member.
+
+        Records are pulled from `source` one at a time, so memory use does not grow with the input.
+        Lines that are not valid JSON objects yield a single `decode_error` result.
+
+        Args:
+            source (Iterable): ClinVar variation records as JSON lines (bytes or str) or parsed dicts.
+            first_line (int): The line number of the first record.
+            numbered (bool): If True, `source` yields `(line_num, record)` pairs instead.
+
+        Yields:
+            TranslationResult: The outcome of each Allele member, in input order.
+        """
+        items = source if numbered else enumerate(source, first_line)
+        for line_num, obj in items:
+            if isinstance(obj, bytes | bytearray | memoryview | str):
+                try:
+                    obj = orjson.loads(obj)
+                except orjson.JSONDecodeError:
+                    obj = None
+            if not isinstance(obj, dict):
+                logging.warning("[Line %d] Skipping: JSON decode error", line_num)
+                yield TranslationResult(kind="decode_error", line=line_num)
+                continue
+
+            for member in obj.get("members", []):
+                if not (isinstance(member, dict) and member.get("type") == "Allele"):
+                    continue
+                try:
+                    vo = Allele(**member)
+                except Exception as e:
+                    yield TranslationResult(
+                        kind="invalid_allele",
+                        line=line_num,
+                        record={"line": line_num, "error": str(e), "member": member},
+                    )
+                    continue
+
+                state_type = vo.state.type
+                vrs_dict = vo.model_dump(exclude_none=True)
+
+                if self.max_sequence_length is not None:
+                    length = expanded_sequence_length(vo)
+                    if length > self.max_sequence_length:
+                        yield TranslationResult(
+                            kind="quarantined",
+                            line=line_num,
+                            record={
+                                "line": line_num,
+                                "reason": "size",
+                                "sequence_length": length,
+                                "vrs_allele": vrs_dict,
+                            },
+                            state_type=state_type,
+                            allele=vo,
+                        )
+                        continue
+
+                started = time.perf_counter()
+                try:
+                    fhir_dict = self.vrs_translator.translate_to_dict(vo)
+                except Exception as e:
+                    record = {"line": line_num, "error": str(e), "vrs_allele": vrs_dict}
+                    if isinstance(e, UnknownAccessionError):
+                        record["unknown_accession"] = e.accession
+                    yield TranslationResult(
+                        kind="invalid_fhir",
+                        line=line_num,
+                        record=record,
+                        state_type=state_type,
+                        allele=vo,
+                    )
+                    continue
+                elapsed = time.perf_counter() - started
+
+                if self.time_budget is not None and elapsed > self.time_budget:
+                    yield TranslationResult(
+                        kind="quarantined",
+                        line=line_num,
+                        record={
+                            "line": line_num,
+                            "reason": "time",
+                            "seconds": round(elapsed, 6),
+                            "vrs_allele": vrs_dict,
+                            "fhir_allele": fhir_dict,
+                        },
+                        state_type=state_type,
+                        allele=vo,
+                    )
+                    continue
+
+                yield TranslationResult(
+                    kind="translated",
+                    line=line_num,
+                    record={
+                        "line": line_num,
+                        "vrs_allele": vrs_dict,
+                        "fhir_allele": fhir_dict,
+                    },
+                    state_type=state_type,
+                    allele=vo,
+                )
+
+    def _select_partition(self, lines, partition, partition_by):
+        """Keep only the `(line_num, line)` pairs owned by `partition`.
+
+        When partitioning by id, lines are decoded here and passed on as parsed records.
+        """
+        index, count = partition
+        for line_num, line in lines:
+            if partition_by == "line":
+                if partition_owner(line_num, None, count) == index:
+                    yield line_num, line
+                continue
+            try:
+                obj = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                obj = None
+            if partition_owner(line_num, obj, count) == index:
+                yield line_num, line if obj is None else obj
 
     def run(
-        self, inputfile, outputfile, invalid_allele_path, invalid_fhir_path, limit=None
+        self,
+        inputfile,
+        outputfile,
+        invalid_allele_path,
+        invalid_fhir_path,
+        limit=None,
+        columnar_sink=None,
+        sharded_writer=None,
+        partition=None,
+        partition_by="line",
+        stats_path="runtime_stats.txt",
+        first_line=1,
+        progress=None,
+        quarantine_path="quarantined_alleles.jsonl",
     ):
         started_at_wall = datetime.now()
         t0 = time.perf_counter()
 
         invalid_allele_log = open(invalid_allele_path, "ab")
         invalid_fhir_trans_log = open(invalid_fhir_path, "ab")
-        stats = open("runtime_stats.txt", "wb")
+        quarantine_log = None
+        stats = open(stats_path, "wb")
 
         total_translated = 0
         failed_vrs_allele_validation = 0
         failed_vrs_to_fhir_translation = 0
+        quarantined = 0
+        unknown_accessions = Counter()
         total_lines_read = 0
         vrs_allele_seen = 0
         allele_type = {"lse_count": 0, "rle_count": 0, "other_count": 0}
 
+        def read_lines(lines):
+            nonlocal total_lines_read
+            for entry in lines:
+                total_lines_read += 1
+                if progress is not None:
+                    progress.tick()
+                yield entry
+
         try:
-            with open(outputfile, "ab") as out_f:
-                with gzip.open(inputfile, "rt", encoding="utf-8") as f:
-                    for line_num, line in enumerate(f, 1):
-                        if limit is not None and line_num > limit:
-                            break
-
-                        total_lines_read += 1
-
-                        try:
-                            obj = orjson.loads(line)
-                            members = obj.get("members", [])
-                        except orjson.JSONDecodeError:
-                            logging.warning(
-                                "[Line %d] Skipping: JSON decode error", line_num
-                            )
-                            continue
-
-                        for member in members:
-                            if not (
-                                isinstance(member, dict)
-                                and member.get("type") == "Allele"
-                            ):
-                                continue
-                            vrs_allele_seen += 1
-                            try:
-                                vo = Allele(**member)
-
-                            except Exception as e:
-                                failed_vrs_allele_validation += 1
-
-                                invalid_allele = {
-                                    "line": line_num,
-                                    "error": str(e),
-                                    "member": member,
-                                }
-                                invalid_allele_log.write(
-                                    orjson.dumps(invalid_allele) + b"\n"
-                                )
-                                continue
-
-                            state_type = vo.state.type
-
-                            if "LiteralSequenceExpression" in state_type:
-                                allele_type["lse_count"] += 1
-                            elif "ReferenceLengthExpression" in state_type:
-                                allele_type["rle_count"] += 1
-                            else:
-                                allele_type["other_count"] += 1
-
-                            try:
-                                fhir_obj = self.vrs_translator.translate(
-                                    vo
-                                )
-
-                                valid_translation = {
-                                    "line": line_num,
-                                    "vrs_allele": vo.model_dump(exclude_none=True),
-                                    "fhir_allele": fhir_obj.model_dump(
-                                        exclude_none=True
-                                    ),
-                                }
-                                total_translated += 1
-                                out_f.write(orjson.dumps(valid_translation) + b"\n")
-
-                            except Exception as e:
-                                failed_vrs_to_fhir_translation += 1
-
-                                invalid_translation = {
-                                    "line": line_num,
-                                    "error": str(e),
-                                    "vrs_allele": vo.model_dump(exclude_none=True),
-                                }
-                                invalid_fhir_trans_log.write(
-                                    orjson.dumps(invalid_translation) + b"\n"
-                                )
+            out_ctx = (
+                open(outputfile, "ab") if sharded_writer is None else nullcontext()
+            )
+            with (
+                out_ctx as out_f,
+                open(inputfile, "rb") as raw,
+                gzip.GzipFile(fileobj=raw) as f,
+            ):
+                if progress is not None:
+                    progress.attach(raw)
+                lines = islice(enumerate(f, first_line), limit)
+                if partition is not None:
+                    lines = self._select_partition(lines, partition, partition_by)
+
+                for result in self.iter_translations(read_lines(lines), numbered=True):
+                    if result.kind == "decode_error":
+                        continue
+                    if progress is not None:
+                        progress.record(result.kind)
+
+                    vrs_allele_seen += 1
+                    if result.kind == "invalid_allele":
+                        failed_vrs_allele_validation += 1
+                        invalid_allele_log.write(orjson.dumps(result.record) + b"\n")
+                        continue
+
+                    if "LiteralSequenceExpression" in result.state_type:
+                        allele_type["lse_count"] += 1
+                    elif "ReferenceLengthExpression" in result.state_type:
+                        allele_type["rle_count"] += 1
+                    else:
+                        allele_type["other_count"] += 1
+
+                    if result.kind == "invalid_fhir":
+                        failed_vrs_to_fhir_translation += 1
+                        if "unknown_accession" in result.record:
+                            unknown_accessions[result.record["unknown_accession"]] += 1
+                        invalid_fhir_trans_log.write(
+                            orjson.dumps(result.record) + b"\n"
+                        )
+                        continue
+
+                    if result.kind == "quarantined":
+                        quarantined += 1
+                        if quarantine_log is None:
+                            quarantine_log = open(quarantine_path, "ab")  # noqa: SIM115
+                        quarantine_log.write(orjson.dumps(result.record) + b"\n")
+                        continue
+
+                    total_translated += 1
+                    record = orjson.dumps(result.record) + b"\n"
+                    if sharded_writer is not None:
+                        sharded_writer.write(
+                            shard_key(result.record["vrs_allele"]), record
+                        )
+                    else:
+                        out_f.write(record)
+
+                    if columnar_sink is not None:
+                        columnar_sink.write(
+                            line_num=result.line,
+                            vrs_allele=result.record["vrs_allele"],
+                            fhir_allele=result.record["fhir_allele"],
+                            state_type=result.state_type,
+                            refseq_id=self._lookup_refseq_id(result.allele),
+                        )
         finally:
             t1 = time.perf_counter()
             ended_at_wall = datetime.now()
@@ -146,13 +492,20 @@ class ClinvarTranslationPipeline:
                 failed_vrs_to_fhir_translation=failed_vrs_to_fhir_translation,
                 total_failed=failed_vrs_allele_validation
                 + failed_vrs_to_fhir_translation,
+                quarantined=quarantined,
+                unknown_accessions=dict(unknown_accessions.most_common()),
             )
 
             stats.write(orjson.dumps(final_stats, option=orjson.OPT_INDENT_2) + b"\n")
             stats.close()
 
+            if progress is not None:
+                progress.report(final=True)
+
             invalid_allele_log.close()
             invalid_fhir_trans_log.close()
+            if quarantine_log is not None:
+                quarantine_log.close()
 
     def main(self):
         parser = argparse.ArgumentParser(
@@ -168,19 +521,226 @@ class ClinvarTranslationPipeline:
         parser.add_argument(
             "--verbose", action="store_true", help="Enable detailed logging"
         )
+        parser.add_argument(
+            "--columnar-output",
+            help="Also write translations to this Parquet or Arrow IPC file (requires pyarrow)",
+        )
+        parser.add_argument(
+            "--columnar-format",
+            choices=["parquet", "arrow"],
+            default="parquet",
+            help="File format for --columnar-output",
+        )
+        parser.add_argument(
+            "--row-group-size",
+            type=int,
+            default=50_000,
+            help="Rows per Parquet row group / Arrow record batch",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            help="Write translations to this many files partitioned by a stable hash of the VRS allele id",
+        )
+        parser.add_argument(
+            "--shard-dir",
+            default="vrs_to_fhir_translations",
+            help="Directory for --shards output and its manifest.json",
+        )
+        parser.add_argument(
+            "--output",
+            default="vrs_to_fhir_translations.jsonl",
+            help="Path of the translation output",
+        )
+        parser.add_argument(
+            "--summary-path",
+            default="runtime_stats.txt",
+            help="Path of the run summary",
+        )
+        parser.add_argument(
+            "--partition",
+            type=parse_partition,
+            help="Process only partition i of M (0 <= i < M) of the input records",
+        )
+        parser.add_argument(
+            "--partition-by",
+            choices=["line", "id"],
+            default="line",
+            help="Assign records to partitions by line number or by a hash of the variation id",
+        )
+        parser.add_argument(
+            "--progress",
+            action="store_true",
+            help="Report progress, throughput and ETA to stderr",
+        )
+        parser.add_argument(
+            "--status-file",
+            help="Periodically rewrite this JSON file with progress, throughput and ETA",
+        )
+        parser.add_argument(
+            "--progress-interval",
+            type=float,
+            default=30.0,
+            help="Seconds between progress reports",
+        )
+        parser.add_argument(
+            "--translation-cache",
+            help="SQLite file memoizing VRS -> FHIR translations across runs",
+        )
+        parser.add_argument(
+            "--max-sequence-length",
+            type=int,
+            help="Quarantine members whose state expands to more than this many bases, untranslated",
+        )
+        parser.add_argument(
+            "--time-budget",
+            type=float,
+            help="Quarantine members that take longer than this many seconds to translate",
+        )
+        parser.add_argument(
+            "--quarantine-log",
+            default="quarantined_alleles.jsonl",
+            help="Path of the over-budget member log",
+        )
+        parser.add_argument(
+            "--dataproxy-cache",
+            help="SQLite file memoizing SeqRepo lookups across runs and processes",
+        )
+        parser.add_argument(
+            "--seqrepo-snapshot",
+            help="SeqRepo snapshot id stamped on --dataproxy-cache (derived from local SeqRepo URIs if omitted)",
+        )
+        parser.add_argument(
+            "--negative-cache-ttl",
+            type=float,
+            default=3600.0,
+            help="Seconds to remember sequence accessions the data proxy does not know (0 disables)",
+        )
+        parser.add_argument(
+            "--alias-index",
+            help="Refget -> RefSeq alias index consulted before the data proxy (see vrs_tools/alias_index.py)",
+        )
+        parser.add_argument(
+            "--estimate",
+            action="store_true",
+            help="Print a projected wall time, peak RSS and output size from a sample instead of translating",
+        )
+        parser.add_argument(
+            "--estimate-sample",
+            type=int,
+            default=1000,
+            help="Number of lines --estimate samples from across the input",
+        )
+        parser.add_argument(
+            "--estimate-workers",
+            type=int,
+            default=1,
+            help="Worker count --estimate projects for",
+        )
 
         args = parser.parse_args()
 
         logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+        dataproxy_cache = None
+        if args.dataproxy_cache:
+            snapshot_id = args.seqrepo_snapshot or seqrepo_snapshot_id()
+            if not snapshot_id:
+                parser.error(
+                    "--dataproxy-cache needs --seqrepo-snapshot for this data proxy"
+                )
+            dataproxy_cache = PersistentCacheDataProxy(
+                self.vrs_translator.dp, args.dataproxy_cache, snapshot_id
+            )
+            self.vrs_translator.use_dataproxy(dataproxy_cache)
+
+        if args.negative_cache_ttl > 0:
+            self.vrs_translator.use_dataproxy(
+                NegativeCacheDataProxy(
+                    self.vrs_translator.dp, ttl=args.negative_cache_ttl
+                )
+            )
+
+        alias_index = None
+        if args.alias_index:
+            alias_index = RefgetAliasIndex(args.alias_index)
+            self.vrs_translator.use_dataproxy(
+                AliasIndexDataProxy(self.vrs_translator.dp, alias_index)
+            )
+
+        if args.estimate:
+            from pipelines.estimate import estimate_run
+
+            estimate = estimate_run(
+                self,
+                args.input_gzip,
+                sample_size=args.estimate_sample,
+                workers=args.estimate_workers,
+            )
+            sys.stdout.buffer.write(
+                orjson.dumps(estimate, option=orjson.OPT_INDENT_2) + b"\n"
+            )
+            if dataproxy_cache is not None:
+                dataproxy_cache.close()
+            if alias_index is not None:
+                alias_index.close()
+            return
+
         logging.info("Starting Translation Job")
 
-        self.run(
-            inputfile=args.input_gzip,
-            outputfile="vrs_to_fhir_translations.jsonl",
-            invalid_allele_path=args.invalid_allele_log,
-            invalid_fhir_path=args.invalid_fhir_log,
-            limit=args.limit,
-        )
+        columnar_sink = None
+        if args.columnar_output:
+            from pipelines.columnar import ColumnarTranslationSink
+
+            columnar_sink = ColumnarTranslationSink(
+                args.columnar_output,
+                fmt=args.columnar_format,
+                row_group_size=args.row_group_size,
+            )
+
+        sharded_writer = None
+        if args.shards:
+            sharded_writer = ShardedJsonlWriter(args.shard_dir, args.shards)
+
+        if args.translation_cache:
+            self.vrs_translator.cache = TranslationCache(args.translation_cache)
+        self.max_sequence_length = args.max_sequence_length
+        self.time_budget = args.time_budget
+
+        progress = None
+        if args.progress or args.status_file:
+            progress = ProgressReporter(
+                interval=args.progress_interval,
+                stream=sys.stderr if args.progress else None,
+                status_path=args.status_file,
+            )
+
+        try:
+            self.run(
+                inputfile=args.input_gzip,
+                outputfile=args.output,
+                invalid_allele_path=args.invalid_allele_log,
+                invalid_fhir_path=args.invalid_fhir_log,
+                limit=args.limit,
+                columnar_sink=columnar_sink,
+                sharded_writer=sharded_writer,
+                partition=args.partition,
+                partition_by=args.partition_by,
+                stats_path=args.summary_path,
+                progress=progress,
+                quarantine_path=args.quarantine_log,
+            )
+        finally:
+            if sharded_writer is not None:
+                sharded_writer.close()
+            if columnar_sink is not None:
+                columnar_sink.close()
+            if self.vrs_translator.cache is not None:
+                self.vrs_translator.cache.close()
+            if dataproxy_cache is not None:
+                dataproxy_cache.close()
+            if alias_index is not None:
+                alias_index.close()
 
 
 if __name__ == "__main__":
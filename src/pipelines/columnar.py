@@ -0,0 +1,414 @@
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from ga4gh.vrs.dataproxy import create_dataproxy
+from ga4gh.vrs.models import (
+    Allele,
+    LiteralSequenceExpression,
+    SequenceLocation,
+    SequenceReference,
+)
+from ga4gh.vrs.normalize import denormalize_reference_length_expression
+
+from conventions.refseq_identifiers import detect_sequence_type
+from exceptions.utils import InvalidSequenceTypeError
+from profiles.allele import Allele as FhirAllele
+from translators.fhir_to_vrs_allele import FhirToVrsAlleleTranslator
+from translators.vrs_to_fhir_allele import VrsToFhirAlleleTranslator
+
+# Accession-like columns repeat heavily across a release, so they are written as
+# dictionary-encoded columns. Dictionaries only ever grow, which lets the Arrow IPC
+# file format emit them as deltas instead of replacing them per batch.
+DICTIONARY_COLUMNS = ("refget_accession", "refseq_id", "state_type", "molecule_type")
+
+TRANSLATION_SCHEMA = pa.schema(
+    [
+        ("line", pa.int64()),
+        ("vrs_id", pa.string()),
+        ("refget_accession", pa.dictionary(pa.int32(), pa.string())),
+        ("refseq_id", pa.dictionary(pa.int32(), pa.string())),
+        ("start", pa.int64()),
+        ("end", pa.int64()),
+        ("state_type", pa.dictionary(pa.int32(), pa.string())),
+        ("alt_sequence", pa.large_string()),
+        ("molecule_type", pa.dictionary(pa.int32(), pa.string())),
+        ("fhir_json", pa.large_string()),
+    ]
+)
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Column names expected in VRS Allele batches. `sequence` holds LiteralSequenceExpression
+# states; `length` and `repeat_subunit_length` hold ReferenceLengthExpression states.
+VRS_INPUT_COLUMNS = {
+    "id": "vrs_id",
+    "refget_accession": "refget_accession",
+    "start": "start",
+    "end": "end",
+    "sequence": "sequence",
+    "length": "length",
+    "repeat_subunit_length": "repeat_subunit_length",
+}
+
+# RefSeq sequence types (see `detect_sequence_type`) mapped to VRS MoleculeType values.
+VRS_MOLECULE_TYPES = {"DNA": "genomic", "RNA": "RNA", "protein": "protein"}
+
+
+def read_record_batches(path, batch_size=50_000):
+    """Yield record batches from a Parquet file or an Arrow IPC file.
+
+    Args:
+        path (str | Path): A `.parquet` file, or any other path read as an Arrow IPC file.
+        batch_size (int, optional): Maximum rows per Parquet batch. Defaults to 50_000.
+
+    Yields:
+        pyarrow.RecordBatch: Batches in file order.
+    """
+    if str(path).endswith(".parquet"):
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+        return
+
+    reader = ipc.open_file(path)
+    for i in range(reader.num_record_batches):
+        yield reader.get_batch(i)
+
+
+class ColumnarTranslationSink:
+    """Write translated alleles as Parquet row groups or Arrow IPC record batches.
+
+    Rows are buffered in memory and flushed every `row_group_size` rows, so memory use is
+    bounded by one row group regardless of the size of the input.
+    """
+
+    def __init__(self, path, fmt="parquet", row_group_size=50_000):
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(
+                f"Unsupported columnar format '{fmt}'. Expected one of {COLUMNAR_FORMATS}."
+            )
+        self.path = path
+        self.fmt = fmt
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+
+        self._columns = {field.name: [] for field in TRANSLATION_SCHEMA}
+        self._dictionaries = {name: {} for name in DICTIONARY_COLUMNS}
+
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(path, TRANSLATION_SCHEMA)
+        else:
+            self._writer = ipc.new_file(
+                path,
+                TRANSLATION_SCHEMA,
+                options=ipc.IpcWriteOptions(emit_dictionary_deltas=True),
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, line_num, vrs_allele, fhir_allele, state_type, refseq_id=None):
+        """Buffer one translated allele.
+
+        Args:
+            line_num (int): The input line the allele came from.
+            vrs_allele (dict): The VRS Allele as dumped by `model_dump(exclude_none=True)`.
+            fhir_allele (dict): The FHIR Allele as dumped by `model_dump(exclude_none=True)`.
+            state_type (str): The VRS state type of the allele before any denormalization.
+            refseq_id (str, optional): The RefSeq accession of the allele's sequence.
+        """
+        location = vrs_allele.get("location", {})
+        sequence_reference = location.get("sequenceReference", {})
+
+        row = {
+            "line": line_num,
+            "vrs_id": vrs_allele.get("id"),
+            "refget_accession": sequence_reference.get("refgetAccession"),
+            "refseq_id": refseq_id,
+            "start": location.get("start"),
+            "end": location.get("end"),
+            "state_type": state_type,
+            "alt_sequence": self._allele_state(fhir_allele),
+            "molecule_type": self._molecule_type(fhir_allele),
+            "fhir_json": orjson.dumps(fhir_allele).decode(),
+        }
+        for name, value in row.items():
+            self._columns[name].append(value)
+
+        if len(self._columns["line"]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows as one row group (Parquet) or record batch (Arrow)."""
+        num_rows = len(self._columns["line"])
+        if not num_rows:
+            return
+
+        arrays = [
+            self._dictionary_array(field.name)
+            if field.name in DICTIONARY_COLUMNS
+            else pa.array(self._columns[field.name], type=field.type)
+            for field in TRANSLATION_SCHEMA
+        ]
+        batch = pa.record_batch(arrays, schema=TRANSLATION_SCHEMA)
+
+        if self.fmt == "parquet":
+            self._writer.write_batch(batch, row_group_size=num_rows)
+        else:
+            self._writer.write_batch(batch)
+
+        self.rows_written += num_rows
+        for values in self._columns.values():
+            values.clear()
+
+    def close(self):
+        """Flush any remaining rows and close the underlying writer."""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._writer = None
+
+    def _dictionary_array(self, name):
+        """Encode a column against its running dictionary."""
+        dictionary = self._dictionaries[name]
+        indices = [
+            None if value is None else dictionary.setdefault(value, len(dictionary))
+            for value in self._columns[name]
+        ]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=pa.int32()),
+            pa.array(list(dictionary), type=pa.string()),
+        )
+
+    @staticmethod
+    def _allele_state(fhir_allele):
+        """Return the literal value of the `allele-state` representation."""
+        for rep in fhir_allele.get("representation", []):
+            codings = rep.get("focus", {}).get("coding", [])
+            if any(coding.get("code") == "allele-state" for coding in codings):
+                return rep.get("literal", {}).get("value")
+        return None
+
+    @staticmethod
+    def _molecule_type(fhir_allele):
+        """Return the first `moleculeType` coding code."""
+        codings = fhir_allele.get("moleculeType", {}).get("coding", [])
+        return codings[0].get("code") if codings else None
+
+
+class ColumnarVrsToFhirTranslator:
+    """Translate VRS Alleles stored column-wise (Parquet / Arrow) into FHIR Allele Profiles.
+
+    Work that depends only on a column value is done once per unique value instead of once
+    per row: state types are classified with array operations, and each distinct refget
+    accession is resolved to its RefSeq alias (and molecule type) a single time. Rows are then
+    built straight into VRS models from the column values, with no per-row JSON round-trip.
+    """
+
+    def __init__(self, dp=None, uri: str | None = None, columns=None):
+        self.dp = dp or create_dataproxy(uri=uri)
+        self.vrs_translator = VrsToFhirAlleleTranslator(dp=self.dp)
+        self.columns = {**VRS_INPUT_COLUMNS, **(columns or {})}
+        self._accessions = {}
+
+    def _column(self, batch, key):
+        """Return a batch column as a Python list, or a list of None if it is absent."""
+        name = self.columns[key]
+        if name in batch.schema.names:
+            return batch.column(name).to_pylist()
+        return [None] * batch.num_rows
+
+    def classify_state_types(self, batch):
+        """Classify each row's state type using array operations.
+
+        Returns:
+            list[str | None]: "LiteralSequenceExpression", "ReferenceLengthExpression", or None
+            when the row carries neither state.
+        """
+        names = batch.schema.names
+        has_sequence = (
+            batch.column(self.columns["sequence"]).is_valid()
+            if self.columns["sequence"] in names
+            else pa.repeat(False, batch.num_rows)
+        )
+        has_length = (
+            batch.column(self.columns["length"]).is_valid()
+            if self.columns["length"] in names
+            else pa.repeat(False, batch.num_rows)
+        )
+        state_types = pc.if_else(
+            has_sequence,
+            "LiteralSequenceExpression",
+            pc.if_else(
+                has_length, "ReferenceLengthExpression", pa.scalar(None, pa.string())
+            ),
+        )
+        return state_types.to_pylist()
+
+    def resolve_accessions(self, batch):
+        """Resolve every distinct refget accession in the batch once.
+
+        Returns:
+            dict: refget accession -> (refseq_id, vrs_molecule_type), or None if the accession
+            has no RefSeq alias. Results are remembered across batches.
+        """
+        column = batch.column(self.columns["refget_accession"])
+        for accession in pc.unique(column.drop_null()).to_pylist():
+            if accession not in self._accessions:
+                self._accessions[accession] = self._resolve_accession(accession)
+        return self._accessions
+
+    def _resolve_accession(self, accession):
+        try:
+            aliases = self.dp.translate_sequence_identifier(
+                f"ga4gh:{accession}", namespace="refseq"
+            )
+        except KeyError:
+            return None
+        if not aliases:
+            return None
+        refseq_id = aliases[0].split(":", 1)[1]
+        try:
+            molecule_type = VRS_MOLECULE_TYPES[detect_sequence_type(refseq_id)]
+        except InvalidSequenceTypeError:
+            molecule_type = None
+        return refseq_id, molecule_type
+
+    def build_vrs_alleles(self, batch):
+        """Build VRS Alleles from a record batch.
+
+        ReferenceLengthExpression states are denormalized into literal sequences using only the
+        repeat subunit from the reference, so the resulting alleles need no further data proxy
+        lookups during translation.
+
+        Returns:
+            tuple[list[str | None], list[Allele | Exception], dict]: The original state types, the
+            VRS Alleles (or the exception raised for that row), and the resolved accessions.
+        """
+        state_types = self.classify_state_types(batch)
+        accessions = self.resolve_accessions(batch)
+
+        ids = self._column(batch, "id")
+        refgets = self._column(batch, "refget_accession")
+        starts = self._column(batch, "start")
+        ends = self._column(batch, "end")
+        sequences = self._column(batch, "sequence")
+        lengths = self._column(batch, "length")
+        subunits = self._column(batch, "repeat_subunit_length")
+
+        alleles = []
+        for i, state_type in enumerate(state_types):
+            try:
+                if state_type is None:
+                    raise ValueError(
+                        "Row has neither a literal sequence nor a reference length state."
+                    )
+                resolved = accessions.get(refgets[i])
+                if resolved is None:
+                    raise ValueError(
+                        f"No RefSeq ID found for sequence ID 'ga4gh:{refgets[i]}'."
+                    )
+                refseq_id, molecule_type = resolved
+
+                sequence = sequences[i]
+                if state_type == "ReferenceLengthExpression":
+                    subunit_end = min(ends[i], starts[i] + subunits[i])
+                    sequence = denormalize_reference_length_expression(
+                        ref_seq=self.dp.get_sequence(refseq_id, starts[i], subunit_end),
+                        repeat_subunit_length=subunits[i],
+                        alt_length=lengths[i],
+                    )
+
+                alleles.append(
+                    Allele(
+                        id=ids[i],
+                        location=SequenceLocation(
+                            sequenceReference=SequenceReference(
+                                refgetAccession=refgets[i], moleculeType=molecule_type
+                            ),
+                            start=starts[i],
+                            end=ends[i],
+                        ),
+                        state=LiteralSequenceExpression(sequence=sequence),
+                    )
+                )
+            except Exception as e:
+                alleles.append(e)
+
+        return state_types, alleles, accessions
+
+    def translate_batch(self, batch):
+        """Translate a record batch into FHIR Allele Profiles.
+
+        Returns:
+            list[FhirAllele | Exception]: One entry per row, holding either the FHIR Allele or
+            the exception raised while translating that row.
+        """
+        _, alleles, _ = self.build_vrs_alleles(batch)
+        return [self._translate(allele) for allele in alleles]
+
+    def _translate(self, allele):
+        if isinstance(allele, Exception):
+            return allele
+        try:
+            return self.vrs_translator.translate(allele)
+        except Exception as e:
+            return e
+
+    def translate_to_sink(self, batches, sink):
+        """Translate record batches into a `ColumnarTranslationSink`.
+
+        The `line` column of the sink holds the zero-based input row number.
+
+        Returns:
+            dict: Counts of translated and failed rows.
+        """
+        counts = {"total_translated": 0, "total_failed": 0}
+        row_offset = 0
+        for batch in batches:
+            state_types, alleles, accessions = self.build_vrs_alleles(batch)
+            for i, allele in enumerate(alleles):
+                fhir_obj = self._translate(allele)
+                if isinstance(fhir_obj, Exception):
+                    counts["total_failed"] += 1
+                    continue
+                counts["total_translated"] += 1
+                sink.write(
+                    line_num=row_offset + i,
+                    vrs_allele=allele.model_dump(exclude_none=True),
+                    fhir_allele=fhir_obj.model_dump(exclude_none=True),
+                    state_type=state_types[i],
+                    refseq_id=accessions[
+                        allele.location.sequenceReference.refgetAccession
+                    ][0],
+                )
+            row_offset += batch.num_rows
+        return counts
+
+
+class ColumnarFhirToVrsTranslator:
+    """Translate FHIR Allele Profiles stored in a columnar `fhir_json` column back into VRS."""
+
+    def __init__(self, column="fhir_json"):
+        self.column = column
+        self.fhir_translator = FhirToVrsAlleleTranslator()
+
+    def translate_batch(self, batch):
+        """Translate a record batch into VRS Alleles.
+
+        Returns:
+            list[Allele | Exception]: One entry per row, holding either the VRS Allele or the
+            exception raised while translating that row.
+        """
+        results = []
+        for fhir_json in batch.column(self.column).to_pylist():
+            try:
+                fhir_obj = FhirAllele.model_validate_json(fhir_json)
+                results.append(self.fhir_translator.translate(fhir_obj))
+            except Exception as e:
+                results.append(e)
+        return results
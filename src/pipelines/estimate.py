@@ -0,0 +1,262 @@
+import gzip
+import os
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+from collections import Counter
+
+import orjson
+from ga4gh.vrs.models import Allele
+
+GZIP_MAGIC = b"\x1f\x8b\x08"
+STAGES = ("decode", "validate", "translate", "serialize")
+
+
+class CountingDataProxy:
+    """Wrap a data proxy and tally calls to its public methods in `calls`."""
+
+    def __init__(self, dp):
+        self._dp = dp
+        self.calls = Counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self._dp, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls[name] += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+def _peak_rss_bytes():
+    """Return the peak resident set size of this process in bytes, or 0 where it is unavailable.
+
+    `ru_maxrss` is in kibibytes on Linux but in bytes on macOS, and Windows has no `resource`
+    module at all.
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _read_from_member(raw, start, num_lines, max_bytes):
+    """Decompress gzip members starting at `start` until `num_lines` whole lines are read.
+
+    Returns the decompressed bytes and the compressed bytes consumed, or None if no gzip member
+    starts at `start`. At least one member must be read to its end (and pass its CRC check), so
+    a stray magic number inside deflate data is not mistaken for a member header.
+    """
+    raw.seek(start)
+    out = bytearray()
+    consumed = 0
+    completed = 0
+    d = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    try:
+        while (out.count(b"\n") <= num_lines or not completed) and consumed < max_bytes:
+            data = raw.read(1 << 16)
+            if not data:
+                break
+            while data:
+                out += d.decompress(data)
+                if not d.eof:
+                    consumed += len(data)
+                    break
+                completed += 1
+                consumed += len(data) - len(d.unused_data)
+                data = d.unused_data
+                d = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    except zlib.error:
+        return None
+    if not completed:
+        return None
+    return bytes(out), consumed
+
+
+def sample_lines(inputfile, sample_size=1000, seed=0, lines_per_point=10):
+    """Sample lines from across a gzipped JSONL file.
+
+    Block-compressed inputs (bgzip, or any concatenation of gzip members) are sampled by seeking
+    to random compressed offsets and decompressing from the next member header, so only a small
+    fraction of the file is read; the total line count is then estimated from the lines per
+    compressed byte around the sample points. A single-member gzip cannot be entered mid-stream,
+    so it is decompressed in full and reservoir-sampled, which also gives the exact line count.
+
+    Args:
+        inputfile (str): Path to the gzipped JSONL file.
+        sample_size (int): Number of lines to sample.
+        seed (int): Seed for the sample offsets.
+        lines_per_point (int): Consecutive lines read at each sampled offset.
+
+    Returns:
+        tuple[list[bytes], dict]: The sampled lines, and the sampling method and (estimated)
+            total line count.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    size = os.path.getsize(inputfile)
+    points = -(-sample_size // lines_per_point)
+    window = 1 << 20
+
+    lines = []
+    newlines = 0
+    compressed = 0
+    with open(inputfile, "rb") as raw:
+        for _ in range(points * 4):
+            if len(lines) >= sample_size:
+                break
+            offset = rng.randrange(size)
+            raw.seek(offset)
+            buf = raw.read(window)
+            pos = buf.find(GZIP_MAGIC, 1)
+            while pos != -1:
+                read = _read_from_member(raw, offset + pos, lines_per_point, window)
+                if read is not None:
+                    break
+                pos = buf.find(GZIP_MAGIC, pos + 1)
+            if pos == -1 or read is None:
+                continue
+            data, consumed = read
+            newlines += data.count(b"\n")
+            compressed += consumed
+            # A member boundary can fall mid-line, so the first (partial) line is dropped.
+            lines.extend(data.split(b"\n")[1:-1][:lines_per_point])
+
+    if lines:
+        return lines[:sample_size], {
+            "method": "seek",
+            "total_lines": round(size * newlines / compressed),
+        }
+
+    reservoir = []
+    total = 0
+    with gzip.open(inputfile, "rb") as f:
+        for total, line in enumerate(f, 1):
+            if len(reservoir) < sample_size:
+                reservoir.append(line)
+            else:
+                slot = rng.randrange(total)
+                if slot < sample_size:
+                    reservoir[slot] = line
+    return reservoir, {"method": "scan", "total_lines": total}
+
+
+def estimate_run(pipeline, inputfile, sample_size=1000, workers=1, seed=0):
+    """Project the wall time, peak RSS and output size of translating `inputfile`.
+
+    A sample of lines is pushed through the decode, validate, translate and serialize stages of
+    `pipeline` with each stage timed, and calls to the data proxy are counted. Every tenth line
+    is instead run under `tracemalloc` (and left out of the timings) to measure the memory a
+    record needs. The projection assumes `workers` independent processes, each with the RSS of
+    this process plus the largest per-record allocation, splitting the input evenly.
+
+    Args:
+        pipeline (ClinvarTranslationPipeline): The pipeline to estimate.
+        inputfile (str): Path to the gzipped ClinVar variation JSONL.
+        sample_size (int): Number of lines to sample.
+        workers (int): Worker count to project for.
+        seed (int): Seed for the sample offsets.
+
+    Returns:
+        dict: The per-line measurements and the projection.
+    """
+    lines, sampling = sample_lines(inputfile, sample_size=sample_size, seed=seed)
+    translator = pipeline.vrs_translator
+    dp = translator.dp
+    counting = CountingDataProxy(dp)
+    translator.use_dataproxy(counting)
+
+    stage_seconds = dict.fromkeys(STAGES, 0.0)
+    timed = 0
+    members = 0
+    output_bytes = 0
+    record_peaks = []
+    try:
+        for i, line in enumerate(lines):
+            traced = i % 10 == 9
+            if traced:
+                tracemalloc.start()
+            started = time.perf_counter()
+            elapsed = dict.fromkeys(STAGES, 0.0)
+
+            try:
+                obj = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                obj = {}
+            elapsed["decode"] += time.perf_counter() - started
+            for member in obj.get("members", []) if isinstance(obj, dict) else []:
+                if not (isinstance(member, dict) and member.get("type") == "Allele"):
+                    continue
+                members += 1
+                now = time.perf_counter()
+                try:
+                    vo = Allele(**member)
+                    vrs_dict = vo.model_dump(exclude_none=True)
+                except Exception:
+                    vo = None
+                elapsed["validate"] += time.perf_counter() - now
+                now = time.perf_counter()
+                if vo is None:
+                    continue
+                try:
+                    record = {
+                        "line": i,
+                        "vrs_allele": vrs_dict,
+                        "fhir_allele": translator.translate_to_dict(vo),
+                    }
+                except Exception as e:
+                    record = {"line": i, "error": str(e), "vrs_allele": vrs_dict}
+                elapsed["translate"] += time.perf_counter() - now
+                now = time.perf_counter()
+                output_bytes += len(orjson.dumps(record)) + 1
+                elapsed["serialize"] += time.perf_counter() - now
+
+            if traced:
+                record_peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            else:
+                timed += 1
+                for stage, seconds in elapsed.items():
+                    stage_seconds[stage] += seconds
+    finally:
+        translator.use_dataproxy(dp)
+
+    sampled = len(lines)
+    timed = max(timed, 1)
+    per_line = {stage: seconds / timed for stage, seconds in stage_seconds.items()}
+    seconds_per_line = sum(per_line.values())
+    total_lines = sampling["total_lines"]
+    peak_record_bytes = max(record_peaks, default=0)
+    baseline_rss = _peak_rss_bytes()
+    output_bytes_per_line = output_bytes / max(sampled, 1)
+
+    return {
+        "input": os.fspath(inputfile),
+        "sampling": sampling["method"],
+        "sampled_lines": sampled,
+        "estimated_total_lines": total_lines,
+        "members_per_line": round(members / max(sampled, 1), 3),
+        "seconds_per_line": {
+            stage: round(seconds, 6) for stage, seconds in per_line.items()
+        },
+        "dataproxy_calls_per_line": {
+            name: round(count / max(sampled, 1), 3)
+            for name, count in sorted(counting.calls.items())
+        },
+        "memory_bytes_per_record": round(sum(record_peaks) / max(len(record_peaks), 1)),
+        "peak_record_bytes": peak_record_bytes,
+        "baseline_rss_bytes": baseline_rss,
+        "output_bytes_per_line": round(output_bytes_per_line, 1),
+        "projection": {
+            "workers": workers,
+            "wall_seconds": round(total_lines * seconds_per_line / workers, 1),
+            "peak_rss_bytes": workers * (baseline_rss + peak_record_bytes),
+            "output_bytes": round(total_lines * output_bytes_per_line),
+        },
+    }
@@ -0,0 +1,385 @@
+import argparse
+import gzip
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import orjson
+from ga4gh.core import sha512t24u
+from ga4gh.vrs.models import Allele
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline
+from translators.translation_cache import TranslationCache, translation_version_stamp
+
+
+@dataclass
+class IncrementalTranslationSummary:
+    file_name: str
+    prior_output: str | None
+    start_date: str
+    start_time: str
+    end_date: str
+    end_time: str
+    duration_seconds: float
+    total_lines_read: int
+    records_unchanged: int
+    records_changed: int
+    records_new: int
+    records_removed: int
+    members_carried_forward: int
+    members_translated: int
+    members_previously_failed: int
+    failed_vrs_allele_validation: int
+    failed_vrs_to_fhir_translation: int
+    total_failed: int
+
+
+def canonical_hash(obj):
+    """Return the sha512t24u digest of an object's canonical (sorted-key) JSON."""
+    return sha512t24u(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS))
+
+
+def index_path_for(outputfile):
+    """Return the path of the index sidecar written next to a translation output file."""
+    return Path(f"{outputfile}.index")
+
+
+def splice_line_number(output_line, line_num):
+    """Rewrite the leading `"line"` field of a serialized translation without re-serializing it.
+
+    Translation records are always written with `"line"` as their first key, so the record is
+    re-prefixed in place and the remaining bytes are copied unchanged.
+
+    Args:
+        output_line (bytes): A translation record as written to the output file.
+        line_num (int): The input line number in the current release.
+
+    Returns:
+        bytes: The record with its line number replaced.
+    """
+    if not output_line.startswith(b'{"line":'):
+        raise ValueError("Translation record does not start with a 'line' field.")
+    return b'{"line":%d,' % line_num + output_line[output_line.index(b",") + 1 :]
+
+
+class PriorRunIndex:
+    """Index of a previous run's translation output, loaded from its index sidecar.
+
+    The sidecar starts with a `{"version_stamp": ...}` header (see
+    `translation_version_stamp`), followed by one JSON line per variation record:
+    `{"id", "hash", "members": [[member_hash, offset, length], ...]}`, where `offset` and
+    `length` locate the member's translation in the prior output file. An index written under a
+    different version stamp than `stamp` (the current one by default) is treated as empty, so
+    every record is translated again after a translator upgrade.
+    """
+
+    def __init__(self, output_path, index_path=None, stamp: str | None = None):
+        self.output_path = Path(output_path)
+        self.index_path = Path(index_path or index_path_for(output_path))
+        self.stamp = translation_version_stamp() if stamp is None else stamp
+        self.records = {}
+        self.members = {}
+
+        with open(self.index_path, "rb") as f:
+            header = orjson.loads(f.readline() or b"{}")
+            self.stale = header.get("version_stamp") != self.stamp
+            if self.stale:
+                logging.warning(
+                    "Ignoring prior index %s: written under version stamp %r, not %r",
+                    self.index_path,
+                    header.get("version_stamp"),
+                    self.stamp,
+                )
+            else:
+                for line in f:
+                    entry = orjson.loads(line)
+                    self.records[entry["id"]] = entry
+                    for member_hash, offset, length in entry["members"]:
+                        self.members[member_hash] = (offset, length)
+
+        self._output = open(self.output_path, "rb")  # noqa: SIM115 (closed in close())
+
+    def record_hash(self, variation_id):
+        """Return the source record hash of a prior variation, or None if it was not seen."""
+        entry = self.records.get(variation_id)
+        return entry["hash"] if entry else None
+
+    def read(self, offset, length):
+        """Return the raw bytes of one prior translation record."""
+        self._output.seek(offset)
+        return self._output.read(length)
+
+    def close(self):
+        self._output.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class IncrementalClinvarPipeline(ClinvarTranslationPipeline):
+    """Translate a ClinVar release, reusing the outputs of a prior run wherever possible.
+
+    Records whose source hash is unchanged have their translations copied from the prior output.
+    Changed and new records are re-processed member by member; members whose hash appears in the
+    prior index are copied, all others are translated. Every run writes a full output file plus
+    its index sidecar, a delta file containing the output of changed and new records, and
+    optionally a tombstone list of variation ids whose prior output is superseded.
+    """
+
+    def run_incremental(
+        self,
+        inputfile,
+        outputfile,
+        delta_path,
+        invalid_allele_path,
+        invalid_fhir_path,
+        prior=None,
+        tombstone_path=None,
+        stats_path="runtime_stats.txt",
+    ):
+        """Run an incremental translation.
+
+        Args:
+            inputfile (str): Path to the gzipped ClinVar variation JSONL.
+            outputfile (str): Path of the full translation output for this release.
+            delta_path (str): Path of the delta output (changed and new records only).
+            invalid_allele_path (str): Path of the invalid VRS allele log.
+            invalid_fhir_path (str): Path of the failed FHIR translation log.
+            prior (PriorRunIndex, optional): Index of the previous run. When omitted every record is new.
+            tombstone_path (str, optional): Path to write removed and changed variation ids to.
+            stats_path (str): Path to write the run summary to.
+
+        Returns:
+            IncrementalTranslationSummary: The run summary.
+        """
+        started_at_wall = datetime.now()
+        t0 = time.perf_counter()
+
+        counts = dict.fromkeys(
+            [
+                "total_lines_read",
+                "records_unchanged",
+                "records_changed",
+                "records_new",
+                "members_carried_forward",
+                "members_translated",
+                "members_previously_failed",
+                "failed_vrs_allele_validation",
+                "failed_vrs_to_fhir_translation",
+            ],
+            0,
+        )
+        seen_ids = set()
+        changed_ids = []
+
+        with (
+            gzip.open(inputfile, "rb") as f,
+            open(outputfile, "wb") as out_f,
+            open(index_path_for(outputfile), "wb") as index_f,
+            open(delta_path, "wb") as delta_f,
+            open(invalid_allele_path, "ab") as invalid_allele_log,
+            open(invalid_fhir_path, "ab") as invalid_fhir_log,
+        ):
+            index_f.write(
+                orjson.dumps({"version_stamp": translation_version_stamp()}) + b"\n"
+            )
+            for line_num, line in enumerate(f, 1):
+                counts["total_lines_read"] += 1
+                try:
+                    obj = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logging.warning("[Line %d] Skipping: JSON decode error", line_num)
+                    continue
+
+                variation_id = obj.get("id")
+                record_hash = canonical_hash(obj)
+                prior_hash = (
+                    prior.record_hash(variation_id) if prior is not None else None
+                )
+                if variation_id is not None:
+                    seen_ids.add(variation_id)
+
+                if prior_hash is None:
+                    counts["records_new"] += 1
+                elif prior_hash == record_hash:
+                    counts["records_unchanged"] += 1
+                else:
+                    counts["records_changed"] += 1
+                    changed_ids.append(variation_id)
+                unchanged = prior_hash == record_hash
+
+                index_members = []
+                for member in obj.get("members", []):
+                    if not (
+                        isinstance(member, dict) and member.get("type") == "Allele"
+                    ):
+                        continue
+                    member_hash = canonical_hash(member)
+
+                    reused = prior.members.get(member_hash) if prior else None
+                    if reused is not None:
+                        output_line = splice_line_number(prior.read(*reused), line_num)
+                        counts["members_carried_forward"] += 1
+                    elif unchanged:
+                        # The member failed translation in the prior run.
+                        counts["members_previously_failed"] += 1
+                        continue
+                    else:
+                        output_line = self._translate_member(
+                            line_num,
+                            member,
+                            counts,
+                            invalid_allele_log,
+                            invalid_fhir_log,
+                        )
+                        if output_line is None:
+                            continue
+
+                    index_members.append([member_hash, out_f.tell(), len(output_line)])
+                    out_f.write(output_line)
+                    if not unchanged:
+                        delta_f.write(output_line)
+
+                if variation_id is not None:
+                    index_f.write(
+                        orjson.dumps(
+                            {
+                                "id": variation_id,
+                                "hash": record_hash,
+                                "members": index_members,
+                            }
+                        )
+                        + b"\n"
+                    )
+
+        removed_ids = (
+            [vid for vid in prior.records if vid not in seen_ids] if prior else []
+        )
+        if tombstone_path is not None:
+            with open(tombstone_path, "wb") as tombstones:
+                for vid in removed_ids:
+                    tombstones.write(
+                        orjson.dumps({"id": vid, "reason": "removed"}) + b"\n"
+                    )
+                for vid in changed_ids:
+                    tombstones.write(
+                        orjson.dumps({"id": vid, "reason": "changed"}) + b"\n"
+                    )
+
+        ended_at_wall = datetime.now()
+        summary = IncrementalTranslationSummary(
+            file_name=Path(inputfile).name,
+            prior_output=prior.output_path.name if prior else None,
+            start_date=started_at_wall.date().isoformat(),
+            start_time=started_at_wall.time().isoformat(timespec="seconds"),
+            end_date=ended_at_wall.date().isoformat(),
+            end_time=ended_at_wall.time().isoformat(timespec="seconds"),
+            duration_seconds=round(max(time.perf_counter() - t0, 1e-9), 2),
+            records_removed=len(removed_ids),
+            total_failed=counts["failed_vrs_allele_validation"]
+            + counts["failed_vrs_to_fhir_translation"],
+            **counts,
+        )
+        with open(stats_path, "wb") as stats:
+            stats.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2) + b"\n")
+        return summary
+
+    def _translate_member(
+        self, line_num, member, counts, invalid_allele_log, invalid_fhir_log
+    ):
+        """Translate one ClinVar member, logging failures; returns the output line or None."""
+        try:
+            vo = Allele(**member)
+        except Exception as e:
+            counts["failed_vrs_allele_validation"] += 1
+            invalid_allele_log.write(
+                orjson.dumps({"line": line_num, "error": str(e), "member": member})
+                + b"\n"
+            )
+            return None
+
+        vrs_dict = vo.model_dump(exclude_none=True)
+        try:
+            fhir_dict = self.vrs_translator.translate_to_dict(vo)
+        except Exception as e:
+            counts["failed_vrs_to_fhir_translation"] += 1
+            invalid_fhir_log.write(
+                orjson.dumps(
+                    {"line": line_num, "error": str(e), "vrs_allele": vrs_dict}
+                )
+                + b"\n"
+            )
+            return None
+
+        counts["members_translated"] += 1
+        return (
+            orjson.dumps(
+                {"line": line_num, "vrs_allele": vrs_dict, "fhir_allele": fhir_dict}
+            )
+            + b"\n"
+        )
+
+    def main(self):
+        parser = argparse.ArgumentParser(
+            prog="allele-to-fhir-incremental-translator",
+            description="Translate a ClinVar release, reusing the outputs of a prior run",
+        )
+        parser.add_argument("input_gzip", help="Path to gzipped JSONL file")
+        parser.add_argument(
+            "--prior-output", help="Translation output of the previous release"
+        )
+        parser.add_argument(
+            "--prior-index",
+            help="Index sidecar of the previous release (defaults to <prior-output>.index)",
+        )
+        parser.add_argument("--output", default="vrs_to_fhir_translations.jsonl")
+        parser.add_argument("--delta-output", default="vrs_to_fhir_delta.jsonl")
+        parser.add_argument(
+            "--tombstones", help="Write removed and changed variation ids to this file"
+        )
+        parser.add_argument("--invalid-allele-log", default="invalid_vrs_alleles.jsonl")
+        parser.add_argument("--invalid-fhir-log", default="invalid_trans_to_fhir.jsonl")
+        parser.add_argument(
+            "--translation-cache",
+            help="SQLite file memoizing VRS -> FHIR translations across runs",
+        )
+        parser.add_argument(
+            "--verbose", action="store_true", help="Enable detailed logging"
+        )
+
+        args = parser.parse_args()
+
+        logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+        logging.info("Starting Incremental Translation Job")
+
+        if args.translation_cache:
+            self.vrs_translator.cache = TranslationCache(args.translation_cache)
+
+        prior = None
+        if args.prior_output:
+            prior = PriorRunIndex(args.prior_output, args.prior_index)
+
+        try:
+            self.run_incremental(
+                inputfile=args.input_gzip,
+                outputfile=args.output,
+                delta_path=args.delta_output,
+                invalid_allele_path=args.invalid_allele_log,
+                invalid_fhir_path=args.invalid_fhir_log,
+                prior=prior,
+                tombstone_path=args.tombstones,
+            )
+        finally:
+            if prior is not None:
+                prior.close()
+            if self.vrs_translator.cache is not None:
+                self.vrs_translator.cache.close()
+
+
+if __name__ == "__main__":
+    IncrementalClinvarPipeline().main()
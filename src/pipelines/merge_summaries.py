@@ -0,0 +1,4 @@
+from pipelines.clinvar_translate import merge_summaries_main
+
+if __name__ == "__main__":
+    merge_summaries_main()
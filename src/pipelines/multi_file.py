@@ -0,0 +1,435 @@
+import argparse
+import glob
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+import orjson
+
+from pipelines.clinvar_translate import (
+    ClinvarTranslationPipeline,
+    load_summary,
+    merge_unknown_accessions,
+)
+from translators.translation_cache import TranslationCache
+from vrs_tools.alias_index import AliasIndexDataProxy, RefgetAliasIndex
+from vrs_tools.dataproxy import (
+    NegativeCacheDataProxy,
+    PersistentCacheDataProxy,
+    seqrepo_snapshot_id,
+)
+
+JOB_SUMMARY_NAME = "job_summary.json"
+
+# Data proxies `build_pipeline` wraps around the pipeline's own, each keeping it as `dp`.
+_DATAPROXY_WRAPPERS = (
+    AliasIndexDataProxy,
+    NegativeCacheDataProxy,
+    PersistentCacheDataProxy,
+)
+
+# Pipeline of a worker process, built once per worker by `_init_worker`.
+_worker_pipeline = None
+
+
+@dataclass
+class MultiFileJobSummary:
+    file_names: list
+    workers: int
+    worker_kind: str
+    start_date: str
+    start_time: str
+    end_date: str
+    end_time: str
+    duration_seconds: float
+    total_lines_read: int
+    vrs_allele_seen: int
+    vrs_allele_types: dict
+    total_translated: int
+    failed_vrs_allele_validation: int
+    failed_vrs_to_fhir_translation: int
+    total_failed: int
+    quarantined: int = 0
+    unknown_accessions: dict = field(default_factory=dict)
+    failed_files: dict = field(default_factory=dict)
+
+
+def expand_inputs(patterns):
+    """Resolve input paths and glob patterns into a de-duplicated list of files.
+
+    Args:
+        patterns (list[str]): Input paths and/or glob patterns such as `dumps/*.jsonl.gz`.
+
+    Raises:
+        FileNotFoundError: If a path does not exist or a pattern matches no files.
+
+    Returns:
+        list[Path]: The input files, in the order they were first matched.
+    """
+    inputs = {}
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+        else:
+            matches = [pattern] if Path(pattern).is_file() else []
+        if not matches:
+            raise FileNotFoundError(f"No input files match {pattern!r}.")
+        for match in matches:
+            inputs.setdefault(Path(match).resolve(), None)
+    return list(inputs)
+
+
+def output_stem(path):
+    """Return the name an input's outputs are written under, e.g. `clinvar` for `clinvar.jsonl.gz`."""
+    name = Path(path).name
+    for suffix in (".gz", ".jsonl", ".json"):
+        name = name.removesuffix(suffix)
+    return name
+
+
+def schedule_inputs(inputs):
+    """Order inputs largest first, so the longest files start early and the pool drains evenly."""
+    return sorted(inputs, key=lambda path: Path(path).stat().st_size, reverse=True)
+
+
+def build_pipeline(
+    translation_cache=None,
+    dataproxy_cache=None,
+    seqrepo_snapshot=None,
+    negative_cache_ttl=3600.0,
+    alias_index=None,
+    uri=None,
+    dp=None,
+):
+    """Build a ClinVar translation pipeline with the caches the ClinVar CLI sets up.
+
+    The data proxy is wrapped as in `ClinvarTranslationPipeline.main`: the persistent cache
+    first, then the negative cache, then the alias index. Both SQLite caches write in short
+    transactions, so pipelines in several processes can share the same files.
+
+    Args:
+        translation_cache (str): SQLite file memoizing VRS -> FHIR translations.
+        dataproxy_cache (str): SQLite file memoizing SeqRepo lookups (`PersistentCacheDataProxy`).
+        seqrepo_snapshot (str): SeqRepo snapshot id stamped on `dataproxy_cache`.
+        negative_cache_ttl (float): Seconds to remember unknown accessions (0 disables it).
+        alias_index (str): Refget -> RefSeq alias index consulted before the data proxy.
+        uri (str): The data proxy URI (default `$GA4GH_VRS_DATAPROXY_URI`).
+        dp (object): A data proxy to use instead of one built from `uri`.
+
+    Returns:
+        ClinvarTranslationPipeline: The pipeline.
+    """
+    cache = TranslationCache(translation_cache) if translation_cache else None
+    pipeline = ClinvarTranslationPipeline(dp=dp, uri=uri, cache=cache)
+    translator = pipeline.vrs_translator
+    if dataproxy_cache:
+        translator.use_dataproxy(
+            PersistentCacheDataProxy(translator.dp, dataproxy_cache, seqrepo_snapshot)
+        )
+    if negative_cache_ttl > 0:
+        translator.use_dataproxy(
+            NegativeCacheDataProxy(translator.dp, ttl=negative_cache_ttl)
+        )
+    if alias_index:
+        translator.use_dataproxy(
+            AliasIndexDataProxy(translator.dp, RefgetAliasIndex(alias_index))
+        )
+    return pipeline
+
+
+def _dataproxy_layers(dp):
+    """Yield a data proxy and every data proxy it wraps, outermost first."""
+    yield dp
+    while isinstance(dp, _DATAPROXY_WRAPPERS):
+        dp = dp.dp
+        yield dp
+
+
+def _flush_pipeline(pipeline):
+    """Commit what a pipeline's translation and data proxy caches have collected so far."""
+    translator = pipeline.vrs_translator
+    if translator.cache is not None:
+        translator.cache.flush()
+    for dp in _dataproxy_layers(translator.dp):
+        if isinstance(dp, PersistentCacheDataProxy):
+            dp.flush()
+
+
+def close_pipeline(pipeline):
+    """Close the caches and alias index opened by `build_pipeline`."""
+    translator = pipeline.vrs_translator
+    if translator.cache is not None:
+        translator.cache.close()
+    for dp in _dataproxy_layers(translator.dp):
+        if isinstance(dp, PersistentCacheDataProxy):
+            dp.close()
+        elif isinstance(dp, AliasIndexDataProxy):
+            dp.index.close()
+
+
+def _init_worker(pipeline_factory):
+    global _worker_pipeline
+    _worker_pipeline = pipeline_factory()
+
+
+def _run_file_in_worker(inputfile, paths, kwargs):
+    logging.info("Translating %s", inputfile)
+    try:
+        _worker_pipeline.run(inputfile=inputfile, **paths, **kwargs)
+    finally:
+        # Worker processes are not shut down cleanly enough to rely on close().
+        _flush_pipeline(_worker_pipeline)
+    return load_summary(paths["stats_path"])
+
+
+class MultiFileTranslationJob:
+    """Translate many ClinVar-style input files in one invocation.
+
+    Files are run largest first on a pool of `workers` threads that all share `pipeline`, so the
+    data proxy, its caches and any attached `TranslationCache` stay warm from one file to the
+    next. Translation is CPU-bound Python, so threads only overlap I/O (data proxy and file
+    access) and give little speedup beyond that. With `pipeline_factory`, files run instead on a
+    pool of `workers` processes, each building its own pipeline with `pipeline_factory()` (which
+    must be picklable, e.g. a `functools.partial` of `build_pipeline`); back those pipelines with
+    shared translation and data proxy cache files so the workers share their work.
+
+    Each file gets its own output, logs and summary in `output_dir`, named after the input
+    (`<stem>.jsonl`, `<stem>_invalid_alleles.jsonl`, `<stem>_invalid_fhir.jsonl`,
+    `<stem>_quarantined.jsonl` and `<stem>_runtime_stats.txt`), and the job writes an aggregate
+    summary to `job_summary.json`.
+    """
+
+    def __init__(self, pipeline=None, output_dir=".", workers=1, pipeline_factory=None):
+        if workers < 1:
+            raise ValueError("A multi-file job needs at least one worker.")
+        if pipeline is not None and pipeline_factory is not None:
+            raise ValueError("Pass either a pipeline or a pipeline factory, not both.")
+        self.pipeline_factory = pipeline_factory
+        self.pipeline = (
+            None
+            if pipeline_factory is not None
+            else pipeline or ClinvarTranslationPipeline()
+        )
+        self.output_dir = Path(output_dir)
+        self.workers = workers
+
+    def paths_for(self, inputfile):
+        """Return the output, log and summary paths of one input file."""
+        stem = output_stem(inputfile)
+        return {
+            "outputfile": self.output_dir / f"{stem}.jsonl",
+            "invalid_allele_path": self.output_dir / f"{stem}_invalid_alleles.jsonl",
+            "invalid_fhir_path": self.output_dir / f"{stem}_invalid_fhir.jsonl",
+            "quarantine_path": self.output_dir / f"{stem}_quarantined.jsonl",
+            "stats_path": self.output_dir / f"{stem}_runtime_stats.txt",
+        }
+
+    def _run_file(self, inputfile, **kwargs):
+        logging.info("Translating %s", inputfile)
+        paths = self.paths_for(inputfile)
+        self.pipeline.run(inputfile=inputfile, **paths, **kwargs)
+        return load_summary(paths["stats_path"])
+
+    def run(self, inputs, summary_path=None, **kwargs):
+        """Translate every input file and write the per-file and aggregate summaries.
+
+        A file that fails is logged and listed under `failed_files` in the aggregate summary;
+        the remaining files are still translated.
+
+        Args:
+            inputs (list[str]): Input paths and/or glob patterns.
+            summary_path (str): Path of the aggregate summary (default `<output_dir>/job_summary.json`).
+            **kwargs: Passed on to `ClinvarTranslationPipeline.run` for every file (e.g. `limit`).
+
+        Raises:
+            FileNotFoundError: If an input does not exist or a pattern matches no files.
+            ValueError: If two inputs would write to the same output files.
+
+        Returns:
+            MultiFileJobSummary: The aggregate summary.
+        """
+        files = schedule_inputs(expand_inputs(inputs))
+        stems = [output_stem(path) for path in files]
+        if len(set(stems)) != len(stems):
+            raise ValueError(
+                "Input files must have distinct names, since outputs are named after them."
+            )
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        started_at_wall = datetime.now()
+        t0 = time.perf_counter()
+        summaries = {}
+        failed_files = {}
+        if self.pipeline_factory is not None:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.pipeline_factory,),
+            )
+
+            def submit(path):
+                return executor.submit(
+                    _run_file_in_worker, path, self.paths_for(path), kwargs
+                )
+
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="translate"
+            )
+
+            def submit(path):
+                return executor.submit(self._run_file, path, **kwargs)
+
+        with executor:
+            futures = {path: submit(path) for path in files}
+            for path, future in futures.items():
+                try:
+                    summaries[path] = future.result()
+                except Exception as e:
+                    logging.exception("Translation of %s failed", path)
+                    failed_files[path.name] = str(e)
+        duration = time.perf_counter() - t0
+        ended_at_wall = datetime.now()
+
+        def total(name):
+            return sum(getattr(summary, name) for summary in summaries.values())
+
+        allele_types = {"lse_count": 0, "rle_count": 0, "other_count": 0}
+        for summary in summaries.values():
+            for name, count in summary.vrs_allele_types.items():
+                allele_types[name] = allele_types.get(name, 0) + count
+
+        job_summary = MultiFileJobSummary(
+            file_names=[path.name for path in files],
+            workers=self.workers,
+            worker_kind="thread" if self.pipeline_factory is None else "process",
+            start_date=started_at_wall.date().isoformat(),
+            start_time=started_at_wall.time().isoformat(timespec="seconds"),
+            end_date=ended_at_wall.date().isoformat(),
+            end_time=ended_at_wall.time().isoformat(timespec="seconds"),
+            duration_seconds=round(duration, 2),
+            total_lines_read=total("total_lines_read"),
+            vrs_allele_seen=total("vrs_allele_seen"),
+            vrs_allele_types=allele_types,
+            total_translated=total("total_translated"),
+            failed_vrs_allele_validation=total("failed_vrs_allele_validation"),
+            failed_vrs_to_fhir_translation=total("failed_vrs_to_fhir_translation"),
+            total_failed=total("total_failed"),
+            quarantined=total("quarantined"),
+            unknown_accessions=merge_unknown_accessions(summaries.values()),
+            failed_files=failed_files,
+        )
+
+        summary_path = summary_path or self.output_dir / JOB_SUMMARY_NAME
+        with open(summary_path, "wb") as f:
+            f.write(orjson.dumps(job_summary, option=orjson.OPT_INDENT_2) + b"\n")
+        return job_summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="allele-to-fhir-multi-file",
+        description="Translate several gzipped VRS JSONL files in one invocation, largest first",
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="Gzipped JSONL files and/or glob patterns"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="vrs_to_fhir_translations",
+        help="Directory for the per-file outputs and summaries",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Files translated concurrently. Workers are threads sharing one pipeline, which "
+        "only overlap I/O; use --processes for CPU-bound speedup",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Run each worker in its own process with its own pipeline; workers share the "
+        "--translation-cache and --dataproxy-cache files",
+    )
+    parser.add_argument(
+        "--summary-path",
+        help=f"Path of the aggregate summary (default <output-dir>/{JOB_SUMMARY_NAME})",
+    )
+    parser.add_argument(
+        "--limit", type=int, help="Process only this many lines from each input"
+    )
+    parser.add_argument(
+        "--translation-cache",
+        help="SQLite file memoizing VRS -> FHIR translations across files and runs",
+    )
+    parser.add_argument(
+        "--dataproxy-cache",
+        help="SQLite file memoizing SeqRepo lookups across files, runs and processes",
+    )
+    parser.add_argument(
+        "--seqrepo-snapshot",
+        help="SeqRepo snapshot id stamped on --dataproxy-cache (derived from local SeqRepo URIs if omitted)",
+    )
+    parser.add_argument(
+        "--negative-cache-ttl",
+        type=float,
+        default=3600.0,
+        help="Seconds to remember sequence accessions the data proxy does not know (0 disables)",
+    )
+    parser.add_argument(
+        "--alias-index",
+        help="Refget -> RefSeq alias index consulted before the data proxy (see vrs_tools/alias_index.py)",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Enable detailed logging"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    snapshot_id = None
+    if args.dataproxy_cache:
+        snapshot_id = args.seqrepo_snapshot or seqrepo_snapshot_id()
+        if not snapshot_id:
+            parser.error(
+                "--dataproxy-cache needs --seqrepo-snapshot for this data proxy"
+            )
+    factory = partial(
+        build_pipeline,
+        translation_cache=args.translation_cache,
+        dataproxy_cache=args.dataproxy_cache,
+        seqrepo_snapshot=snapshot_id,
+        negative_cache_ttl=args.negative_cache_ttl,
+        alias_index=args.alias_index,
+    )
+
+    if args.processes:
+        job = MultiFileTranslationJob(
+            output_dir=args.output_dir, workers=args.workers, pipeline_factory=factory
+        )
+        summary = job.run(args.inputs, summary_path=args.summary_path, limit=args.limit)
+    else:
+        pipeline = factory()
+        job = MultiFileTranslationJob(
+            pipeline, output_dir=args.output_dir, workers=args.workers
+        )
+        try:
+            summary = job.run(
+                args.inputs, summary_path=args.summary_path, limit=args.limit
+            )
+        finally:
+            close_pipeline(pipeline)
+    logging.info(
+        "Translated %d alleles from %d files (%d failed)",
+        summary.total_translated,
+        len(summary.file_names),
+        len(summary.failed_files),
+    )
+
+
+if __name__ == "__main__":
+    main()
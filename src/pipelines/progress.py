@@ -0,0 +1,135 @@
+import contextlib
+import os
+import sys
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+import orjson
+
+OUTCOMES = ("translated", "invalid_allele", "invalid_fhir", "quarantined")
+
+
+class ProgressReporter:
+    """Report progress, per-outcome throughput and ETA for a run over a compressed input file.
+
+    Percent complete is the compressed byte offset reached by the reader over the file size, so
+    it needs no pre-scan of the input. Rates are averaged over the last `window` seconds, and a
+    report is emitted at most every `interval` seconds to `stream` and/or rewritten into the JSON
+    `status_path`.
+    """
+
+    def __init__(
+        self,
+        total_bytes=None,
+        offset_fn=None,
+        interval=30.0,
+        window=120.0,
+        stream=sys.stderr,
+        status_path=None,
+        clock=time.monotonic,
+    ):
+        self.total_bytes = total_bytes
+        self.offset_fn = offset_fn
+        self.interval = interval
+        self.window = window
+        self.stream = stream
+        self.status_path = Path(status_path) if status_path else None
+        self.clock = clock
+
+        self._last_offset = 0
+        self.counts = Counter()
+        self.lines_read = 0
+        self.started = clock()
+        self._last_report = self.started
+        self._samples = deque([(self.started, 0, Counter())])
+
+    def attach(self, fileobj, total_bytes=None):
+        """Track the offset of the raw (compressed) file object the input is decompressed from."""
+        self.offset_fn = fileobj.tell
+        if total_bytes is None:
+            total_bytes = os.fstat(fileobj.fileno()).st_size
+        self.total_bytes = total_bytes
+
+    def tick(self):
+        """Count one input line and report if the interval has elapsed."""
+        self.lines_read += 1
+        self._maybe_report()
+
+    def record(self, kind):
+        """Count one result of the given outcome and report if the interval has elapsed."""
+        self.counts[kind] += 1
+        self._maybe_report()
+
+    def _maybe_report(self):
+        if self.clock() - self._last_report >= self.interval:
+            self.report()
+
+    def bytes_read(self):
+        """Return the compressed offset reached so far, or the last one seen once the file is closed."""
+        if self.offset_fn is not None:
+            with contextlib.suppress(ValueError):
+                self._last_offset = self.offset_fn()
+        return self._last_offset
+
+    def snapshot(self, final=False):
+        """Return the current progress as a JSON-serializable dict."""
+        now = self.clock()
+        offset = self.total_bytes if final and self.total_bytes else self.bytes_read()
+        self._samples.append((now, offset, Counter(self.counts)))
+        while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+            self._samples.popleft()
+
+        since, since_offset, since_counts = self._samples[0]
+        span = max(now - since, 1e-9)
+        rates = {
+            kind: round((self.counts[kind] - since_counts[kind]) / span, 2)
+            for kind in OUTCOMES
+        }
+
+        percent = eta = None
+        if self.total_bytes:
+            percent = 100.0 if final else min(100.0 * offset / self.total_bytes, 100.0)
+            byte_rate = (offset - since_offset) / span
+            if final:
+                eta = 0.0
+            elif byte_rate > 0:
+                eta = round((self.total_bytes - offset) / byte_rate, 1)
+
+        return {
+            "elapsed_seconds": round(now - self.started, 1),
+            "bytes_read": offset,
+            "total_bytes": self.total_bytes,
+            "percent": round(percent, 2) if percent is not None else None,
+            "eta_seconds": eta,
+            "lines_read": self.lines_read,
+            "counts": {kind: self.counts[kind] for kind in OUTCOMES},
+            "rates_per_second": rates,
+            "done": final,
+        }
+
+    def report(self, final=False):
+        """Emit a progress report now."""
+        self._last_report = self.clock()
+        status = self.snapshot(final=final)
+
+        if self.stream is not None:
+            percent = status["percent"]
+            eta = status["eta_seconds"]
+            rates = status["rates_per_second"]
+            self.stream.write(
+                f"[progress] {'?' if percent is None else f'{percent:.1f}'}% "
+                f"lines={status['lines_read']} "
+                f"translated={status['counts']['translated']} ({rates['translated']}/s) "
+                f"invalid_vrs={status['counts']['invalid_allele']} ({rates['invalid_allele']}/s) "
+                f"failed_fhir={status['counts']['invalid_fhir']} ({rates['invalid_fhir']}/s) "
+                f"quarantined={status['counts']['quarantined']} ({rates['quarantined']}/s) "
+                f"eta={'?' if eta is None else f'{eta:.0f}s'}\n"
+            )
+            self.stream.flush()
+
+        if self.status_path is not None:
+            tmp = self.status_path.with_name(f"{self.status_path.name}.tmp")
+            tmp.write_bytes(orjson.dumps(status, option=orjson.OPT_INDENT_2) + b"\n")
+            os.replace(tmp, self.status_path)
+        return status
@@ -0,0 +1,136 @@
+import hashlib
+from pathlib import Path
+
+import orjson
+
+from translators.translation_cache import vrs_cache_key
+
+MANIFEST_NAME = "manifest.json"
+
+
+def shard_key(vrs_allele):
+    """Return the key a translation is sharded on: the VRS allele id, or its content hash if it has none.
+
+    Args:
+        vrs_allele (dict): The VRS Allele as dumped by `model_dump(exclude_none=True)`.
+
+    Returns:
+        str: The shard key.
+    """
+    return vrs_allele.get("id") or vrs_cache_key(vrs_allele)
+
+
+def shard_for(key, num_shards):
+    """Map a key to a shard number with a hash that is stable across processes and Python versions.
+
+    Args:
+        key (str): The shard key.
+        num_shards (int): The number of shards.
+
+    Returns:
+        int: The shard number in `range(num_shards)`.
+    """
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % num_shards
+
+
+class ShardedJsonlWriter:
+    """Write JSON Lines records into `num_shards` files partitioned by `shard_for`.
+
+    Each shard has its own buffered file handle and running checksum. Closing the writer
+    writes `manifest.json` with the record count, byte size and sha256 of every shard.
+    """
+
+    def __init__(
+        self,
+        directory,
+        num_shards,
+        prefix="vrs_to_fhir_translations",
+        buffer_size=1 << 20,
+    ):
+        if num_shards < 1:
+            raise ValueError(f"num_shards must be at least 1, got {num_shards}.")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.num_shards = num_shards
+        self.paths = [
+            self.directory / f"{prefix}-{shard:05d}-of-{num_shards:05d}.jsonl"
+            for shard in range(num_shards)
+        ]
+        self._files = [open(path, "wb", buffering=buffer_size) for path in self.paths]  # noqa: SIM115 (closed in close())
+        self._checksums = [hashlib.sha256() for _ in self.paths]
+        self._records = [0] * num_shards
+        self._bytes = [0] * num_shards
+        self.closed = False
+
+    def write(self, key, record):
+        """Append one serialized record (including its trailing newline) to the shard owning `key`."""
+        shard = shard_for(key, self.num_shards)
+        self._files[shard].write(record)
+        self._checksums[shard].update(record)
+        self._records[shard] += 1
+        self._bytes[shard] += len(record)
+
+    def manifest(self):
+        """Return the manifest describing every shard written so far."""
+        return {
+            "num_shards": self.num_shards,
+            "hash": "blake2b-64",
+            "total_records": sum(self._records),
+            "shards": [
+                {
+                    "shard": shard,
+                    "file": path.name,
+                    "records": self._records[shard],
+                    "bytes": self._bytes[shard],
+                    "sha256": self._checksums[shard].hexdigest(),
+                }
+                for shard, path in enumerate(self.paths)
+            ],
+        }
+
+    def close(self):
+        """Flush and close every shard, then write the manifest."""
+        if self.closed:
+            return
+        for f in self._files:
+            f.close()
+        (self.directory / MANIFEST_NAME).write_bytes(
+            orjson.dumps(self.manifest(), option=orjson.OPT_INDENT_2) + b"\n"
+        )
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_manifest(directory):
+    """Load a shard manifest and return it with each shard's `file` resolved to a full path."""
+    directory = Path(directory)
+    manifest = orjson.loads((directory / MANIFEST_NAME).read_bytes())
+    for shard in manifest["shards"]:
+        shard["path"] = directory / shard["file"]
+    return manifest
+
+
+def verify_manifest(directory):
+    """Check every shard in a manifest against its recorded size, record count and checksum.
+
+    Args:
+        directory (str): The directory holding the shards and `manifest.json`.
+
+    Raises:
+        ValueError: If any shard does not match the manifest.
+    """
+    for shard in read_manifest(directory)["shards"]:
+        data = shard["path"].read_bytes()
+        actual = (data.count(b"\n"), len(data), hashlib.sha256(data).hexdigest())
+        expected = (shard["records"], shard["bytes"], shard["sha256"])
+        if actual != expected:
+            raise ValueError(
+                f"Shard {shard['file']} does not match the manifest: {actual} != {expected}."
+            )
@@ -0,0 +1,352 @@
+import argparse
+import gzip
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from pathlib import Path
+
+import orjson
+from ga4gh.vrs.models import Allele
+
+from exceptions.utils import UnknownAccessionError
+from pipelines.clinvar_translate import (
+    ClinvarTranslationPipeline,
+    ClinvarTranslationSummary,
+)
+from pipelines.stages import STAGE_KINDS, Stage, StagedPipeline
+from translators.translation_cache import TranslationCache
+
+# Pipeline instance used by stages running in worker processes.
+_worker_pipeline = None
+
+
+def _init_worker(pipeline):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _call_worker(method, item):
+    return getattr(_worker_pipeline, method)(item)
+
+
+class StagedClinvarTranslationPipeline(ClinvarTranslationPipeline):
+    """ClinVar translation split into stages joined by bounded queues.
+
+    Stages: decode (JSON) -> validate (VRS models) -> translate (RLE denormalization and FHIR
+    build) -> serialize, followed by an in-order writer. Each stage's concurrency is set through
+    `stage_config`, a mapping of stage name to `(kind, workers)` where kind is "thread" or
+    "process". Process stages receive this pipeline through a fork; with the "spawn" start method
+    the data proxy must be picklable.
+    """
+
+    STAGES = ("decode", "validate", "translate", "serialize")
+    DEFAULT_STAGE_CONFIG = {
+        "decode": ("thread", 1),
+        "validate": ("thread", 1),
+        "translate": ("thread", 4),
+        "serialize": ("thread", 1),
+    }
+
+    def __init__(
+        self,
+        dp=None,
+        uri: str | None = None,
+        cache=None,
+        stage_config=None,
+        queue_size=1024,
+    ):
+        super().__init__(dp=dp, uri=uri, cache=cache)
+        self.stage_config = {**self.DEFAULT_STAGE_CONFIG, **(stage_config or {})}
+        self.queue_size = queue_size
+        self.stage_stats = {}
+
+    # ========== Stages ==========
+
+    def decode_stage(self, item):
+        """Decode one input line into its members, or None if the line is not valid JSON."""
+        line_num, line = item
+        try:
+            return line_num, orjson.loads(line).get("members", [])
+        except orjson.JSONDecodeError:
+            return line_num, None
+
+    def validate_stage(self, item):
+        """Build VRS Alleles from Allele members; failures carry the validation error message."""
+        line_num, members = item
+        if members is None:
+            return item
+        validated = []
+        for member in members:
+            if not (isinstance(member, dict) and member.get("type") == "Allele"):
+                continue
+            try:
+                validated.append((member, Allele(**member)))
+            except Exception as e:
+                validated.append((member, str(e)))
+        return line_num, validated
+
+    def translate_stage(self, item):
+        """Translate validated alleles into `(kind, state_type, unknown_accession, record)` outputs.
+
+        `unknown_accession` is the accession a failed translation did not recognize, else None.
+        """
+        line_num, validated = item
+        if validated is None:
+            return item
+        results = []
+        for member, vo in validated:
+            if isinstance(vo, str):
+                results.append(
+                    (
+                        "invalid_allele",
+                        None,
+                        None,
+                        {"line": line_num, "error": vo, "member": member},
+                    )
+                )
+                continue
+
+            state_type = vo.state.type
+            vrs_dict = vo.model_dump(exclude_none=True)
+            try:
+                fhir_dict = self.vrs_translator.translate_to_dict(vo)
+            except Exception as e:
+                record = {"line": line_num, "error": str(e), "vrs_allele": vrs_dict}
+                accession = None
+                if isinstance(e, UnknownAccessionError):
+                    accession = record["unknown_accession"] = e.accession
+                results.append(("invalid_fhir", state_type, accession, record))
+                continue
+            results.append(
+                (
+                    "valid",
+                    state_type,
+                    None,
+                    {
+                        "line": line_num,
+                        "vrs_allele": vrs_dict,
+                        "fhir_allele": fhir_dict,
+                    },
+                )
+            )
+        return line_num, results
+
+    def serialize_stage(self, item):
+        """Serialize output records to JSON Lines bytes."""
+        line_num, results = item
+        if results is None:
+            return item
+        return line_num, [
+            (kind, state_type, accession, orjson.dumps(record) + b"\n")
+            for kind, state_type, accession, record in results
+        ]
+
+    def build_stages(self):
+        stages = []
+        for name in self.STAGES:
+            kind, workers = self.stage_config[name]
+            method = f"{name}_stage"
+            if kind == "process":
+                stage = Stage(
+                    name=name,
+                    fn=partial(_call_worker, method),
+                    workers=workers,
+                    kind=kind,
+                    initializer=_init_worker,
+                    initargs=(self,),
+                )
+            else:
+                stage = Stage(name=name, fn=getattr(self, method), workers=workers)
+            stages.append(stage)
+        return stages
+
+    # ========== Driver ==========
+
+    def run_staged(
+        self,
+        inputfile,
+        outputfile,
+        invalid_allele_path,
+        invalid_fhir_path,
+        limit=None,
+        stats_path="runtime_stats.txt",
+        stage_stats_path=None,
+    ):
+        """Run the translation as a staged pipeline, producing the same outputs as `run`.
+
+        Returns:
+            ClinvarTranslationSummary: The run summary. Per-stage statistics are left in
+            `stage_stats` and optionally written to `stage_stats_path`.
+        """
+        if (
+            self.vrs_translator.cache is not None
+            and self.stage_config["translate"][0] == "process"
+        ):
+            raise ValueError(
+                "A translation cache cannot be shared with a process translate stage."
+            )
+
+        started_at_wall = datetime.now()
+        t0 = time.perf_counter()
+
+        counts = dict.fromkeys(
+            [
+                "total_lines_read",
+                "vrs_allele_seen",
+                "total_translated",
+                "failed_vrs_allele_validation",
+                "failed_vrs_to_fhir_translation",
+            ],
+            0,
+        )
+        allele_type = {"lse_count": 0, "rle_count": 0, "other_count": 0}
+        unknown_accessions = Counter()
+        staged = StagedPipeline(self.build_stages(), queue_size=self.queue_size)
+
+        with (
+            gzip.open(inputfile, "rb") as f,
+            open(outputfile, "ab") as out_f,
+            open(invalid_allele_path, "ab") as invalid_allele_log,
+            open(invalid_fhir_path, "ab") as invalid_fhir_log,
+        ):
+            source = islice(enumerate(f, 1), limit)
+            for line_num, results in staged.run(source):
+                counts["total_lines_read"] += 1
+                if results is None:
+                    logging.warning("[Line %d] Skipping: JSON decode error", line_num)
+                    continue
+
+                for kind, state_type, accession, record in results:
+                    counts["vrs_allele_seen"] += 1
+                    if kind == "invalid_allele":
+                        counts["failed_vrs_allele_validation"] += 1
+                        invalid_allele_log.write(record)
+                        continue
+
+                    if "LiteralSequenceExpression" in state_type:
+                        allele_type["lse_count"] += 1
+                    elif "ReferenceLengthExpression" in state_type:
+                        allele_type["rle_count"] += 1
+                    else:
+                        allele_type["other_count"] += 1
+
+                    if kind == "valid":
+                        counts["total_translated"] += 1
+                        out_f.write(record)
+                    else:
+                        counts["failed_vrs_to_fhir_translation"] += 1
+                        invalid_fhir_log.write(record)
+                        if accession is not None:
+                            unknown_accessions[accession] += 1
+
+        self.stage_stats = {
+            name: stats.as_dict() for name, stats in staged.stats.items()
+        }
+        for name, stats in self.stage_stats.items():
+            logging.info(
+                "Stage %s: %d items, %.0f%% utilization, max queue depth %d/%d",
+                name,
+                stats["items"],
+                stats["utilization"] * 100,
+                stats["max_queue_depth"],
+                stats["queue_capacity"],
+            )
+        if stage_stats_path is not None:
+            with open(stage_stats_path, "wb") as f:
+                f.write(
+                    orjson.dumps(self.stage_stats, option=orjson.OPT_INDENT_2) + b"\n"
+                )
+
+        ended_at_wall = datetime.now()
+        summary = ClinvarTranslationSummary(
+            file_name=Path(inputfile).name,
+            start_date=started_at_wall.date().isoformat(),
+            start_time=started_at_wall.time().isoformat(timespec="seconds"),
+            end_date=ended_at_wall.date().isoformat(),
+            end_time=ended_at_wall.time().isoformat(timespec="seconds"),
+            duration_seconds=round(max(time.perf_counter() - t0, 1e-9), 2),
+            vrs_allele_types=allele_type,
+            total_failed=counts["failed_vrs_allele_validation"]
+            + counts["failed_vrs_to_fhir_translation"],
+            unknown_accessions=dict(unknown_accessions.most_common()),
+            **counts,
+        )
+        with open(stats_path, "wb") as stats:
+            stats.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2) + b"\n")
+        return summary
+
+    def main(self):
+        parser = argparse.ArgumentParser(
+            prog="allele-to-fhir-staged-translator",
+            description="Translate ClinVar VRS Alleles to FHIR with a staged, bounded-queue pipeline",
+        )
+        parser.add_argument("input_gzip", help="Path to gzipped JSONL file")
+        parser.add_argument("--output", default="vrs_to_fhir_translations.jsonl")
+        parser.add_argument("--invalid-allele-log", default="invalid_vrs_alleles.jsonl")
+        parser.add_argument("--invalid-fhir-log", default="invalid_trans_to_fhir.jsonl")
+        parser.add_argument("--summary-path", default="runtime_stats.txt")
+        parser.add_argument(
+            "--stage-stats",
+            help="Write per-stage queue depth and utilization to this file",
+        )
+        parser.add_argument(
+            "--limit", type=int, help="Process only this many lines from input"
+        )
+        parser.add_argument(
+            "--queue-size", type=int, default=1024, help="Capacity of each stage queue"
+        )
+        for name in self.STAGES:
+            kind, workers = self.DEFAULT_STAGE_CONFIG[name]
+            parser.add_argument(
+                f"--{name}-workers",
+                type=int,
+                default=workers,
+                help=f"Workers for the {name} stage",
+            )
+            parser.add_argument(
+                f"--{name}-kind",
+                choices=STAGE_KINDS,
+                default=kind,
+                help=f"Run the {name} stage on threads or processes",
+            )
+        parser.add_argument(
+            "--translation-cache",
+            help="SQLite file memoizing VRS -> FHIR translations across runs",
+        )
+        parser.add_argument(
+            "--verbose", action="store_true", help="Enable detailed logging"
+        )
+
+        args = parser.parse_args()
+
+        logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+        logging.info("Starting Staged Translation Job")
+
+        self.queue_size = args.queue_size
+        self.stage_config = {
+            name: (getattr(args, f"{name}_kind"), getattr(args, f"{name}_workers"))
+            for name in self.STAGES
+        }
+        if args.translation_cache:
+            self.vrs_translator.cache = TranslationCache(args.translation_cache)
+
+        try:
+            self.run_staged(
+                inputfile=args.input_gzip,
+                outputfile=args.output,
+                invalid_allele_path=args.invalid_allele_log,
+                invalid_fhir_path=args.invalid_fhir_log,
+                limit=args.limit,
+                stats_path=args.summary_path,
+                stage_stats_path=args.stage_stats,
+            )
+        finally:
+            if self.vrs_translator.cache is not None:
+                self.vrs_translator.cache.close()
+
+
+if __name__ == "__main__":
+    StagedClinvarTranslationPipeline().main()
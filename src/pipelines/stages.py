@@ -0,0 +1,274 @@
+import heapq
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+STAGE_KINDS = ("thread", "process")
+
+# Sentinel marking the end of the stream on a stage queue.
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """One step of a `StagedPipeline`.
+
+    `fn` maps one item to one item. Thread stages run `fn` on `workers` threads, which suits
+    I/O-bound work such as data proxy lookups. Process stages run `fn` in a pool of `workers`
+    processes (optionally set up by `initializer(*initargs)`), which suits CPU-bound work; `fn`
+    and its items must then be picklable.
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    kind: str = "thread"
+    initializer: Callable | None = None
+    initargs: tuple = ()
+
+    def __post_init__(self):
+        if self.kind not in STAGE_KINDS:
+            raise ValueError(
+                f"Unknown stage kind {self.kind!r}, expected one of {STAGE_KINDS}."
+            )
+        if self.workers < 1:
+            raise ValueError(f"Stage {self.name!r} needs at least one worker.")
+
+
+@dataclass
+class StageStats:
+    name: str
+    kind: str
+    workers: int
+    queue_capacity: int
+    items: int = 0
+    busy_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def utilization(self):
+        """Fraction of the stage's worker time spent processing items."""
+        if not self.wall_seconds:
+            return 0.0
+        return min(self.busy_seconds / (self.wall_seconds * self.workers), 1.0)
+
+    def as_dict(self):
+        stats = {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if not f.name.startswith("_")
+        }
+        stats["busy_seconds"] = round(self.busy_seconds, 4)
+        stats["wall_seconds"] = round(self.wall_seconds, 4)
+        stats["utilization"] = round(self.utilization, 4)
+        return stats
+
+
+class StagedPipeline:
+    """Run items through a chain of stages connected by bounded queues.
+
+    Every stage reads from its own queue of at most `queue_size` items, so a slow stage blocks
+    the stages before it instead of letting work pile up in memory. Results are yielded in source
+    order. `stats` reports each stage's throughput, utilization and input queue depth; the stage
+    with the highest utilization and a full input queue is the bottleneck.
+
+    At most `queue_size` items are in flight between the source and the consumer, so results that
+    finish ahead of a slow item wait in a reorder buffer of bounded size (its high-water mark is
+    `max_reorder_depth`) while the source is held back.
+    """
+
+    def __init__(self, stages, queue_size=1024, mp_context=None):
+        if not stages:
+            raise ValueError("A staged pipeline needs at least one stage.")
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.mp_context = mp_context
+        self.stats = {
+            stage.name: StageStats(
+                name=stage.name,
+                kind=stage.kind,
+                workers=stage.workers,
+                queue_capacity=queue_size,
+            )
+            for stage in self.stages
+        }
+        self.max_reorder_depth = 0
+        self._queues = []
+        self._window = None
+        self._error = None
+        self._abort = threading.Event()
+
+    def _put(self, q, item, stats=None):
+        while not self._abort.is_set():
+            try:
+                q.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            if stats is not None:
+                depth = q.qsize()
+                stats.queue_depth = depth
+                stats.max_queue_depth = max(stats.max_queue_depth, depth)
+            return True
+        return False
+
+    def _get(self, q):
+        while not self._abort.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _acquire(self, semaphore):
+        while not self._abort.is_set():
+            if semaphore.acquire(timeout=0.1):
+                return True
+        return False
+
+    def _fail(self, error):
+        if self._error is None:
+            self._error = error
+        self._abort.set()
+
+    def _feed(self, source):
+        first = self.stages[0]
+        try:
+            for seq, item in enumerate(source):
+                if not self._acquire(self._window):
+                    return
+                if not self._put(self._queues[0], (seq, item), self.stats[first.name]):
+                    return
+        except BaseException as e:
+            self._fail(e)
+            return
+        for _ in range(first.workers):
+            self._put(self._queues[0], _DONE)
+
+    def _work(self, index, call, remaining):
+        stage = self.stages[index]
+        stats = self.stats[stage.name]
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1]
+        next_stats = (
+            self.stats[self.stages[index + 1].name]
+            if index + 1 < len(self.stages)
+            else None
+        )
+        try:
+            while True:
+                entry = self._get(inbox)
+                if entry is _DONE:
+                    break
+                seq, item = entry
+                started = time.perf_counter()
+                result = call(item)
+                elapsed = time.perf_counter() - started
+                with stats._lock:
+                    stats.items += 1
+                    stats.busy_seconds += elapsed
+                    stats.queue_depth = inbox.qsize()
+                if not self._put(outbox, (seq, result), next_stats):
+                    break
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            with remaining["lock"]:
+                remaining["count"] -= 1
+                last = remaining["count"] == 0
+            if last:
+                stats.wall_seconds = time.perf_counter() - remaining["started"]
+                downstream = (
+                    self.stages[index + 1].workers
+                    if index + 1 < len(self.stages)
+                    else 1
+                )
+                for _ in range(downstream):
+                    self._put(outbox, _DONE)
+
+    def run(self, source):
+        """Yield `stages[-1].fn(...stages[0].fn(item))` for every item of `source`, in order.
+
+        Raises:
+            Exception: The first exception raised by the source or any stage.
+        """
+        self._queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        self._queues.append(queue.Queue(maxsize=self.queue_size))
+        # One permit per sequence number between the source and the consumer.
+        self._window = threading.Semaphore(self.queue_size)
+        self.max_reorder_depth = 0
+        self._error = None
+        self._abort.clear()
+
+        executors = []
+        threads = [threading.Thread(target=self._feed, args=(source,), daemon=True)]
+        started = time.perf_counter()
+        for index, stage in enumerate(self.stages):
+            call = stage.fn
+            if stage.kind == "process":
+                executor = ProcessPoolExecutor(
+                    max_workers=stage.workers,
+                    mp_context=self.mp_context,
+                    initializer=stage.initializer,
+                    initargs=stage.initargs,
+                )
+                executors.append(executor)
+
+                def call(item, executor=executor, fn=stage.fn):
+                    return executor.submit(fn, item).result()
+
+            elif stage.initializer is not None:
+                stage.initializer(*stage.initargs)
+
+            remaining = {
+                "count": stage.workers,
+                "lock": threading.Lock(),
+                "started": started,
+            }
+            threads.extend(
+                threading.Thread(
+                    target=self._work,
+                    args=(index, call, remaining),
+                    name=f"{stage.name}-{worker}",
+                    daemon=True,
+                )
+                for worker in range(stage.workers)
+            )
+
+        for thread in threads:
+            thread.start()
+
+        # Workers finish out of order; results wait here until their predecessors arrive.
+        pending = []
+        next_seq = 0
+        finished = False
+        try:
+            while True:
+                entry = self._get(self._queues[-1])
+                if entry is _DONE:
+                    break
+                heapq.heappush(pending, entry)
+                self.max_reorder_depth = max(self.max_reorder_depth, len(pending))
+                while pending and pending[0][0] == next_seq:
+                    item = heapq.heappop(pending)[1]
+                    self._window.release()
+                    yield item
+                    next_seq += 1
+            finished = not self._abort.is_set()
+        finally:
+            # Stop the workers if the consumer stopped early or a stage failed.
+            if not finished:
+                self._abort.set()
+            for thread in threads:
+                thread.join()
+            for executor in executors:
+                executor.shutdown(cancel_futures=True)
+
+        if self._error is not None:
+            raise self._error
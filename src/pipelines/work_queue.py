@@ -0,0 +1,365 @@
+import argparse
+import contextlib
+import gzip
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import orjson
+
+from pipelines.clinvar_translate import (
+    ClinvarTranslationPipeline,
+    load_summary,
+    merge_summaries,
+)
+
+PLAN_NAME = "plan.json"
+
+
+def plan_work_queue(inputfile, queue_dir, chunk_bytes=64 << 20):
+    """Split a gzipped ClinVar JSONL file into chunks that workers can claim independently.
+
+    A gzip stream cannot be entered at an arbitrary byte offset, so the input is read once and
+    re-written as gzipped chunk files, each covering roughly `chunk_bytes` of uncompressed input
+    and ending on a line boundary. `plan.json` records every chunk's first line number and its
+    uncompressed byte range in the original input.
+
+    Args:
+        inputfile (str): Path to the gzipped ClinVar variation JSONL.
+        queue_dir (str): Shared directory holding the queue.
+        chunk_bytes (int): Target uncompressed size of each chunk.
+
+    Returns:
+        dict: The work plan.
+    """
+    queue_dir = Path(queue_dir)
+    for name in ("chunks", "leases", "done", "outputs"):
+        (queue_dir / name).mkdir(parents=True, exist_ok=True)
+
+    chunks = []
+    chunk = None
+    offset = 0
+    with gzip.open(inputfile, "rb") as f:
+        for line_num, line in enumerate(f, 1):
+            if chunk is None:
+                chunk_id = len(chunks)
+                path = queue_dir / "chunks" / f"chunk-{chunk_id:05d}.jsonl.gz"
+                chunk = {
+                    "chunk": chunk_id,
+                    "file": path.name,
+                    "first_line": line_num,
+                    "num_lines": 0,
+                    "start_byte": offset,
+                    "end_byte": offset,
+                }
+                chunk_f = gzip.open(path, "wb", compresslevel=1)  # noqa: SIM115
+            chunk_f.write(line)
+            chunk["num_lines"] += 1
+            offset += len(line)
+            chunk["end_byte"] = offset
+            if chunk["end_byte"] - chunk["start_byte"] >= chunk_bytes:
+                chunk_f.close()
+                chunks.append(chunk)
+                chunk = None
+    if chunk is not None:
+        chunk_f.close()
+        chunks.append(chunk)
+
+    plan = {"input": Path(inputfile).name, "chunks": chunks}
+    (queue_dir / PLAN_NAME).write_bytes(
+        orjson.dumps(plan, option=orjson.OPT_INDENT_2) + b"\n"
+    )
+    return plan
+
+
+class WorkQueueWorker:
+    """Claim and translate chunks of a planned work queue until every chunk is done.
+
+    A chunk is claimed by atomically creating `leases/chunk-N.lease` (`O_CREAT | O_EXCL`). The lease
+    is kept alive by touching its mtime every `lease_seconds / 3`; a lease whose mtime is older than
+    `lease_seconds` belongs to a dead worker and is reclaimed by renaming it away, which only one
+    contender can win. Outputs are written under temporary names and moved into `outputs/` only
+    while the lease is still held, after which `done/chunk-N.done` marks the chunk complete.
+    Workers may join or leave at any time.
+    """
+
+    def __init__(
+        self,
+        queue_dir,
+        pipeline=None,
+        worker_id=None,
+        lease_seconds=300.0,
+        poll_interval=1.0,
+    ):
+        self.queue_dir = Path(queue_dir)
+        self.pipeline = pipeline or ClinvarTranslationPipeline()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.plan = orjson.loads((self.queue_dir / PLAN_NAME).read_bytes())
+
+    def _lease_path(self, chunk):
+        return self.queue_dir / "leases" / f"chunk-{chunk['chunk']:05d}.lease"
+
+    def _done_path(self, chunk):
+        return self.queue_dir / "done" / f"chunk-{chunk['chunk']:05d}.done"
+
+    def _output_path(self, chunk, suffix):
+        return self.queue_dir / "outputs" / f"chunk-{chunk['chunk']:05d}{suffix}"
+
+    def is_done(self, chunk):
+        return self._done_path(chunk).exists()
+
+    def _lease_expired(self, lease_path):
+        try:
+            return time.time() - lease_path.stat().st_mtime > self.lease_seconds
+        except FileNotFoundError:
+            return True
+
+    def try_claim(self, chunk):
+        """Try to take the lease on a chunk; returns the lease token, or None if another worker holds it."""
+        lease_path = self._lease_path(chunk)
+        if lease_path.exists() and self._lease_expired(lease_path):
+            self._reclaim(lease_path)
+
+        token = f"{self.worker_id}:{uuid.uuid4().hex}"
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        with os.fdopen(fd, "wb") as f:
+            f.write(token.encode())
+        return token
+
+    def _reclaim(self, lease_path):
+        """Move an expired lease out of the way so the chunk can be claimed again."""
+        try:
+            expired_token = lease_path.read_bytes()
+        except FileNotFoundError:
+            return
+        stale = lease_path.with_name(f"{lease_path.name}.stale-{uuid.uuid4().hex}")
+        try:
+            os.rename(lease_path, stale)
+        except FileNotFoundError:
+            return
+
+        # Another worker may have reclaimed and re-leased the chunk between the expiry check and
+        # the rename; if so, put its live lease back.
+        if stale.read_bytes() != expired_token:
+            with contextlib.suppress(FileExistsError):
+                os.link(stale, lease_path)
+        else:
+            logging.info("Reclaimed expired lease %s", lease_path.name)
+        stale.unlink()
+
+    def holds_lease(self, chunk, token):
+        try:
+            return self._lease_path(chunk).read_bytes().decode() == token
+        except FileNotFoundError:
+            return False
+
+    def release(self, chunk, token):
+        if self.holds_lease(chunk, token):
+            self._lease_path(chunk).unlink(missing_ok=True)
+
+    def _heartbeat(self, chunk, token, stop):
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.holds_lease(chunk, token):
+                return
+            os.utime(self._lease_path(chunk))
+
+    def process(self, chunk, token):
+        """Translate one claimed chunk into its per-chunk outputs.
+
+        Returns:
+            bool: True if the outputs were committed, False if the lease was lost meanwhile.
+        """
+        suffixes = (
+            ".jsonl",
+            ".invalid_alleles.jsonl",
+            ".invalid_fhir.jsonl",
+            ".stats.json",
+        )
+        tmp_paths = [
+            self._output_path(chunk, f"{suffix}.{token.rsplit(':', 1)[-1]}.tmp")
+            for suffix in suffixes
+        ]
+        outputfile, invalid_allele_path, invalid_fhir_path, stats_path = tmp_paths
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(chunk, token, stop), daemon=True
+        )
+        heartbeat.start()
+        try:
+            self.pipeline.run(
+                inputfile=self.queue_dir / "chunks" / chunk["file"],
+                outputfile=outputfile,
+                invalid_allele_path=invalid_allele_path,
+                invalid_fhir_path=invalid_fhir_path,
+                stats_path=stats_path,
+                first_line=chunk["first_line"],
+            )
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        summary = load_summary(stats_path)
+        summary.file_name = self.plan["input"]
+        stats_path.write_bytes(
+            orjson.dumps(summary, option=orjson.OPT_INDENT_2) + b"\n"
+        )
+
+        if not self.holds_lease(chunk, token):
+            logging.warning(
+                "Lost lease on chunk %d, discarding outputs", chunk["chunk"]
+            )
+            for path in tmp_paths:
+                path.unlink(missing_ok=True)
+            return False
+
+        for path, suffix in zip(tmp_paths, suffixes, strict=True):
+            os.replace(path, self._output_path(chunk, suffix))
+        self._done_path(chunk).write_text(self.worker_id)
+        return True
+
+    def run(self, wait=True):
+        """Process chunks until every chunk is done.
+
+        Args:
+            wait (bool): Keep polling while other workers hold leases. When False, return as soon as
+                no unclaimed chunk is left.
+
+        Returns:
+            list[int]: The chunks this worker completed.
+        """
+        completed = []
+        while True:
+            pending = [c for c in self.plan["chunks"] if not self.is_done(c)]
+            if not pending:
+                return completed
+
+            claimed = False
+            for chunk in pending:
+                token = self.try_claim(chunk)
+                if token is None:
+                    continue
+                claimed = True
+                try:
+                    if not self.is_done(chunk) and self.process(chunk, token):
+                        completed.append(chunk["chunk"])
+                finally:
+                    self.release(chunk, token)
+
+            if not claimed:
+                if not wait:
+                    return completed
+                time.sleep(self.poll_interval)
+
+
+def collect_work_queue(
+    queue_dir,
+    outputfile,
+    invalid_allele_path,
+    invalid_fhir_path,
+    stats_path="runtime_stats.txt",
+):
+    """Concatenate the per-chunk outputs of a finished queue in input order and merge their summaries.
+
+    Raises:
+        ValueError: If any chunk is not done yet.
+    """
+    queue_dir = Path(queue_dir)
+    plan = orjson.loads((queue_dir / PLAN_NAME).read_bytes())
+    outputs = queue_dir / "outputs"
+
+    chunk_names = [f"chunk-{chunk['chunk']:05d}" for chunk in plan["chunks"]]
+    missing = [
+        name
+        for name in chunk_names
+        if not (queue_dir / "done" / f"{name}.done").exists()
+    ]
+    if missing:
+        raise ValueError(f"Chunks not done yet: {missing}.")
+
+    for path, suffix in (
+        (outputfile, ".jsonl"),
+        (invalid_allele_path, ".invalid_alleles.jsonl"),
+        (invalid_fhir_path, ".invalid_fhir.jsonl"),
+    ):
+        with open(path, "wb") as out_f:
+            for name in chunk_names:
+                out_f.write((outputs / f"{name}{suffix}").read_bytes())
+
+    merged = merge_summaries(
+        [load_summary(outputs / f"{name}.stats.json") for name in chunk_names]
+    )
+    with open(stats_path, "wb") as f:
+        f.write(orjson.dumps(merged, option=orjson.OPT_INDENT_2) + b"\n")
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="allele-to-fhir-work-queue",
+        description="Translate a ClinVar file with any number of workers sharing a queue directory",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = subparsers.add_parser(
+        "plan", help="Split the input into claimable chunks"
+    )
+    plan_parser.add_argument("input_gzip", help="Path to gzipped JSONL file")
+    plan_parser.add_argument("queue_dir")
+    plan_parser.add_argument(
+        "--chunk-bytes",
+        type=int,
+        default=64 << 20,
+        help="Target uncompressed bytes per chunk",
+    )
+
+    work_parser = subparsers.add_parser("work", help="Claim and translate chunks")
+    work_parser.add_argument("queue_dir")
+    work_parser.add_argument("--lease-seconds", type=float, default=300.0)
+    work_parser.add_argument("--poll-interval", type=float, default=5.0)
+
+    collect_parser = subparsers.add_parser("collect", help="Combine per-chunk outputs")
+    collect_parser.add_argument("queue_dir")
+    collect_parser.add_argument("--output", default="vrs_to_fhir_translations.jsonl")
+    collect_parser.add_argument(
+        "--invalid-allele-log", default="invalid_vrs_alleles.jsonl"
+    )
+    collect_parser.add_argument(
+        "--invalid-fhir-log", default="invalid_trans_to_fhir.jsonl"
+    )
+    collect_parser.add_argument("--summary-path", default="runtime_stats.txt")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "plan":
+        plan = plan_work_queue(args.input_gzip, args.queue_dir, args.chunk_bytes)
+        logging.info("Planned %d chunks", len(plan["chunks"]))
+    elif args.command == "work":
+        completed = WorkQueueWorker(
+            args.queue_dir,
+            lease_seconds=args.lease_seconds,
+            poll_interval=args.poll_interval,
+        ).run()
+        logging.info("Completed chunks %s", completed)
+    else:
+        collect_work_queue(
+            args.queue_dir,
+            outputfile=args.output,
+            invalid_allele_path=args.invalid_allele_log,
+            invalid_fhir_path=args.invalid_fhir_log,
+            stats_path=args.summary_path,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import json
+import sys
+import zlib
+
+from profiles.allele import Allele
+from translators.constants.vrs_json_pointers import (
+    sequence_reference_identifiers as SEQ_REF_PTRS,
+)
+
+REFSEQ_SYSTEM = "http://www.ncbi.nlm.nih.gov/refseq"
+REFSEQ_PREFIXES = ("NC_", "NG_", "NW_", "NT_", "NM_", "NR_", "NP_")
+
+
+def _intern(value):
+    """Intern repeated accession strings so large allele sets share one copy."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _as_int(value):
+    """Return integral coordinates as int (FHIR Quantity values may decode as float)."""
+    if value is None:
+        return None
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+class AlleleView:
+    """A compact, read-only view over a FHIR Allele Profile.
+
+    Only the fields needed for analytics are kept as attributes: the RefSeq and refget
+    accessions, the start/end coordinates, the allele-state literal, the resource id and
+    the identifiers. The source resource is retained as zlib-compressed JSON so the view can
+    be promoted back to a full `profiles.allele.Allele` with `to_model()`.
+    """
+
+    __slots__ = (
+        "id",
+        "refseq_accession",
+        "refget_accession",
+        "start",
+        "end",
+        "allele_state",
+        "identifiers",
+        "_source",
+    )
+
+    def __init__(
+        self,
+        id=None,
+        refseq_accession=None,
+        refget_accession=None,
+        start=None,
+        end=None,
+        allele_state=None,
+        identifiers=(),
+        source=None,
+    ):
+        set_attr = object.__setattr__
+        set_attr(self, "id", id)
+        set_attr(self, "refseq_accession", _intern(refseq_accession))
+        set_attr(self, "refget_accession", _intern(refget_accession))
+        set_attr(self, "start", start)
+        set_attr(self, "end", end)
+        set_attr(self, "allele_state", allele_state)
+        set_attr(self, "identifiers", tuple(identifiers))
+        set_attr(self, "_source", source)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(refseq_accession={self.refseq_accession!r}, "
+            f"refget_accession={self.refget_accession!r}, start={self.start!r}, "
+            f"end={self.end!r}, allele_state={self.allele_state!r})"
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, AlleleView):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in self.__slots__
+            if name != "_source"
+        )
+
+    def __hash__(self):
+        return hash(
+            (
+                self.refseq_accession,
+                self.refget_accession,
+                self.start,
+                self.end,
+                self.allele_state,
+            )
+        )
+
+    # ========== Construction ==========
+
+    @classmethod
+    def from_json(cls, data):
+        """Build a view from raw FHIR Allele JSON without constructing the pydantic model.
+
+        Args:
+            data (dict | str | bytes): A FHIR Allele Profile as parsed JSON or raw JSON text.
+
+        Returns:
+            AlleleView: A compact view over the allele.
+        """
+        if isinstance(data, bytes | bytearray | str):
+            raw = data.encode() if isinstance(data, str) else bytes(data)
+            data = json.loads(raw)
+        else:
+            raw = json.dumps(data, separators=(",", ":")).encode()
+
+        return cls._from_dict(data, source=zlib.compress(raw))
+
+    @classmethod
+    def from_model(cls, allele):
+        """Build a view from an existing FHIR Allele Profile instance.
+
+        Args:
+            allele (Allele): A FHIR Allele Profile instance.
+
+        Returns:
+            AlleleView: A compact view over the allele.
+        """
+        raw = allele.model_dump_json(exclude_none=True).encode()
+        return cls._from_dict(json.loads(raw), source=zlib.compress(raw))
+
+    @classmethod
+    def _from_dict(cls, data, source):
+        """Extract the core fields from a FHIR Allele Profile dictionary."""
+        refseq_accession, refget_accession = cls._extract_accessions(data)
+        interval = cls._extract_coordinate_interval(data)
+
+        return cls(
+            id=data.get("id"),
+            refseq_accession=refseq_accession,
+            refget_accession=refget_accession,
+            start=_as_int((interval.get("startQuantity") or {}).get("value")),
+            end=_as_int((interval.get("endQuantity") or {}).get("value")),
+            allele_state=cls._extract_allele_state(data),
+            identifiers=(
+                (identifier.get("system"), identifier.get("value"))
+                for identifier in data.get("identifier") or []
+            ),
+            source=source,
+        )
+
+    @staticmethod
+    def _extract_coordinate_interval(data):
+        """Return `location[0].sequenceLocation.coordinateInterval`, or an empty dict."""
+        locations = data.get("location") or [{}]
+        sequence_location = locations[0].get("sequenceLocation") or {}
+        return sequence_location.get("coordinateInterval") or {}
+
+    @staticmethod
+    def _extract_allele_state(data):
+        """Return the literal value of the `allele-state` representation, if present."""
+        for rep in data.get("representation") or []:
+            codings = (rep.get("focus") or {}).get("coding") or []
+            if any(coding.get("code") == "allele-state" for coding in codings):
+                return (rep.get("literal") or {}).get("value")
+        return None
+
+    @staticmethod
+    def _extract_accessions(data):
+        """Find the RefSeq and refget accessions in the contained Sequence profiles.
+
+        Falls back to `sequenceContext.display` for the RefSeq accession when no contained
+        Sequence carries a RefSeq coding.
+        """
+        refseq_accession = refget_accession = None
+        for contained in data.get("contained") or []:
+            for rep in contained.get("representation") or []:
+                for code in rep.get("code") or []:
+                    for coding in code.get("coding") or []:
+                        system = coding.get("system")
+                        if system == REFSEQ_SYSTEM and refseq_accession is None:
+                            refseq_accession = coding.get("code")
+                        elif (
+                            system == SEQ_REF_PTRS["refgetAccession"]
+                            and refget_accession is None
+                        ):
+                            refget_accession = coding.get("code")
+
+        if refseq_accession is None:
+            locations = data.get("location") or [{}]
+            context = (locations[0].get("sequenceLocation") or {}).get(
+                "sequenceContext"
+            ) or {}
+            display = context.get("display") or ""
+            if display.startswith(REFSEQ_PREFIXES):
+                refseq_accession = display
+
+        return refseq_accession, refget_accession
+
+    # ========== Promotion ==========
+
+    def to_json(self):
+        """Return the retained FHIR Allele JSON as bytes."""
+        return zlib.decompress(self._source)
+
+    def to_dict(self):
+        """Return the retained FHIR Allele JSON as a dictionary."""
+        return json.loads(self.to_json())
+
+    def to_model(self):
+        """Promote the view back to a fully validated FHIR Allele Profile."""
+        return Allele.model_validate_json(self.to_json())
@@ -0,0 +1,148 @@
+import json
+from collections import Counter
+
+from pydantic import ValidationError
+
+from exceptions.fhir import FHIRException, UnknownProfileError
+from profiles.allele import Allele
+from profiles.sequence import Sequence
+from profiles.variation import Variation
+
+# NOTE: Genotype is a work in progress and is intentionally not dispatched to.
+PROFILE_CLASSES = {
+    "Sequence": Sequence,
+    "Allele": Allele,
+    "Variation": Variation,
+}
+
+ALLELE_FOCUS_CODES = frozenset({"allele-state"})
+VARIATION_FOCUS_CODES = frozenset({"reference-state", "alternative-state"})
+
+
+def _focus_codes(data):
+    """Collect every `representation[*].focus.coding[*].code` value from raw JSON."""
+    codes = set()
+    for rep in data.get("representation") or []:
+        if not isinstance(rep, dict):
+            continue
+        focus = rep.get("focus") or {}
+        for coding in focus.get("coding") or []:
+            if isinstance(coding, dict) and coding.get("code"):
+                codes.add(coding["code"])
+    return codes
+
+
+def detect_profile(data):
+    """Determine which MolecularDefinition profile a raw JSON record targets.
+
+    Only the keys that separate the profiles are inspected, so no model is built:
+        - `memberState` is not allowed in any of the supported profiles.
+        - Without `location` the record can only be a Sequence.
+        - A `reference-state` or `alternative-state` focus marks a Variation.
+        - An `allele-state` focus marks an Allele.
+
+    Args:
+        data (dict): A MolecularDefinition resource as parsed JSON.
+
+    Raises:
+        UnknownProfileError: If the record does not match Sequence, Allele or Variation.
+
+    Returns:
+        str: The profile name ("Sequence", "Allele" or "Variation").
+    """
+    if not isinstance(data, dict):
+        raise UnknownProfileError(
+            f"Expected a MolecularDefinition JSON object, got {type(data).__name__}."
+        )
+
+    if "memberState" in data:
+        raise UnknownProfileError(
+            "`memberState` is not allowed in Sequence, Allele or Variation."
+        )
+
+    if "location" not in data:
+        return "Sequence"
+
+    codes = _focus_codes(data)
+    if codes & VARIATION_FOCUS_CODES:
+        return "Variation"
+    if codes & ALLELE_FOCUS_CODES:
+        return "Allele"
+
+    raise UnknownProfileError(
+        "A MolecularDefinition with `location` must have an 'allele-state', "
+        "'reference-state' or 'alternative-state' focus."
+    )
+
+
+class ProfileDispatcher:
+    """Validate mixed MolecularDefinition records against the profile each one targets.
+
+    Each record is inspected with `detect_profile` and validated exactly once by the
+    matching class from `profiles/`. Successful validations are tallied per profile
+    in `counts`; records that could not be detected or failed validation are tallied
+    in `failures` (undetected records under "unknown").
+    """
+
+    def __init__(self, profiles=None):
+        self.profiles = dict(profiles or PROFILE_CLASSES)
+        self.counts = Counter()
+        self.failures = Counter()
+
+    def _load(self, record):
+        """Accept parsed JSON, a JSON string or a JSON bytes line."""
+        if isinstance(record, bytes | bytearray | str):
+            return json.loads(record)
+        return record
+
+    def validate(self, record):
+        """Validate a single record against its detected profile.
+
+        Args:
+            record (dict | str | bytes): A MolecularDefinition resource as parsed JSON or raw JSON text.
+
+        Raises:
+            UnknownProfileError: If the record does not match a supported profile.
+            JSONDecodeError: If a raw JSON record cannot be parsed.
+            FHIRException | ValidationError: If the record fails validation against its profile.
+
+        Returns:
+            tuple[str, MolecularDefinition]: The profile name and the validated profile instance.
+        """
+        try:
+            data = self._load(record)
+            name = detect_profile(data)
+            if name not in self.profiles:
+                raise UnknownProfileError(f"No profile class registered for '{name}'.")
+        except (UnknownProfileError, json.JSONDecodeError):
+            self.failures["unknown"] += 1
+            raise
+
+        try:
+            instance = self.profiles[name](**data)
+        except (FHIRException, ValidationError):
+            self.failures[name] += 1
+            raise
+
+        self.counts[name] += 1
+        return name, instance
+
+    def iter_validate(self, records, skip_invalid=False):
+        """Lazily validate a stream of records, one at a time.
+
+        Args:
+            records (Iterable): Parsed JSON records, JSON strings or JSONL byte lines.
+            skip_invalid (bool, optional): If True, records that cannot be detected or fail
+                validation are counted in `failures` and skipped instead of raising. Defaults to False.
+
+        Yields:
+            tuple[str, MolecularDefinition]: The profile name and the validated profile instance.
+        """
+        for record in records:
+            if isinstance(record, bytes | bytearray | str) and not record.strip():
+                continue
+            try:
+                yield self.validate(record)
+            except (FHIRException, ValidationError, json.JSONDecodeError):
+                if not skip_invalid:
+                    raise
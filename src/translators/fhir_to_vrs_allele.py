@@ -62,7 +62,7 @@ class FhirToVrsAlleleTranslator:
         """
         values = {"aliases": []}
 
-        for identifier in ao.identifier:
+        for identifier in ao.identifier or []:
             for key, system_uri in ALLELE_PTRS.items():
                 if system_uri in identifier.system:
                     if key == "aliases":
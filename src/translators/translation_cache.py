@@ -0,0 +1,218 @@
+import functools
+import hashlib
+import logging
+import sqlite3
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import find_spec
+from pathlib import Path
+
+import orjson
+from ga4gh.core import sha512t24u
+from ga4gh.vrs import VRS_VERSION
+
+# Bump when the layout of cached payloads changes.
+CACHE_FORMAT_VERSION = 1
+
+# Packages whose source determines the FHIR produced for a VRS Allele.
+TRANSLATOR_PACKAGES = (
+    "translators",
+    "conventions",
+    "profiles",
+    "resources",
+    "vrs_tools",
+)
+
+
+def _package_version(name):
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@functools.cache
+def translator_source_digest():
+    """Return a digest of the source files of `TRANSLATOR_PACKAGES`.
+
+    A source checkout (and the test suite) has no installed `fhir.moldef` version, so the package
+    version alone would never change with the translator code.
+
+    Returns:
+        str: The first 16 hex digits of the sha256 over every module's path and contents.
+    """
+    digest = hashlib.sha256()
+    for name in TRANSLATOR_PACKAGES:
+        root = Path(find_spec(name).origin).parent
+        for path in sorted(root.rglob("*.py")):
+            digest.update(path.relative_to(root.parent).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def translation_version_stamp():
+    """Return the stamp identifying the translator, schema, and cache format in use.
+
+    A cache written under a different stamp is discarded on open, so upgrading the translator or
+    the VRS/FHIR models never serves stale translations.
+
+    Returns:
+        str: A string combining the package version, translator source digest, VRS schema,
+            ga4gh.vrs, fhir.resources, and cache format versions.
+    """
+    return "|".join(
+        [
+            f"fhir.moldef={_package_version('fhir.moldef')}",
+            f"source={translator_source_digest()}",
+            f"vrs-schema={VRS_VERSION}",
+            f"ga4gh.vrs={_package_version('ga4gh.vrs')}",
+            f"fhir.resources={_package_version('fhir.resources')}",
+            f"format={CACHE_FORMAT_VERSION}",
+        ]
+    )
+
+
+def vrs_cache_key(vrs_allele):
+    """Compute the content-addressed cache key for a VRS Allele.
+
+    The GA4GH digest (`ga4gh_identify`) only covers the allele's identity-bearing fields, while the
+    FHIR translation also carries `id`, `name`, `aliases`, `expressions`, and extensions. The key is
+    therefore the sha512t24u digest of the canonical (sorted-key) JSON of the full allele.
+
+    Args:
+        vrs_allele (object): A VRS Allele object or its dict representation.
+
+    Returns:
+        str: The cache key.
+    """
+    if hasattr(vrs_allele, "model_dump"):
+        vrs_allele = vrs_allele.model_dump(exclude_none=True)
+    return sha512t24u(orjson.dumps(vrs_allele, option=orjson.OPT_SORT_KEYS))
+
+
+class TranslationCache:
+    """Persistent VRS -> FHIR translation memo backed by a local SQLite file.
+
+    Entries map a `vrs_cache_key` to the FHIR Allele JSON (`model_dump(exclude_none=True)`). Puts
+    are buffered in memory and written every `commit_every` puts, and on `flush` / `close`, in one
+    short `BEGIN IMMEDIATE` transaction, so several processes can share the file; a writer waits
+    up to `timeout` seconds for another's transaction to finish. The cache never fails a
+    translation: a read or write that SQLite rejects is logged, counted in `errors`, and treated
+    as a miss (reads) or dropped (writes).
+    """
+
+    def __init__(self, path, commit_every: int = 1000, timeout: float = 30.0):
+        self.path = Path(path)
+        self.commit_every = commit_every
+        self.stamp = translation_version_stamp()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._pending = {}
+
+        # The connection is shared by translator threads; all access goes through `_lock`. It is
+        # in autocommit mode, so reads hold no transaction and every write takes its lock up front
+        # with BEGIN IMMEDIATE and commits when its `with` block ends.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(key TEXT PRIMARY KEY, fhir_json BLOB NOT NULL)"
+            )
+            self._check_stamp()
+
+    def _check_stamp(self):
+        """Drop every cached translation if the cache was written under a different version stamp."""
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'version_stamp'"
+        ).fetchone()
+        if row is None or row[0] != self.stamp:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version_stamp', ?)",
+                (self.stamp,),
+            )
+
+    def _failed(self, action, count, error):
+        self.errors += 1
+        logging.warning(
+            "Translation cache %s: %s of %d entries failed (%s); continuing uncached",
+            self.path,
+            action,
+            count,
+            error,
+        )
+
+    def get(self, key):
+        """Return the cached FHIR Allele JSON bytes for `key`, or None on a miss."""
+        with self._lock:
+            value = self._pending.get(key)
+            if value is None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT fhir_json FROM translations WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    self._failed("read", 1, e)
+                    row = None
+                value = None if row is None else row[0]
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return value
+
+    def put(self, key, fhir_allele):
+        """Store a FHIR Allele (model or dumped dict) under `key`."""
+        if hasattr(fhir_allele, "model_dump"):
+            fhir_allele = fhir_allele.model_dump(exclude_none=True)
+        with self._lock:
+            self._pending[key] = orjson.dumps(fhir_allele)
+            if len(self._pending) >= self.commit_every:
+                self._write_pending()
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        rows = list(self._pending.items())
+        self._pending.clear()
+
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO translations (key, fhir_json) VALUES (?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            self._failed("write", len(rows), e)
+
+    def flush(self):
+        """Write pending puts."""
+        with self._lock:
+            self._write_pending()
+
+    def close(self):
+        """Write pending puts and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
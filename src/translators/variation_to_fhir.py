@@ -1,3 +1,7 @@
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 from fhir.resources.codeableconcept import CodeableConcept
 from fhir.resources.coding import Coding
 from fhir.resources.quantity import Quantity
@@ -18,7 +22,30 @@ from resources.moleculardefinition import (
     MolecularDefinitionRepresentation,
     MolecularDefinitionRepresentationLiteral,
 )
-from vrs_tools.hgvs_tools import HgvsToolsLite
+from vrs_tools.hgvs_tools import HgvsToolsLite, shared_parser
+
+# Sequence accession and format pairs whose profile inputs a translator remembers.
+_SEQUENCE_VALUES_MAXSIZE = 10_000
+
+# Merged reference reads are split so that no single read spans more than this many bases.
+_MAX_READ_LENGTH = 1_000_000
+
+# HGVS edit types whose reference (and, for dup and identity, alternative) state is read from
+# the sequence over the edited interval.
+_REFERENCE_EDIT_TYPES = {"del", "delins", "dup", "identity"}
+
+# Translator used by `translate_hgvs_many` in worker processes.
+_worker_translator = None
+
+
+def _init_worker(translator):
+    global _worker_translator
+    _worker_translator = translator
+    shared_parser()
+
+
+def _translate_hgvs_chunk(hgvs_exprs, gap):
+    return _worker_translator.translate_hgvs_many(hgvs_exprs, gap=gap)
 
 
 class VariationToFhirTranslator:
@@ -27,25 +54,15 @@ class VariationToFhirTranslator:
         self.dp = dp or create_dataproxy(uri=uri)
         # most likely need to replace this
         self.hgvs_tools = HgvsToolsLite(data_proxy=self.dp)
+        self._sequence_values = OrderedDict()
 
-    def _hgvs_position(self, sv):
-        """Extract the start and end base positions from an HGVS sequence variant."""
-        pos = sv.posedit.pos
-        return pos.start.base, pos.end.base
-
-    def _from_spdi(self, spdi):
-        """Parse an SPDI string and convert it into a FHIR Variation Profile object.
-
-        Args:
-            spdi (str): A valid spdi string. "<sequence_accession>:<position>:<deleted_sequence_or_length>:<inserted_sequence>".
+    def _parse_spdi(self, spdi):
+        """Split an SPDI string into `(sequence accession, start, end, inserted sequence)`.
 
         Raises:
-            TypeError: If the provided `spdi` argument is not a string.
-            ValueError:  If the SPDI string does not contain four colon-separated fields or
+            TypeError: If `spdi` is not a string.
+            ValueError: If the SPDI string does not contain four colon-separated fields or
             cannot be parsed correctly.
-
-        Returns:
-            object: A FHIR Variation Profile object representing the parsed SPDI variant.
         """
         if not isinstance(spdi, str):
             raise TypeError("SPDI expression must be a string.")
@@ -68,6 +85,23 @@ class VariationToFhirTranslator:
         end = start + del_len
 
         alt_seq = str(ins_seq)
+        return seq_acc, start, end, alt_seq
+
+    def _from_spdi(self, spdi):
+        """Parse an SPDI string and convert it into a FHIR Variation Profile object.
+
+        Args:
+            spdi (str): A valid spdi string. "<sequence_accession>:<position>:<deleted_sequence_or_length>:<inserted_sequence>".
+
+        Raises:
+            TypeError: If the provided `spdi` argument is not a string.
+            ValueError:  If the SPDI string does not contain four colon-separated fields or
+            cannot be parsed correctly.
+
+        Returns:
+            object: A FHIR Variation Profile object representing the parsed SPDI variant.
+        """
+        seq_acc, start, end, alt_seq = self._parse_spdi(spdi)
 
         aliases = self.dp.translate_sequence_identifier(seq_acc, "refseq")
         aliases = [a.split(":")[1] for a in aliases]
@@ -83,68 +117,130 @@ class VariationToFhirTranslator:
 
         return self._create_variation_profile(values, fmt="spdi")
 
-    def _from_hgvs(self, hgvs_expr):
-        """Create a variation profile from an HGVS expression.
-
-        Args:
-            hgvs_expr (str): An HGVS expression.
+    def _parse_hgvs(self, hgvs_expr):
+        """Parse an HGVS expression into an `HgvsEdit`.
 
         Raises:
             ValueError: If the HGVS expression cannot be parsed or represents an intronic variant.
-            NotImplementedError: If the HGVS edit type is not supported.
-
-        Returns:
-            VariationProfile: A variation profile derived from the HGVS expression.
         """
-        sv = self.hgvs_tools.parse(hgvs_expr)
-        if not sv:
+        edit = self.hgvs_tools.parse_edit(hgvs_expr)
+        if not edit:
             raise ValueError(f"Failed to parse HGVS expression: {hgvs_expr}")
 
-        if self.hgvs_tools.is_intronic(sv):
+        if edit.intronic:
             raise ValueError("Intronic HGVS variants are not supported")
+        return edit
+
+    def _hgvs_values(self, edit, reference=None):
+        """Return the variation profile values of an HGVS edit.
+
+        Args:
+            edit (HgvsEdit): The parsed HGVS edit.
+            reference (str): The reference sequence over the edited interval, for edit types in
+                `_REFERENCE_EDIT_TYPES`.
+
+        Raises:
+            ValueError: If the HGVS edit type is not supported by `get_edit_position_and_state`.
+            NotImplementedError: If the HGVS edit type is not supported.
 
-        start_pos, end_pos, alt_seq = self.hgvs_tools.get_position_and_state(sv)
+        Returns:
+            dict: The values passed to `_create_variation_profile`.
+        """
+        edit_type = edit.edit_type
 
-        edit_type = self.hgvs_tools.get_edit_type(sv)
+        if edit_type == "dup":
+            alt_seq = reference + reference
+        elif edit_type == "identity":
+            alt_seq = reference
+        else:
+            _, _, alt_seq = self.hgvs_tools.get_edit_position_and_state(edit)
 
         if edit_type in {"del", "delins", "dup"}:
-            ref_seq = self.dp.get_sequence(sv.ac, start_pos, end_pos)
+            ref_seq = reference
         elif edit_type == "ins":
-            ref_seq = sv.posedit.edit.ref or ""
+            ref_seq = edit.ref or ""
         elif edit_type == "sub":
-            ref_seq = sv.posedit.edit.ref
+            ref_seq = edit.ref
         elif edit_type == "identity":
-            ref_seq = self.dp.get_sequence(sv.ac, start_pos, end_pos)
+            ref_seq = reference
             if not ref_seq:
-                ref_seq = sv.posedit.edit.alt or ""
+                ref_seq = edit.alt or ""
         else:
             raise NotImplementedError(f"Unsupported HGVS edit type: {edit_type}")
 
-        start, end = self._hgvs_position(sv)
-
-        values = {
-            "refget_accession": sv.ac,
-            "start": start,
-            "end": end,
+        return {
+            "refget_accession": edit.ac,
+            "start": edit.start,
+            "end": edit.end,
             "ref_seq": ref_seq,
             "alt_seq": alt_seq,
         }
 
-        return self._create_variation_profile(values, fmt="hgvs")
-
-    def _create_variation_profile(self, values, fmt):
-        """Create a FHIR Variation resource from parsed variant data (HGVS or SPDI).
+    def _from_hgvs(self, hgvs_expr):
+        """Create a variation profile from an HGVS expression.
 
         Args:
-            values (dict): A dictionary containing variant attributes. (Refget Accession,Start,End,Reference Sequence, Alternative Sequence)
+            hgvs_expr (str): An HGVS expression.
+
+        Raises:
+            ValueError: If the HGVS expression cannot be parsed or represents an intronic variant.
+            NotImplementedError: If the HGVS edit type is not supported.
 
         Returns:
-            object: A fully populated FHIR Variation object.
+            VariationProfile: A variation profile derived from the HGVS expression.
+        """
+        edit = self._parse_hgvs(hgvs_expr)
+        reference = None
+        if edit.edit_type in _REFERENCE_EDIT_TYPES:
+            reference = self.dp.get_sequence(edit.ac, edit.start - 1, edit.end)
+        values = self._hgvs_values(edit, reference)
+
+        return self._create_variation_profile(values, fmt="hgvs")
+
+    def _sequence_profile_values(self, refget_accession, fmt):
+        """Return the sequence type, FHIR id and coordinate system values of a profile.
+
+        These depend only on the sequence and the input format, so they are kept in an LRU of at
+        most `_SEQUENCE_VALUES_MAXSIZE` sequence accession and format pairs.
+        """
+        key = (refget_accession, fmt)
+        values = self._sequence_values.get(key)
+        if values is not None:
+            self._sequence_values.move_to_end(key)
+            return values
+
+        sequence_type = detect_sequence_type(refget_accession)
+
+        if fmt == "hgvs":
+            coord_system_values = hgvs_coordinate_interval(molType=sequence_type)
+        elif fmt == "spdi":
+            coord_system_values = spdi_coordinate_interval()
+
+        fhir_id = refseq_to_fhir_id(refseq_accession=refget_accession)
+
+        values = self._sequence_values[key] = (
+            sequence_type,
+            fhir_id,
+            coord_system_values,
+        )
+        if len(self._sequence_values) > _SEQUENCE_VALUES_MAXSIZE:
+            self._sequence_values.popitem(last=False)
+        return values
+
+    def _sequence_profile_parts(self, refget_accession, fmt):
+        """Build the molecule type, sequence context and coordinate system of a profile.
+
+        The models are built anew for every profile, so changing one profile never changes
+        another.
         """
         MOLTYPE_SYSTEM_DEFAULT_VALUE = "http://hl7.org/fhir/uv/molecular-definition-data-types/CodeSystem/molecule-type"
-        FOCUS_SYSTEM_DEFAULT_VALUE = "http://hl7.org/fhir/uv/molecular-definition-data-types/CodeSystem/molecular-definition-focus"
 
-        sequence_type = detect_sequence_type(values["refget_accession"])
+        sequence_type, fhir_id, coord_system_values = self._sequence_profile_values(
+            refget_accession, fmt
+        )
+        coord_system_system, coord_system_origin, normalization_method = (
+            coord_system_values
+        )
 
         mol_type = CodeableConcept(
             coding=[
@@ -156,29 +252,35 @@ class VariationToFhirTranslator:
             ]
         )
 
-        if fmt == "hgvs":
-            coord_system_values, coord_system_origin, normalization_method = (
-                hgvs_coordinate_interval(molType=sequence_type)
-            )
-        elif fmt == "spdi":
-            coord_system_values, coord_system_origin, normalization_method = (
-                spdi_coordinate_interval()
-            )
-
-        fhir_id = refseq_to_fhir_id(refseq_accession=values["refget_accession"])
-
         sequence_context = Reference(
             reference=f"#ref-to-{fhir_id}",
             type="MolecularDefinition",
-            display=values["refget_accession"],
+            display=refget_accession,
         )
 
         coord_system = MolecularDefinitionLocationSequenceLocationCoordinateIntervalCoordinateSystem(
-            system=coord_system_values,
+            system=coord_system_system,
             origin=coord_system_origin,
             normalizationMethod=normalization_method,
         )
 
+        return mol_type, sequence_context, coord_system
+
+    def _create_variation_profile(self, values, fmt):
+        """Create a FHIR Variation resource from parsed variant data (HGVS or SPDI).
+
+        Args:
+            values (dict): A dictionary containing variant attributes. (Refget Accession,Start,End,Reference Sequence, Alternative Sequence)
+
+        Returns:
+            object: A fully populated FHIR Variation object.
+        """
+        FOCUS_SYSTEM_DEFAULT_VALUE = "http://hl7.org/fhir/uv/molecular-definition-data-types/CodeSystem/molecular-definition-focus"
+
+        mol_type, sequence_context, coord_system = self._sequence_profile_parts(
+            values["refget_accession"], fmt
+        )
+
         start, end = (
             Quantity(value=int(values["start"])),
             Quantity(value=int(values["end"])),
@@ -257,3 +359,214 @@ class VariationToFhirTranslator:
             return self._from_spdi(var)
         else:
             raise ValueError("Only 'hgvs' and 'spdi' formats are supported.")
+
+    def _read_reference(self, accession, start, end):
+        """Read one reference subsequence, returning the exception raised instead of raising it."""
+        try:
+            return self.dp.get_sequence(accession, start, end)
+        except Exception as e:
+            return e
+
+    def _fetch_references(self, spans, gap: int):
+        """Fetch many reference subsequences with as few data proxy reads as possible.
+
+        Spans on the same sequence that lie within `gap` bases of each other are served from one
+        merged read (of at most `_MAX_READ_LENGTH` bases). If a merged read fails, each of its
+        spans is read on its own, so only the spans the data proxy rejects get the exception.
+
+        Args:
+            spans (dict): Sequence accession -> list of `(start, end, key)` interbase spans.
+            gap (int): Largest distance between spans that are still read together.
+
+        Returns:
+            dict: key -> reference subsequence, or the exception raised while reading it.
+        """
+        references = {}
+        for accession, accession_spans in spans.items():
+            accession_spans.sort()
+            i = 0
+            while i < len(accession_spans):
+                read_start, read_end, _ = accession_spans[i]
+                j = i + 1
+                while j < len(accession_spans):
+                    start, end, _ = accession_spans[j]
+                    if (
+                        start - read_end > gap
+                        or max(read_end, end) - read_start > _MAX_READ_LENGTH
+                    ):
+                        break
+                    read_end = max(read_end, end)
+                    j += 1
+                group = accession_spans[i:j]
+                try:
+                    sequence = self.dp.get_sequence(accession, read_start, read_end)
+                except Exception as e:
+                    if len(group) == 1:
+                        references[group[0][2]] = e
+                    else:
+                        for start, end, key in group:
+                            references[key] = self._read_reference(
+                                accession, start, end
+                            )
+                else:
+                    for start, end, key in group:
+                        references[key] = sequence[
+                            start - read_start : end - read_start
+                        ]
+                i = j
+        return references
+
+    def translate_spdi_many(self, spdis, gap: int = 1000):
+        """Translate many SPDI expressions into FHIR Variation Profiles.
+
+        All strings are parsed up front, each distinct sequence accession is resolved once,
+        and the deleted reference bases are fetched per accession in merged reads (see
+        `_fetch_references`). Results are the same as those of `translate(spdi, "spdi")`.
+
+        Args:
+            spdis (Iterable[str]): SPDI expressions.
+            gap (int): Largest distance between deletions whose bases are read together.
+
+        Returns:
+            list[Variation | Exception]: One entry per expression, holding either the Variation
+            Profile or the exception raised while translating that expression.
+        """
+        parsed = []
+        for spdi in spdis:
+            try:
+                parsed.append(self._parse_spdi(spdi))
+            except Exception as e:
+                parsed.append(e)
+
+        refseq_ids = {}
+        for row in parsed:
+            if isinstance(row, Exception) or row[0] in refseq_ids:
+                continue
+            try:
+                aliases = self.dp.translate_sequence_identifier(row[0], "refseq")
+                refseq_ids[row[0]] = aliases[0].split(":")[1]
+            except Exception as e:
+                refseq_ids[row[0]] = e
+
+        spans = defaultdict(list)
+        for i, row in enumerate(parsed):
+            if isinstance(row, Exception):
+                continue
+            seq_acc, start, end, _ = row
+            refseq_id = refseq_ids[seq_acc]
+            if not isinstance(refseq_id, Exception) and 0 <= start < end:
+                spans[refseq_id].append((start, end, i))
+        references = self._fetch_references(spans, gap)
+
+        profiles = []
+        for i, row in enumerate(parsed):
+            if isinstance(row, Exception):
+                profiles.append(row)
+                continue
+            seq_acc, start, end, alt_seq = row
+            refseq_id = refseq_ids[seq_acc]
+            if isinstance(refseq_id, Exception):
+                profiles.append(refseq_id)
+                continue
+            if i in references:
+                ref_seq = references[i]
+            elif 0 <= start == end:
+                ref_seq = ""
+            else:
+                ref_seq = self._read_reference(refseq_id, start, end)
+            if isinstance(ref_seq, Exception):
+                profiles.append(ref_seq)
+                continue
+            values = {
+                "refget_accession": seq_acc,
+                "start": start,
+                "end": end,
+                "ref_seq": ref_seq,
+                "alt_seq": alt_seq,
+            }
+            try:
+                profiles.append(self._create_variation_profile(values, fmt="spdi"))
+            except Exception as e:
+                profiles.append(e)
+        return profiles
+
+    def translate_hgvs_many(
+        self,
+        hgvs_exprs,
+        gap: int = 1000,
+        processes: int | None = None,
+        chunksize: int = 1000,
+    ):
+        """Translate many HGVS expressions into FHIR Variation Profiles.
+
+        All expressions are parsed up front, then the reference sequence of every del, delins,
+        dup and identity edit is fetched per accession in merged reads (see
+        `_fetch_references`). Results are the same as those of `translate(expr, "hgvs")`.
+
+        With `processes`, expressions are translated in chunks of `chunksize` by a process pool.
+        The HGVS parser is built before the pool starts, so forked workers share it; workers
+        receive this translator through a fork, and with the "spawn" start method its data proxy
+        must be picklable.
+
+        Args:
+            hgvs_exprs (Iterable[str]): HGVS expressions.
+            gap (int): Largest distance between edits whose reference is read together.
+            processes (int): Number of worker processes; translate in this process if omitted.
+            chunksize (int): Expressions per pool task.
+
+        Returns:
+            list[Variation | Exception]: One entry per expression, holding either the Variation
+            Profile or the exception raised while translating that expression (e.g. for an
+            intronic variant or an unsupported edit type).
+        """
+        hgvs_exprs = list(hgvs_exprs)
+        if processes and processes > 1 and len(hgvs_exprs) > chunksize:
+            shared_parser()
+            chunks = [
+                hgvs_exprs[i : i + chunksize]
+                for i in range(0, len(hgvs_exprs), chunksize)
+            ]
+            profiles = []
+            with ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_worker, initargs=(self,)
+            ) as pool:
+                for chunk_profiles in pool.map(
+                    partial(_translate_hgvs_chunk, gap=gap), chunks
+                ):
+                    profiles.extend(chunk_profiles)
+            return profiles
+
+        edits = []
+        for hgvs_expr in hgvs_exprs:
+            try:
+                edits.append(self._parse_hgvs(hgvs_expr))
+            except Exception as e:
+                edits.append(e)
+
+        spans = defaultdict(list)
+        for i, edit in enumerate(edits):
+            if (
+                not isinstance(edit, Exception)
+                and edit.edit_type in _REFERENCE_EDIT_TYPES
+                and 0 <= edit.start - 1 < edit.end
+            ):
+                spans[edit.ac].append((edit.start - 1, edit.end, i))
+        references = self._fetch_references(spans, gap)
+
+        profiles = []
+        for i, edit in enumerate(edits):
+            if isinstance(edit, Exception):
+                profiles.append(edit)
+                continue
+            reference = references.get(i)
+            if isinstance(reference, Exception):
+                profiles.append(reference)
+                continue
+            try:
+                if reference is None and edit.edit_type in _REFERENCE_EDIT_TYPES:
+                    reference = self.dp.get_sequence(edit.ac, edit.start - 1, edit.end)
+                values = self._hgvs_values(edit, reference)
+                profiles.append(self._create_variation_profile(values, fmt="hgvs"))
+            except Exception as e:
+                profiles.append(e)
+        return profiles
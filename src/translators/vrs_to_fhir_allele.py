@@ -1,3 +1,4 @@
+import orjson
 from fhir.resources.codeableconcept import CodeableConcept
 from fhir.resources.coding import Coding
 from fhir.resources.extension import Extension
@@ -32,6 +33,7 @@ from translators.constants.vrs_json_pointers import (
 from translators.constants.vrs_json_pointers import (
     sequence_reference_identifiers as SEQ_REF_PTRS,
 )
+from translators.translation_cache import vrs_cache_key
 from translators.validations.allele import (
     validate_vrs_allele,
 )
@@ -40,17 +42,54 @@ from vrs_tools.normalizer import VariantNormalizer
 
 class VrsToFhirAlleleTranslator:
     """Translate GA4GH VRS Allele objects into the FHIR Allele Profile,providing full translation."""
-    def __init__(self, dp=None, uri: str | None = None):
+    def __init__(self, dp=None, uri: str | None = None, cache=None):
         self.dp = dp or create_dataproxy(uri=uri)
         self.allele_denormalize = VariantNormalizer(dp=self.dp)
+        self.cache = cache
+
+    def use_dataproxy(self, dp):
+        """Point the translator, and the normalizer it denormalizes RLEs with, at another data proxy."""
+        self.dp = self.allele_denormalize.dp = dp
 
     def translate(self, vrs_allele):
         """Convert a GA4GH VRS Allele object into its corresponding FHIR Allele Profile representation, currently supporting only alleles with a state type of LiteralSequenceExpression or ReferenceLengthExpression."""
+        if self.cache is None:
+            return self._translate(vrs_allele)
+        cached = self.translate_to_dict(vrs_allele)
+        return FhirAllele.model_validate(cached)
+
+    def translate_to_dict(self, vrs_allele):
+        """Translate a VRS Allele and return the FHIR Allele as `model_dump(exclude_none=True)`.
+
+        When a `TranslationCache` is attached, alleles seen before are returned straight from the
+        cache without building FHIR models or querying the data proxy. `vrs_allele` is left
+        unchanged either way.
+
+        Args:
+            vrs_allele (object): A VRS Allele object.
+
+        Returns:
+            dict: The FHIR Allele Profile as a plain dict.
+        """
+        if self.cache is None:
+            return self._translate(vrs_allele).model_dump(exclude_none=True)
+
+        key = vrs_cache_key(vrs_allele)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        fhir_allele = self._translate(vrs_allele).model_dump(exclude_none=True)
+        self.cache.put(key, fhir_allele)
+        return fhir_allele
+
+    def _translate(self, vrs_allele):
         validate_vrs_allele(vrs_allele)
 
         if vrs_allele.state.type == "ReferenceLengthExpression":
+            # Denormalize a copy, so the caller's allele keeps its ReferenceLengthExpression.
             vrs_allele = self.allele_denormalize.denormalize_reference_length(
-                vrs_allele
+                vrs_allele.model_copy(deep=True)
             )
 
         return FhirAllele(
@@ -0,0 +1,175 @@
+import argparse
+import bisect
+import logging
+import mmap
+import struct
+from pathlib import Path
+
+from ga4gh.vrs.dataproxy import _DataProxy
+
+# File layout: header, then fixed-width records sorted by digest (duplicates allowed).
+ALIAS_INDEX_MAGIC = b"RGALIAS1"
+_HEADER = struct.Struct("<8sQ")
+DIGEST_WIDTH = 32
+ACCESSION_WIDTH = 32
+RECORD_WIDTH = DIGEST_WIDTH + ACCESSION_WIDTH
+
+
+def refget_digest(identifier):
+    """Return the bare sha512t24u digest of a `ga4gh:SQ.*`, `SQ.*` or bare refget identifier."""
+    return identifier.removeprefix("ga4gh:").removeprefix("SQ.")
+
+
+def write_alias_index(path, aliases):
+    """Write a refget -> RefSeq alias index file.
+
+    Args:
+        path (str): Path of the index file.
+        aliases (Iterable[tuple[str, str]]): `(refget identifier, RefSeq accession)` pairs.
+
+    Raises:
+        ValueError: If a digest or accession does not fit the fixed record width.
+
+    Returns:
+        int: The number of records written.
+    """
+    records = set()
+    for identifier, accession in aliases:
+        digest = refget_digest(identifier).encode()
+        accession = accession.removeprefix("refseq:").encode()
+        if len(digest) != DIGEST_WIDTH:
+            raise ValueError(f"Not a refget digest: {identifier!r}")
+        if len(accession) > ACCESSION_WIDTH:
+            raise ValueError(f"RefSeq accession too long for the index: {accession!r}")
+        records.add(digest + accession.ljust(ACCESSION_WIDTH, b"\0"))
+
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(ALIAS_INDEX_MAGIC, len(records)))
+        for record in sorted(records):
+            f.write(record)
+    tmp.replace(path)
+    return len(records)
+
+
+def export_alias_index(seqrepo_dir, path):
+    """Export every current RefSeq alias of a SeqRepo snapshot into an alias index file.
+
+    Args:
+        seqrepo_dir (str): The SeqRepo snapshot directory, e.g. `/usr/local/share/seqrepo/2024-12-20`.
+        path (str): Path of the index file.
+
+    Returns:
+        int: The number of records written.
+    """
+    from biocommons.seqrepo import SeqRepo
+
+    sr = SeqRepo(str(seqrepo_dir))
+    return write_alias_index(
+        path,
+        (
+            (row["seq_id"], row["alias"])
+            for row in sr.aliases.find_aliases(namespace="refseq")
+        ),
+    )
+
+
+class _Digests:
+    """Sequence view over the digests of a mapped index, for `bisect`."""
+
+    def __init__(self, buf, count):
+        self._buf = buf
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        start = _HEADER.size + i * RECORD_WIDTH
+        return self._buf[start : start + DIGEST_WIDTH]
+
+
+class RefgetAliasIndex:
+    """Memory-mapped refget -> RefSeq alias index written by `write_alias_index`.
+
+    Lookups binary-search the sorted, fixed-width records in place, so opening the index costs
+    nothing up front and its pages are shared by every process that maps the same file.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(self._buf)
+        if magic != ALIAS_INDEX_MAGIC:
+            self._buf.close()
+            raise ValueError(f"{self.path} is not a refget alias index.")
+        self._digests = _Digests(self._buf, count)
+
+    def lookup(self, identifier):
+        """Return the RefSeq accessions aliased to a refget identifier (empty if unknown)."""
+        digest = refget_digest(identifier).encode()
+        i = bisect.bisect_left(self._digests, digest)
+        accessions = []
+        while i < len(self._digests) and self._digests[i] == digest:
+            start = _HEADER.size + i * RECORD_WIDTH + DIGEST_WIDTH
+            accessions.append(
+                self._buf[start : start + ACCESSION_WIDTH].rstrip(b"\0").decode()
+            )
+            i += 1
+        return accessions
+
+    def __len__(self):
+        return len(self._digests)
+
+    def close(self):
+        self._buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class AliasIndexDataProxy(_DataProxy):
+    """Data proxy that answers refget -> RefSeq alias lookups from a `RefgetAliasIndex`.
+
+    Identifiers missing from the index, other namespaces, and all sequence and metadata requests
+    fall back to the wrapped data proxy.
+    """
+
+    def __init__(self, dp, index):
+        self.dp = dp
+        self.index = index
+
+    def get_sequence(self, identifier, start=None, end=None):
+        return self.dp.get_sequence(identifier, start=start, end=end)
+
+    def get_metadata(self, identifier):
+        return self.dp.get_metadata(identifier)
+
+    def translate_sequence_identifier(self, identifier, namespace=None):
+        if namespace == "refseq" and identifier.startswith("ga4gh:SQ."):
+            accessions = self.index.lookup(identifier)
+            if accessions:
+                return [f"refseq:{accession}" for accession in accessions]
+        return self.dp.translate_sequence_identifier(identifier, namespace=namespace)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="export-refget-alias-index",
+        description="Export the refget -> RefSeq aliases of a SeqRepo snapshot to an alias index",
+    )
+    parser.add_argument("seqrepo_dir", help="SeqRepo snapshot directory")
+    parser.add_argument("output", help="Path of the alias index file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = export_alias_index(args.seqrepo_dir, args.output)
+    logging.info("Wrote %d aliases to %s", count, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlparse
+
+import orjson
+from ga4gh.vrs.dataproxy import _DataProxy, create_dataproxy
+
+# Bump when the layout of cached payloads changes.
+DATAPROXY_CACHE_FORMAT_VERSION = 1
+
+
+def seqrepo_snapshot_id(uri: str | None = None):
+    """Return the SeqRepo snapshot a local data proxy URI points at, e.g. `2024-12-20`.
+
+    Only `seqrepo+file://` URIs name their snapshot directory; for REST URIs the snapshot served
+    is not visible to the client and None is returned.
+
+    Args:
+        uri (str): The data proxy URI (default `$GA4GH_VRS_DATAPROXY_URI`).
+
+    Returns:
+        str | None: The snapshot id, or None if it cannot be derived from the URI.
+    """
+    uri = uri or os.environ.get("GA4GH_VRS_DATAPROXY_URI")
+    if not uri:
+        return None
+    parsed = urlparse(uri)
+    if not parsed.scheme.endswith("file"):
+        return None
+    return Path(parsed.path).name or None
+
+
+class PersistentCacheDataProxy(_DataProxy):
+    """Data proxy that memoizes another data proxy's answers in a local SQLite file.
+
+    SeqRepo snapshots are immutable, so metadata (and with it `translate_sequence_identifier`)
+    and subsequences fetched once can be served from disk by every later process. The cache is
+    stamped with `snapshot_id` and cleared on open when the snapshot changes. The file is in WAL
+    mode, so several processes can read it while one writes. Misses are buffered in memory and
+    written every `commit_every` misses, and on `flush` / `close`, in one short `BEGIN IMMEDIATE`
+    transaction; a writer waits up to `timeout` seconds for another's transaction to finish. If
+    SQLite rejects a read or write, the failure is logged and the proxy degrades to passing every
+    lookup straight to `dp` (`degraded`). With `warm_start`, all cached metadata is loaded into
+    memory on open. Sequences longer than `max_sequence_length` are never stored.
+    """
+
+    def __init__(
+        self,
+        dp,
+        path,
+        snapshot_id: str,
+        commit_every: int = 1000,
+        max_sequence_length: int = 1_000_000,
+        warm_start: bool = True,
+        timeout: float = 30.0,
+    ):
+        if not snapshot_id:
+            raise ValueError(
+                "A persistent data proxy cache needs a SeqRepo snapshot id."
+            )
+        self.dp = dp
+        self.path = Path(path)
+        self.stamp = f"{snapshot_id}|format={DATAPROXY_CACHE_FORMAT_VERSION}"
+        self.commit_every = commit_every
+        self.max_sequence_length = max_sequence_length
+        self.hits = 0
+        self.misses = 0
+        self.degraded = False
+        self._metadata = {}
+        self._pending_metadata = {}
+        self._pending_sequences = {}
+
+        # The connection is shared by translator threads; all access goes through `_lock`. It is
+        # in autocommit mode, so reads hold no transaction and every write takes its lock up front
+        # with BEGIN IMMEDIATE and commits when its `with` block ends.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata "
+                "(identifier TEXT PRIMARY KEY, metadata_json BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sequences (identifier TEXT NOT NULL, "
+                "start INTEGER NOT NULL, end INTEGER NOT NULL, sequence TEXT NOT NULL, "
+                "PRIMARY KEY (identifier, start, end))"
+            )
+            self._check_stamp()
+        if warm_start:
+            self.warm()
+
+    def _check_stamp(self):
+        """Drop every cached entry if the cache was written for a different snapshot."""
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'snapshot_stamp'"
+        ).fetchone()
+        if row is None or row[0] != self.stamp:
+            self._conn.execute("DELETE FROM metadata")
+            self._conn.execute("DELETE FROM sequences")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('snapshot_stamp', ?)",
+                (self.stamp,),
+            )
+
+    def warm(self):
+        """Load every cached metadata record into memory."""
+        with self._lock:
+            rows = self._read("SELECT identifier, metadata_json FROM metadata", ())
+        self._metadata.update(
+            (identifier, orjson.loads(metadata)) for identifier, metadata in rows
+        )
+
+    def _degrade(self, action, error):
+        """Stop using the SQLite file after it rejected a read or write."""
+        if not self.degraded:
+            logging.warning(
+                "Data proxy cache %s: %s failed (%s); continuing uncached",
+                self.path,
+                action,
+                error,
+            )
+        self.degraded = True
+        self._pending_metadata.clear()
+        self._pending_sequences.clear()
+
+    def _read(self, sql, params):
+        """Return the rows `sql` selects, or none once the cache has degraded."""
+        if self.degraded:
+            return []
+        try:
+            return self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            self._degrade("read", e)
+            return []
+
+    def _store(self, pending, key, value):
+        with self._lock:
+            if self.degraded:
+                return
+            pending[key] = value
+            if (
+                len(self._pending_metadata) + len(self._pending_sequences)
+                >= self.commit_every
+            ):
+                self._write_pending()
+
+    def _write_pending(self):
+        if self.degraded or not (self._pending_metadata or self._pending_sequences):
+            return
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO metadata (identifier, metadata_json) "
+                    "VALUES (?, ?)",
+                    self._pending_metadata.items(),
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sequences (identifier, start, end, sequence) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        (*key, sequence)
+                        for key, sequence in self._pending_sequences.items()
+                    ),
+                )
+        except sqlite3.Error as e:
+            self._degrade("write", e)
+            return
+        self._pending_metadata.clear()
+        self._pending_sequences.clear()
+
+    def get_metadata(self, identifier):
+        metadata = self._metadata.get(identifier)
+        if metadata is None:
+            with self._lock:
+                rows = self._read(
+                    "SELECT metadata_json FROM metadata WHERE identifier = ?",
+                    (identifier,),
+                )
+            if rows:
+                metadata = self._metadata[identifier] = orjson.loads(rows[0][0])
+        if metadata is not None:
+            self.hits += 1
+            return metadata
+
+        self.misses += 1
+        metadata = self.dp.get_metadata(identifier)
+        self._metadata[identifier] = metadata
+        self._store(
+            self._pending_metadata, identifier, orjson.dumps(metadata, default=str)
+        )
+        return metadata
+
+    def get_sequence(self, identifier, start=None, end=None):
+        # NOTE: -1 stands in for an open start/end, since NULLs never match in a primary key.
+        key = (identifier, -1 if start is None else start, -1 if end is None else end)
+        with self._lock:
+            sequence = self._pending_sequences.get(key)
+            if sequence is None:
+                rows = self._read(
+                    "SELECT sequence FROM sequences "
+                    "WHERE identifier = ? AND start = ? AND end = ?",
+                    key,
+                )
+                sequence = rows[0][0] if rows else None
+        if sequence is not None:
+            self.hits += 1
+            return sequence
+
+        self.misses += 1
+        sequence = self.dp.get_sequence(identifier, start=start, end=end)
+        if len(sequence) <= self.max_sequence_length:
+            self._store(self._pending_sequences, key, sequence)
+        return sequence
+
+    def flush(self):
+        """Write pending misses."""
+        with self._lock:
+            self._write_pending()
+
+    def close(self):
+        """Write pending misses and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class NegativeCacheDataProxy(_DataProxy):
+    """Data proxy that remembers failed lookups for `ttl` seconds.
+
+    Identifiers that another data proxy reports as unknown (`KeyError`), and refget accessions
+    with no alias in the requested namespace, are answered from memory until their entry expires,
+    so feeds that repeat the same bad accession only pay for the first lookup. `unknown` counts
+    the failed lookups per identifier, including those answered from the cache.
+    """
+
+    def __init__(self, dp, ttl: float = 3600.0, clock=time.monotonic):
+        self.dp = dp
+        self.ttl = ttl
+        self.clock = clock
+        self.negative_hits = 0
+        self.unknown = Counter()
+        self._misses = {}
+
+    def _cached_miss(self, key):
+        """Return True if `key` failed within the last `ttl` seconds."""
+        expires = self._misses.get(key)
+        if expires is None:
+            return False
+        if expires <= self.clock():
+            self._misses.pop(key, None)
+            return False
+        self.negative_hits += 1
+        self.unknown[key[1]] += 1
+        return True
+
+    def _remember_miss(self, key):
+        self._misses[key] = self.clock() + self.ttl
+        self.unknown[key[1]] += 1
+
+    def get_sequence(self, identifier, start=None, end=None):
+        key = ("sequence", identifier)
+        if self._cached_miss(key):
+            raise KeyError(identifier)
+        try:
+            return self.dp.get_sequence(identifier, start=start, end=end)
+        except KeyError:
+            self._remember_miss(key)
+            raise
+
+    def get_metadata(self, identifier):
+        key = ("metadata", identifier)
+        if self._cached_miss(key):
+            raise KeyError(identifier)
+        try:
+            return self.dp.get_metadata(identifier)
+        except KeyError:
+            self._remember_miss(key)
+            raise
+
+    def translate_sequence_identifier(self, identifier, namespace=None):
+        unknown_key = ("metadata", identifier)
+        unaliased_key = (f"alias:{namespace}", identifier)
+        if self._cached_miss(unknown_key):
+            raise KeyError(identifier)
+        if self._cached_miss(unaliased_key):
+            return []
+        try:
+            aliases = self.dp.translate_sequence_identifier(
+                identifier, namespace=namespace
+            )
+        except KeyError:
+            self._remember_miss(unknown_key)
+            raise
+        if not aliases:
+            self._remember_miss(unaliased_key)
+        return aliases
+
+
+class SequenceWindowDataProxy(_DataProxy):
+    """Data proxy that serves subsequences from preloaded in-memory sequence windows.
+
+    `load_window` fetches one region of a sequence; later `get_sequence` calls inside it are
+    sliced from memory. A request that runs past the edge of a window grows the window by at
+    least `growth` bases in that direction. Requests that do not touch a window, and metadata
+    requests, go to the wrapped data proxy (metadata is memoized).
+    """
+
+    def __init__(self, dp, growth: int = 1000):
+        self.dp = dp
+        self.growth = growth
+        self.fetches = 0
+        self._windows = {}
+        self._metadata = {}
+
+    def get_metadata(self, identifier):
+        metadata = self._metadata.get(identifier)
+        if metadata is None:
+            metadata = self._metadata[identifier] = self.dp.get_metadata(identifier)
+        return metadata
+
+    def _fetch(self, identifier, start, end):
+        self.fetches += 1
+        return self.dp.get_sequence(identifier, start=start, end=end)
+
+    def load_window(self, identifier, start, end):
+        """Fetch `identifier[start:end]` (clipped to the sequence) into a new window."""
+        length = self.get_metadata(identifier)["length"]
+        start, end = max(start, 0), min(end, length)
+        self._windows.setdefault(identifier, []).append(
+            [start, self._fetch(identifier, start, end)]
+        )
+
+    def clear(self, identifier=None):
+        """Drop the windows of `identifier`, or all windows."""
+        if identifier is None:
+            self._windows.clear()
+        else:
+            self._windows.pop(identifier, None)
+
+    def get_sequence(self, identifier, start=None, end=None):
+        if start is None or end is None:
+            return self.dp.get_sequence(identifier, start=start, end=end)
+        for window in self._windows.get(identifier, ()):
+            window_start, sequence = window
+            window_end = window_start + len(sequence)
+            if end < window_start or start > window_end:
+                continue
+            if start < window_start:
+                grow_to = max(0, min(start, window_start - self.growth))
+                sequence = self._fetch(identifier, grow_to, window_start) + sequence
+                window_start = grow_to
+                window[:] = [window_start, sequence]
+            if end > window_end:
+                length = self.get_metadata(identifier)["length"]
+                grow_to = min(length, max(end, window_end + self.growth))
+                if grow_to > window_end:
+                    sequence += self._fetch(identifier, window_end, grow_to)
+                    window[1] = sequence
+            return sequence[start - window_start : end - window_start]
+        return self.dp.get_sequence(identifier, start=start, end=end)
+
+
+def create_cached_dataproxy(
+    cache_path, uri: str | None = None, snapshot_id: str | None = None, **kwargs
+):
+    """Create a data proxy for `uri` backed by a persistent cache at `cache_path`.
+
+    Args:
+        cache_path (str): Path of the SQLite cache file.
+        uri (str): The data proxy URI (default `$GA4GH_VRS_DATAPROXY_URI`).
+        snapshot_id (str): The SeqRepo snapshot served by `uri`; derived from local URIs if omitted.
+        **kwargs: Passed on to `PersistentCacheDataProxy`.
+
+    Raises:
+        ValueError: If no snapshot id is given and none can be derived from `uri`.
+
+    Returns:
+        PersistentCacheDataProxy: The cached data proxy.
+    """
+    snapshot_id = snapshot_id or seqrepo_snapshot_id(uri)
+    if not snapshot_id:
+        raise ValueError(
+            "Cannot derive the SeqRepo snapshot from the data proxy URI; pass a snapshot id."
+        )
+    return PersistentCacheDataProxy(
+        create_dataproxy(uri=uri), cache_path, snapshot_id, **kwargs
+    )
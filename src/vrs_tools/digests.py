@@ -0,0 +1,204 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from canonicaljson import encode_canonical_json
+from ga4gh.core import ga4gh_serialize, sha512t24u
+from ga4gh.vrs.models import Ga4ghIdentifiableObject
+from pydantic import RootModel
+
+_SCALAR = 0
+_IDENTIFIABLE = 1
+_VALUE = 2
+_ROOT = 3
+_LIST = 4
+_kinds = {str: _SCALAR, int: _SCALAR, type(None): _SCALAR, list: _LIST}
+
+
+def _kind(cls):
+    """Classify a type for serialization (cached; pydantic `isinstance` checks are slow)."""
+    kind = _kinds.get(cls)
+    if kind is None:
+        if issubclass(cls, Ga4ghIdentifiableObject):
+            kind = _IDENTIFIABLE
+        elif hasattr(getattr(cls, "ga4gh", None), "inherent"):
+            kind = _VALUE
+        elif issubclass(cls, RootModel):
+            kind = _ROOT
+        else:
+            kind = _SCALAR
+        _kinds[cls] = kind
+    return kind
+
+
+def _identifiable_nodes(obj):
+    """Return `obj` and every identifiable object nested in its inherent fields, parents first."""
+    nodes = []
+    kind = _kind(type(obj))
+    if kind == _IDENTIFIABLE:
+        nodes.append(obj)
+    if kind in (_IDENTIFIABLE, _VALUE):
+        for name in obj.ga4gh.inherent:
+            nodes.extend(_identifiable_nodes(getattr(obj, name)))
+    elif kind == _LIST:
+        for item in obj:
+            nodes.extend(_identifiable_nodes(item))
+    return nodes
+
+
+def _json_form(form):
+    """Turn a `DigestService._form` back into the structure `ga4gh_serialize` encodes."""
+    if not isinstance(form, tuple):
+        return form
+    if form[0] is list:
+        return [_json_form(item) for item in form[1:]]
+    return {name: _json_form(value) for name, value in form[1:]}
+
+
+class DigestService:
+    """Computes GA4GH digests and identifiers, memoized by canonical serialization.
+
+    `identify` gives the same digests and identifiers as `ga4gh.core.ga4gh_identify`, but also
+    fills in the id of every nested identifiable object (e.g. an Allele's location) in the same
+    pass, so nothing is digested or identified twice. Digests are kept in an LRU of at most `maxsize` entries.
+    The key is the content of the object's canonical serialization, i.e. its inherent fields
+    with nested identifiable objects replaced by their digests, so for locations and alleles
+    that recur across records neither the canonical JSON nor its hash is computed again.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._digests)
+
+    def _form(self, value):
+        """Return a hashable form of what `ga4gh_serialize` would serialize for `value`.
+
+        Objects become `(class name, (field, form), ...)` with nested identifiable objects
+        replaced by their digests, lists become `(list, form, ...)`.
+        """
+        kind = _kind(type(value))
+        if kind == _SCALAR:
+            return value
+        if kind == _IDENTIFIABLE:
+            self.identify(value)
+            return value.digest
+        if kind == _VALUE:
+            return self._object_form(value)
+        if kind == _ROOT:
+            return self._form(value.root)
+        return (list, *(self._form(item) for item in value))
+
+    def _object_form(self, obj):
+        return (
+            type(obj).__name__,
+            *((name, self._form(getattr(obj, name))) for name in obj.ga4gh.inherent),
+        )
+
+    def digest(self, obj):
+        """Return the digest of an identifiable object, storing it (and nested digests) on it.
+
+        As with `ga4gh_digest`, a digest already set on an object is trusted.
+
+        Args:
+            obj (Ga4ghIdentifiableObject): A VRS object, e.g. an Allele or SequenceLocation.
+
+        Returns:
+            str: The sha512t24u digest.
+        """
+        if obj.digest is not None:
+            return obj.digest
+        form = self._object_form(obj)
+        with self._lock:
+            digest = self._digests.get(form)
+            if digest is not None:
+                self._digests.move_to_end(form)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if digest is None:
+            if type(obj).ga4gh_serialize is Ga4ghIdentifiableObject.ga4gh_serialize:
+                serialization = encode_canonical_json(_json_form(form))
+            else:
+                # e.g. CisPhasedBlock, which sorts its members before serializing.
+                serialization = ga4gh_serialize(obj)
+            digest = sha512t24u(serialization)
+            with self._lock:
+                self._digests[form] = digest
+                if len(self._digests) > self.maxsize:
+                    self._digests.popitem(last=False)
+        obj.digest = digest
+        return digest
+
+    def identify(self, obj):
+        """Return the GA4GH identifier of an object, setting ids and digests throughout it.
+
+        The id of the object and of each nested identifiable object is set unless it already
+        holds a valid GA4GH identifier, which is kept and returned (as by `ga4gh_identify`).
+
+        Args:
+            obj (BaseModel): A VRS object, e.g. an Allele or SequenceLocation.
+
+        Returns:
+            str | None: The `ga4gh:` identifier, or None if the object is not identifiable.
+        """
+        if _kind(type(obj)) != _IDENTIFIABLE:
+            return None
+        digest = self.digest(obj)
+        if not obj.has_valid_ga4gh_id():
+            obj.id = f"ga4gh:{obj.ga4gh.prefix}.{digest}"
+        return obj.id
+
+    def identify_many(
+        self, objects, processes: int | None = None, chunksize: int = 1000
+    ):
+        """Identify many objects, optionally spreading the work over a process pool.
+
+        With `processes`, objects are sent to the pool in chunks of `chunksize`, identified by
+        each worker's own `DigestService`, and the resulting digests and ids are copied back onto
+        the objects in place.
+
+        Args:
+            objects (Iterable[BaseModel]): VRS objects.
+            processes (int): Number of worker processes; identify in this process if omitted.
+            chunksize (int): Objects per pool task.
+
+        Returns:
+            list[str | None]: The identifier of each object, in input order.
+        """
+        objects = list(objects)
+        if not processes or processes < 2 or len(objects) <= chunksize:
+            return [self.identify(obj) for obj in objects]
+
+        chunks = [objects[i : i + chunksize] for i in range(0, len(objects), chunksize)]
+        identifiers = []
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for chunk, (identified, chunk_identifiers) in zip(
+                chunks, pool.map(_identify_chunk, chunks), strict=True
+            ):
+                for obj, result in zip(chunk, identified, strict=True):
+                    for node, done in zip(
+                        _identifiable_nodes(obj),
+                        _identifiable_nodes(result),
+                        strict=True,
+                    ):
+                        node.digest, node.id = done.digest, done.id
+                identifiers.extend(chunk_identifiers)
+        return identifiers
+
+
+_worker_service = None
+
+
+def _identify_chunk(objects):
+    """Pool task: identify a chunk of objects with the worker's own `DigestService`."""
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = DigestService()
+    identifiers = [_worker_service.identify(obj) for obj in objects]
+    return objects, identifiers
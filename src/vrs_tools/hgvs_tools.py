@@ -1,6 +1,168 @@
+import copy
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
 import hgvs.parser
 from ga4gh.vrs.utils.hgvs_tools import HgvsTools
 
+_parser = None
+_parser_lock = threading.Lock()
+
+_BASES = "[ACGTN]"
+# Plain (non-intronic, non-UTR) substitutions, deletions, insertions, delins, duplications and
+# identities on RefSeq genomic and transcript accessions, e.g. `NM_000551.4:c.292_293insA`.
+_SIMPLE_HGVS_RE = re.compile(
+    rf"""
+    (?P<ac>N[CGMRTW]_[0-9]+\.[0-9]+):(?P<type>[gc])\.
+    (?P<start>[0-9]+)(?:_(?P<end>[0-9]+))?
+    (?:
+        (?P<sub_ref>{_BASES})>(?P<sub_alt>{_BASES})
+      | del(?P<delins_ref>{_BASES}*)ins(?P<delins_alt>{_BASES}+)
+      | del(?P<del_ref>{_BASES}*)
+      | ins(?P<ins_alt>{_BASES}+)
+      | dup(?P<dup_ref>{_BASES}*)
+      | (?P<identity_ref>{_BASES}*)=
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class HgvsEdit(NamedTuple):
+    """The position and edit of an HGVS sequence variant, as used by the translators.
+
+    `start` and `end` are the HGVS (1-based, inclusive) bases of the variant; `edit_type`,
+    `ref` and `alt` are those of the parsed `hgvs` edit.
+    """
+
+    ac: str
+    type: str
+    start: int
+    end: int
+    edit_type: str | None
+    ref: str | None = None
+    alt: str | None = None
+    intronic: bool = False
+
+
+def _ref_alt_edit_type(ref, alt):
+    """Return the type `hgvs.edit.NARefAlt` gives an edit with both a ref and an alt."""
+    if ref == alt:
+        return "identity"
+    if len(ref) == 1 and len(alt) == 1:
+        return "sub"
+    return "delins"
+
+
+def parse_simple_hgvs(hgvs_str):
+    """Read a simple HGVS expression without the full `hgvs` grammar.
+
+    Handles the common shapes matched by `_SIMPLE_HGVS_RE` and gives the same `HgvsEdit` as
+    `HgvsToolsLite.parse_edit` does through the full parser.
+
+    Args:
+        hgvs_str (str): The HGVS expression.
+
+    Returns:
+        HgvsEdit | None: The edit, or None if the expression is not of a recognized shape.
+    """
+    m = _SIMPLE_HGVS_RE.fullmatch(hgvs_str)
+    if m is None:
+        return None
+    start = int(m["start"])
+    end = start if m["end"] is None else int(m["end"])
+    position = (m["ac"], m["type"], start, end)
+    if m["sub_ref"] is not None:
+        ref, alt = m["sub_ref"], m["sub_alt"]
+        return HgvsEdit(*position, _ref_alt_edit_type(ref, alt), ref, alt)
+    if m["delins_alt"] is not None:
+        ref, alt = m["delins_ref"], m["delins_alt"]
+        return HgvsEdit(*position, _ref_alt_edit_type(ref, alt), ref, alt)
+    if m["del_ref"] is not None:
+        return HgvsEdit(*position, "del", m["del_ref"])
+    if m["ins_alt"] is not None:
+        return HgvsEdit(*position, "ins", None, m["ins_alt"])
+    if m["dup_ref"] is not None:
+        return HgvsEdit(*position, "dup", m["dup_ref"])
+    ref = m["identity_ref"]
+    return HgvsEdit(*position, "identity", ref, ref)
+
+
+def shared_parser():
+    """Return the process-wide HGVS parser, building it on first use.
+
+    Building the parser compiles the HGVS grammar, so every `HgvsToolsLite` shares one. Call
+    this before starting a fork-based worker pool so the workers inherit the built parser.
+
+    Returns:
+        hgvs.parser.Parser: The shared parser.
+    """
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = hgvs.parser.Parser()
+    return _parser
+
+
+class HgvsParseCache:
+    """Bounded LRU of parsed HGVS expressions, keyed by the expression string.
+
+    Hits return a copy of the cached `SequenceVariant`, so callers may modify what they get.
+    Expressions that fail to parse are not cached.
+    """
+
+    def __init__(self, maxsize: int = 10_000, parser=None):
+        self.maxsize = maxsize
+        self.parser = parser
+        self.hits = 0
+        self.misses = 0
+        self._variants = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._variants)
+
+    def parse(self, hgvs_str):
+        """Parse an HGVS variant expression, or return a copy of its earlier parse.
+
+        Args:
+            hgvs_str (str): The HGVS expression.
+
+        Raises:
+            hgvs.exceptions.HGVSParseError: If the expression cannot be parsed.
+
+        Returns:
+            hgvs.sequencevariant.SequenceVariant: The parsed variant.
+        """
+        with self._lock:
+            sv = self._variants.get(hgvs_str)
+            if sv is not None:
+                self._variants.move_to_end(hgvs_str)
+                self.hits += 1
+                return copy.deepcopy(sv)
+            self.misses += 1
+        sv = (self.parser or shared_parser()).parse_hgvs_variant(hgvs_str)
+        with self._lock:
+            self._variants[hgvs_str] = sv
+            if len(self._variants) > self.maxsize:
+                self._variants.popitem(last=False)
+        return copy.deepcopy(sv)
+
+    def clear(self):
+        with self._lock:
+            self._variants.clear()
+
+
+_parse_cache = HgvsParseCache()
+
+
+def shared_parse_cache():
+    """Return the process-wide `HgvsParseCache` used by `HgvsToolsLite` by default."""
+    return _parse_cache
+
 
 # NOTE: Consider removing this module now that we can use Podman and have access to the UTA database.
 # NOTE: Evaluate using hgvstools as a replacement for this module.
@@ -8,14 +170,83 @@ class HgvsToolsLite(HgvsTools):
     """
     A lightweight subclass of HgvsTools that does not connect to the UTA database.
     Provides parsing and syntax validation only.
+
+    Instances share the process-wide parser (`shared_parser`) and parse cache
+    (`shared_parse_cache`) unless given their own `parse_cache`, so creating one is cheap.
     """
 
-    def __init__(self, data_proxy=None):
+    def __init__(self, data_proxy=None, parse_cache: HgvsParseCache | None = None):
         self.data_proxy = data_proxy
-        self.parser = hgvs.parser.Parser()
+        self.parser = shared_parser()
+        self.parse_cache = shared_parse_cache() if parse_cache is None else parse_cache
 
         # make UTA-related attrs exist but disabled
         # Need to write a Query to see if i get a connection form UTA
         self.uta_conn = None
         self.normalizer = None
         self.variant_mapper = None
+
+    def parse(self, hgvs_str):
+        if not self.hgvs_re.match(hgvs_str):
+            return None
+        return self.parse_cache.parse(hgvs_str)
+
+    def edit_from_variant(self, sv):
+        """Return the `HgvsEdit` of a parsed `SequenceVariant`."""
+        edit = sv.posedit.edit
+        return HgvsEdit(
+            ac=sv.ac,
+            type=sv.type,
+            start=sv.posedit.pos.start.base,
+            end=sv.posedit.pos.end.base,
+            edit_type=self.get_edit_type(sv),
+            ref=getattr(edit, "ref", None),
+            alt=getattr(edit, "alt", None),
+            intronic=self.is_intronic(sv),
+        )
+
+    def parse_edit(self, hgvs_str):
+        """Parse an HGVS expression into an `HgvsEdit`.
+
+        Common shapes are read by `parse_simple_hgvs`; everything else goes through the full
+        (cached) parser.
+
+        Args:
+            hgvs_str (str): The HGVS expression.
+
+        Raises:
+            hgvs.exceptions.HGVSParseError: If the expression cannot be parsed.
+
+        Returns:
+            HgvsEdit | None: The edit, or None if the string is not an HGVS expression.
+        """
+        edit = parse_simple_hgvs(hgvs_str)
+        if edit is not None:
+            return edit
+        sv = self.parse(hgvs_str)
+        return None if sv is None else self.edit_from_variant(sv)
+
+    def get_edit_position_and_state(self, edit):
+        """Return the interbase `(start, end, alt)` of an `HgvsEdit`.
+
+        Mirrors `HgvsTools.get_position_and_state`, which does the same for a `SequenceVariant`.
+
+        Raises:
+            ValueError: If the edit type is unsupported.
+        """
+        if edit.edit_type == "ins":
+            return edit.start, edit.start, edit.alt
+        if edit.edit_type in ("sub", "del", "delins", "identity"):
+            if edit.edit_type == "identity":
+                state = self.data_proxy.get_sequence(
+                    edit.ac, start=edit.start - 1, end=edit.end
+                )
+            else:
+                state = edit.alt or ""
+            return edit.start - 1, edit.end, state
+        if edit.edit_type == "dup":
+            ref = self.data_proxy.get_sequence(
+                edit.ac, start=edit.start - 1, end=edit.end
+            )
+            return edit.start - 1, edit.end, ref + ref
+        raise ValueError(f"HGVS variant type {edit.edit_type} is unsupported")
@@ -0,0 +1,310 @@
+"""Fully-justified VRS Allele normalization over an in-memory reference buffer.
+
+`normalize_allele` reproduces `ga4gh.vrs.normalize.normalize` for Alleles, but reads the
+reference from a `str`, `bytes`, `bytearray` or `memoryview` covering part (or all) of the
+sequence instead of issuing a data proxy request for every trim and roll step. Repeats are
+scanned in doubling blocks compared at C speed, so rolling across long tandem repeats stays
+cheap.
+"""
+
+from ga4gh.core import pydantic_copy
+from ga4gh.vrs.models import (
+    LiteralSequenceExpression,
+    Range,
+    ReferenceLengthExpression,
+    SequenceReference,
+    sequenceString,
+)
+
+from exceptions.utils import ReferenceWindowExhaustedError
+
+# Block size of the first repeat comparison; each matching block doubles it.
+_FIRST_BLOCK = 32
+
+
+class ReferenceBuffer:
+    """A window `[offset, offset + len(buffer))` of a sequence of `sequence_length` bases."""
+
+    def __init__(self, buffer, offset: int = 0, sequence_length: int | None = None):
+        if isinstance(buffer, str):
+            self._buffer = buffer
+            self._text = True
+        else:
+            self._buffer = memoryview(buffer).cast("B")
+            self._text = False
+        self.offset = offset
+        self.end = offset + len(self._buffer)
+        self.sequence_length = self.end if sequence_length is None else sequence_length
+        if self.offset < 0 or self.end > self.sequence_length:
+            raise ValueError("Reference buffer lies outside the sequence.")
+
+    def encode(self, sequence: str):
+        """Return `sequence` in the representation of the buffer."""
+        return sequence if self._text else sequence.encode("ascii")
+
+    def __getitem__(self, key: slice):
+        """Return the bases `[key.start, key.stop)`, in sequence coordinates, as a `str`."""
+        start, stop = self._check(key.start), self._check(key.stop)
+        if stop <= start:
+            return ""
+        sequence = self._buffer[start - self.offset : stop - self.offset]
+        return sequence if self._text else bytes(sequence).decode("ascii")
+
+    def _check(self, pos):
+        if pos < self.offset and self.offset > 0:
+            self._exhausted("left", pos)
+        if pos > self.end and self.end < self.sequence_length:
+            self._exhausted("right", pos)
+        return min(max(pos, self.offset), self.end)
+
+    def roll_left(self, pos: int, allele) -> int:
+        """Return how far `allele` can be circularly rolled left from `pos`.
+
+        Matches `bioutils.normalize.roll_left` for a single non-empty (encoded) allele, bounded
+        by the start of the sequence.
+        """
+        buf, length, i = self._buffer, len(allele), pos - self.offset
+        available = pos
+        # The first `length` bases are compared with the allele itself ...
+        stop, d = min(length, available), 0
+        while d < stop and d < i and buf[i - 1 - d] == allele[length - 1 - d]:
+            d += 1
+        if d < stop:
+            if d == i:
+                self._exhausted("left", pos)
+            return d
+        if d == available:
+            return d
+        # ... after which the roll goes on while the reference repeats with period `length`.
+        limit = available - length
+        within = min(limit, i - length)
+        n = _common_suffix(buf, i - length, i, within)
+        if n == within < limit:
+            self._exhausted("left", pos)
+        return d + n
+
+    def roll_right(self, pos: int, allele) -> int:
+        """Return how far `allele` can be circularly rolled right from `pos`.
+
+        Matches `bioutils.normalize.roll_right` for a single non-empty (encoded) allele,
+        bounded by the end of the sequence.
+        """
+        buf, length, i = self._buffer, len(allele), pos - self.offset
+        available = self.sequence_length - pos
+        stop, d = min(length, available), 0
+        while d < stop and i + d < len(buf) and buf[i + d] == allele[d]:
+            d += 1
+        if d < stop:
+            if i + d == len(buf):
+                self._exhausted("right", pos)
+            return d
+        if d == available:
+            return d
+        limit = available - length
+        within = min(limit, len(buf) - i - length)
+        n = _common_prefix(buf, i, i + length, within)
+        if n == within < limit:
+            self._exhausted("right", pos)
+        return d + n
+
+    def _exhausted(self, side, pos):
+        raise ReferenceWindowExhaustedError(
+            f"The repeat at {pos} runs past the {side} edge of the reference window "
+            f"[{self.offset}, {self.end}).",
+            side=side,
+        )
+
+
+def _common_prefix(buf, i: int, j: int, limit: int) -> int:
+    """Return the number of bases, at most `limit`, for which `buf[i:]` and `buf[j:]` agree."""
+    n, block = 0, _FIRST_BLOCK
+    while n < limit:
+        size = min(block, limit - n)
+        if buf[i + n : i + n + size] != buf[j + n : j + n + size]:
+            while buf[i + n] == buf[j + n]:
+                n += 1
+            return n
+        n += size
+        block *= 2
+    return n
+
+
+def _common_suffix(buf, i: int, j: int, limit: int) -> int:
+    """Return the number of bases, at most `limit`, for which `buf[:i]` and `buf[:j]` agree."""
+    n, block = 0, _FIRST_BLOCK
+    while n < limit:
+        size = min(block, limit - n)
+        if buf[i - n - size : i - n] != buf[j - n - size : j - n]:
+            while buf[i - n - 1] == buf[j - n - 1]:
+                n += 1
+            return n
+        n += size
+        block *= 2
+    return n
+
+
+def _position(pos):
+    """Return `(value, kind)` for an integer or indefinite range position, None for a definite range.
+
+    `kind` is None for integers, else the index (0 or 1) of the open side of the range.
+    """
+    if isinstance(pos, int):
+        return pos, None
+    lower, upper = pos.root
+    if lower is not None and upper is not None:
+        return None
+    return (lower or upper), (0 if lower is None else 1)
+
+
+def _like(value: int, kind):
+    """Return `value` as a position of the same kind as the one it was normalized from."""
+    if kind is None:
+        return value
+    return Range([None, value] if kind == 0 else [value, None])
+
+
+def _set_interval(allele, interval, kinds):
+    allele.location.start = _like(interval[0], kinds[0])
+    allele.location.end = _like(interval[1], kinds[1])
+
+
+def _reference_length_allele(allele, length, repeat_subunit_length, rle_seq_limit, alt):
+    allele.state = ReferenceLengthExpression(
+        length=length, repeatSubunitLength=repeat_subunit_length
+    )
+    if rle_seq_limit is None or (rle_seq_limit and length <= rle_seq_limit):
+        allele.state.sequence = sequenceString(alt)
+    return allele
+
+
+def _literal_allele(allele, alt):
+    allele.state = LiteralSequenceExpression(sequence=sequenceString(alt))
+    return allele
+
+
+def _descending_factors(n: int):
+    lower = []
+    i = 1
+    while i * i <= n:
+        if n % i == 0:
+            yield n // i
+            if n // i != i:
+                lower.append(i)
+        i += 1
+    yield from reversed(lower)
+
+
+def _continues_cycle(ref: str, alt: str, cycle_start: int) -> bool:
+    """Return True if `alt` past the length of `ref` repeats `ref[cycle_start:]`."""
+    unit, tail = ref[cycle_start:], alt[len(ref) :]
+    return (unit * (len(tail) // len(unit) + 1))[: len(tail)] == tail
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    n = 0
+    for x, y in zip(a, b, strict=False):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def normalize_allele(
+    allele,
+    reference,
+    offset: int = 0,
+    sequence_length: int | None = None,
+    rle_seq_limit: int | None = 50,
+):
+    """Normalize a VRS Allele against an in-memory reference.
+
+    Gives the same result as `ga4gh.vrs.normalize.normalize(allele, dp, rle_seq_limit=...)`:
+    shared flanks are trimmed, insertions and deletions are expanded over their whole region
+    of ambiguity, and reference-derived changes become ReferenceLengthExpressions. Alleles the
+    ga4gh implementation leaves alone (non-literal states, definite ranges, locations without
+    a SequenceReference) are returned unchanged.
+
+    Args:
+        allele (Allele): The VRS Allele; it is not modified.
+        reference (str | bytes | bytearray | memoryview): Bases `[offset, offset + len(reference))`
+            of the allele's sequence.
+        offset (int): Sequence position of the first base of `reference`.
+        sequence_length (int): Length of the whole sequence (default `offset + len(reference)`).
+        rle_seq_limit (int): Longest ReferenceLengthExpression that keeps its `sequence`; 0 drops
+            it, None keeps it at any length.
+
+    Raises:
+        ReferenceWindowExhaustedError: If normalization needs bases outside `reference`; retry
+            with a wider window on the reported side.
+        ValueError: If the allele's start is after its end.
+
+    Returns:
+        Allele: A normalized copy of the allele, or `allele` itself if it cannot be normalized.
+    """
+    if not isinstance(allele.state, LiteralSequenceExpression) or not isinstance(
+        getattr(allele.location, "sequenceReference", None), SequenceReference
+    ):
+        return allele
+    start, end = _position(allele.location.start), _position(allele.location.end)
+    if start is None or end is None:
+        return allele
+    (start, start_kind), (end, end_kind) = start, end
+    kinds = (start_kind, end_kind)
+    if start > end:
+        raise ValueError(f"Allele start {start} is after its end {end}.")
+
+    ref_seq = ReferenceBuffer(reference, offset, sequence_length)
+    ref = ref_seq[start:end]
+    alt = allele.state.sequence.root or ""
+    new_allele = pydantic_copy(allele)
+
+    # Identical alleles are reference alleles spanning the original interval.
+    if ref == alt:
+        _set_interval(new_allele, (start, end), kinds)
+        return _reference_length_allele(
+            new_allele, len(alt), len(alt), rle_seq_limit, alt
+        )
+
+    # Trim the shared prefix, then the shared suffix.
+    prefix = _common_prefix_length(ref, alt)
+    ref, alt = ref[prefix:], alt[prefix:]
+    suffix = _common_prefix_length(ref[::-1], alt[::-1])
+    ref, alt = ref[: len(ref) - suffix], alt[: len(alt) - suffix]
+    trim_start, trim_end = start + prefix, end - suffix
+    seed_length = len(ref) or len(alt)
+
+    if ref and alt:
+        _set_interval(new_allele, (trim_start, trim_end), kinds)
+        new_allele.state.sequence = sequenceString(alt)
+        return new_allele
+
+    # Expand the insertion or deletion over the repeat it sits in.
+    rolled = ref_seq.encode(ref or alt)
+    left = ref_seq.roll_left(trim_start, rolled)
+    right = ref_seq.roll_right(trim_end, rolled)
+    new_start, new_end = trim_start - left, trim_end + right
+    extended_ref = ref_seq[new_start:new_end]
+    extended_alt = ref_seq[new_start:trim_start] + alt + ref_seq[trim_end:new_end]
+    _set_interval(new_allele, (new_start, new_end), kinds)
+
+    if not extended_ref:
+        return _literal_allele(new_allele, extended_alt)
+    if len(extended_alt) < len(extended_ref):
+        return _reference_length_allele(
+            new_allele, len(extended_alt), seed_length, rle_seq_limit, extended_alt
+        )
+    if len(extended_alt) > len(extended_ref):
+        for cycle_length in _descending_factors(seed_length):
+            if cycle_length > len(extended_ref):
+                continue
+            if _continues_cycle(
+                extended_ref, extended_alt, len(extended_ref) - cycle_length
+            ):
+                return _reference_length_allele(
+                    new_allele,
+                    len(extended_alt),
+                    cycle_length,
+                    rle_seq_limit,
+                    extended_alt,
+                )
+    return _literal_allele(new_allele, extended_alt)
@@ -1,6 +1,7 @@
-from ga4gh.core import ga4gh_identify
+from collections import defaultdict
+
 from ga4gh.vrs.dataproxy import create_dataproxy
-from ga4gh.vrs.models import LiteralSequenceExpression
+from ga4gh.vrs.models import LiteralSequenceExpression, SequenceReference
 from ga4gh.vrs.normalize import (
     denormalize_reference_length_expression,
 )
@@ -8,29 +9,177 @@ from ga4gh.vrs.normalize import (
     normalize as vrs_normalize,
 )
 
+from exceptions.utils import ReferenceWindowExhaustedError, UnknownAccessionError
+from vrs_tools.dataproxy import SequenceWindowDataProxy
+from vrs_tools.digests import DigestService
+from vrs_tools.local_normalize import normalize_allele
+
+# "ga4gh" normalizes through `ga4gh.vrs.normalize`, "local" through `vrs_tools.local_normalize`.
+NORMALIZATION_ENGINES = ("ga4gh", "local")
+
+# `normalize_many` starts a new cluster once one would span more than this many bases.
+_MAX_WINDOW_LENGTH = 1_000_000
+
+
+def _allele_span(allele):
+    """Return `(sequence alias, start, end)` of an allele that can be normalized, or None."""
+    location = allele.location
+    if not (
+        isinstance(allele.state, LiteralSequenceExpression)
+        and isinstance(getattr(location, "sequenceReference", None), SequenceReference)
+        and isinstance(location.start, int)
+        and isinstance(location.end, int)
+    ):
+        return None
+    return (
+        f"ga4gh:{location.sequenceReference.refgetAccession}",
+        location.start,
+        location.end,
+    )
+
+
+def _clusters(spans, gap):
+    """Group sorted `(start, end, index)` spans into runs no more than `gap` bases apart.
+
+    Yields `(start, end, spans)` per cluster; no cluster spans more than `_MAX_WINDOW_LENGTH`
+    bases unless a single span does.
+    """
+    cluster_start, cluster_end = spans[0][:2]
+    cluster = [spans[0]]
+    for span in spans[1:]:
+        start, end, _ = span
+        if (
+            start - cluster_end > gap
+            or max(cluster_end, end) - cluster_start > _MAX_WINDOW_LENGTH
+        ):
+            yield cluster_start, cluster_end, cluster
+            cluster_start, cluster_end, cluster = start, end, []
+        cluster_end = max(cluster_end, end)
+        cluster.append(span)
+    yield cluster_start, cluster_end, cluster
+
 
 class VariantNormalizer:
-    """Handles variant normalization using GA4GH VRS."""
+    """Handles variant normalization using GA4GH VRS.
 
-    def __init__(self, dp=None, uri: str | None = None):
+    With `engine="local"`, alleles are normalized by `vrs_tools.local_normalize` against one
+    reference window of `window` flanking bases fetched per allele (widened and refetched if a
+    repeat runs past it), instead of one data proxy request per trim and roll step. Both
+    engines give identical results. Identifiers are assigned by a `DigestService`, which can be
+    shared between normalizers.
+    """
+
+    def __init__(
+        self,
+        dp=None,
+        uri: str | None = None,
+        engine: str = "ga4gh",
+        window: int = 100,
+        digests: DigestService | None = None,
+    ):
+        if engine not in NORMALIZATION_ENGINES:
+            raise ValueError(
+                f"Unknown normalization engine {engine!r}; expected one of {NORMALIZATION_ENGINES}."
+            )
         self.dp = dp or create_dataproxy(uri=uri)
+        self.engine = engine
+        self.window = window
+        self.digests = DigestService() if digests is None else digests
+
+    def _normalize_local(self, allele):
+        """Normalize an allele with the local engine, widening the reference window as needed."""
+        span = _allele_span(allele)
+        if span is None:
+            return vrs_normalize(allele, self.dp)
+        identifier, start, end = span
+        sequence_length = self.dp.get_metadata(identifier)["length"]
+        flank = self.window
+        while True:
+            window_start = max(0, start - flank)
+            window_end = min(sequence_length, end + flank)
+            reference = self.dp.get_sequence(identifier, window_start, window_end)
+            try:
+                return normalize_allele(
+                    allele,
+                    reference,
+                    offset=window_start,
+                    sequence_length=sequence_length,
+                )
+            except ReferenceWindowExhaustedError:
+                flank *= 4
 
     def normalize(self, allele):
         """Normalize an allele and assign GA4GH digest-based identifiers."""
-        # Using the ga4gh normalize function to normalize the allele. (Coming form biocommons.normalize())
-        allele = vrs_normalize(allele, self.dp)
-        # Setting the allele id to a GA4GH digest-based id for the object, as a CURIE
-        allele.id = ga4gh_identify(allele)
-        # Setting the location id to a GA4GH digest-based id for the object, as a CURIE
-        allele.location.id = ga4gh_identify(allele.location)
+        if self.engine == "local":
+            allele = self._normalize_local(allele)
+        else:
+            # Using the ga4gh normalize function to normalize the allele. (Coming form biocommons.normalize())
+            allele = vrs_normalize(allele, self.dp)
+        # Setting the allele id, and the location id along with it, to GA4GH digest-based ids, as CURIEs
+        self.digests.identify(allele)
 
         return allele
 
+    def normalize_many(self, alleles, padding: int = 1000):
+        """Normalize many alleles, sharing reference sequence fetches between nearby alleles.
+
+        Alleles are grouped by sequence and clustered by position (clusters span at most
+        `_MAX_WINDOW_LENGTH` bases), and one window padded by `padding` bases on each side is
+        loaded per cluster and dropped once its alleles are done. Each allele is normalized
+        against the in-memory window, which is only extended (by at least `padding` bases) when
+        a repeat runs past its edge. Alleles that cannot be normalized against a window are
+        normalized one at a time.
+
+        Args:
+            alleles (Iterable[Allele]): VRS Alleles to normalize.
+            padding (int): Flanking bases loaded around each cluster.
+
+        Returns:
+            list[Allele]: The normalized alleles, in input order.
+        """
+        alleles = list(alleles)
+        windows = SequenceWindowDataProxy(self.dp, growth=padding)
+        windowed = VariantNormalizer(
+            dp=windows, engine=self.engine, window=self.window, digests=self.digests
+        )
+
+        by_sequence = defaultdict(list)
+        for i, allele in enumerate(alleles):
+            span = _allele_span(allele)
+            if span is not None:
+                identifier, start, end = span
+                by_sequence[identifier].append((start, end, i))
+
+        normalized = [None] * len(alleles)
+        for identifier, spans in by_sequence.items():
+            spans.sort()
+            for cluster_start, cluster_end, cluster in _clusters(spans, 2 * padding):
+                windows.load_window(
+                    identifier, cluster_start - padding, cluster_end + padding
+                )
+                for _, _, i in cluster:
+                    normalized[i] = windowed.normalize(alleles[i])
+                windows.clear(identifier)
+
+        return [
+            self.normalize(allele) if result is None else result
+            for allele, result in zip(alleles, normalized, strict=True)
+        ]
+
     def denormalize_reference_length(self, ao):
         """Denormalize a ReferenceLengthExpression allele expression into a literal sequence."""
         sequence = f"ga4gh:{ao.location.get_refget_accession()}"
 
-        aliases = self.dp.translate_sequence_identifier(sequence, "refseq")
+        try:
+            aliases = self.dp.translate_sequence_identifier(sequence, "refseq")
+        except KeyError as e:
+            raise UnknownAccessionError(
+                f"Unknown sequence ID '{sequence}'.", accession=sequence
+            ) from e
+        if not aliases:
+            raise UnknownAccessionError(
+                f"No RefSeq ID found for sequence ID '{sequence}'.", accession=sequence
+            )
         refseq_id = aliases[0].split(":")[1]
 
         ref_seq = self.dp.get_sequence(
@@ -0,0 +1,103 @@
+import gzip
+
+import orjson
+
+# A synthetic reference sequence with a short tandem repeat ("CAG" x 5) at 30..45.
+REFERENCE_ACCESSION = "NC_000019.10"
+REFERENCE_SEQUENCE = (
+    "ACGTTGCATGACCTGAGTCAGTTACGGATC"
+    "CAGCAGCAGCAGCAG"
+    "TTGACCATGGTACGATCGGATCCTAGGCTAACGTTAGCATGACTGACTTAGCCATG"
+)
+UNKNOWN_REFGET_ACCESSION = "SQ.0000000000000000000000000000UNKN"
+
+
+def lse_member(refget_accession, start, end, sequence, allele_id=None):
+    """A ClinVar-style VRS Allele member with a LiteralSequenceExpression state."""
+    member = {
+        "type": "Allele",
+        "location": {
+            "type": "SequenceLocation",
+            "sequenceReference": {
+                "type": "SequenceReference",
+                "refgetAccession": refget_accession,
+                "moleculeType": "genomic",
+            },
+            "start": start,
+            "end": end,
+        },
+        "state": {"type": "LiteralSequenceExpression", "sequence": sequence},
+    }
+    if allele_id:
+        member["id"] = allele_id
+    return member
+
+
+def rle_member(refget_accession, start, end, length, repeat_subunit_length):
+    """A ClinVar-style VRS Allele member with a ReferenceLengthExpression state."""
+    return {
+        "type": "Allele",
+        "location": {
+            "type": "SequenceLocation",
+            "sequenceReference": {
+                "type": "SequenceReference",
+                "refgetAccession": refget_accession,
+                "moleculeType": "genomic",
+            },
+            "start": start,
+            "end": end,
+        },
+        "state": {
+            "type": "ReferenceLengthExpression",
+            "length": length,
+            "repeatSubunitLength": repeat_subunit_length,
+        },
+    }
+
+
+def clinvar_records(refget_accession):
+    """ClinVar variation records covering every pipeline outcome.
+
+    - 4 valid alleles (3 LiteralSequenceExpression, 1 ReferenceLengthExpression)
+    - 1 member that fails VRS validation
+    - 1 allele whose sequence is unknown to the data proxy (fails FHIR translation)
+    - non-Allele members that are skipped
+    """
+    unknown = lse_member(UNKNOWN_REFGET_ACCESSION, 1, 2, "T")
+    del unknown["location"]["sequenceReference"]["moleculeType"]
+
+    return [
+        {
+            "id": "clinvar:1001",
+            "members": [
+                lse_member(refget_accession, 4, 5, "A", "ga4gh:VA.example-1001"),
+                {"type": "CategoricalVariant", "id": "clinvar:1001"},
+            ],
+        },
+        {
+            "id": "clinvar:1002",
+            "members": [rle_member(refget_accession, 30, 45, 18, 3)],
+        },
+        {
+            "id": "clinvar:1003",
+            "members": [
+                lse_member(refget_accession, 10, 12, "TT"),
+                {"type": "Allele", "location": {"start": "bad"}},
+            ],
+        },
+        {"id": "clinvar:1004", "members": [unknown]},
+        {
+            "id": "clinvar:1005",
+            "members": [lse_member(refget_accession, 60, 61, "G")],
+        },
+    ]
+
+
+def write_clinvar_gzip(path, records, malformed_lines=0):
+    """Write records as gzipped JSONL, optionally followed by undecodable lines."""
+    with gzip.open(path, "wb") as f:
+        for record in records:
+            f.write(orjson.dumps(record) + b"\n")
+        for _ in range(malformed_lines):
+            f.write(b"{not json\n")
+    return path
@@ -0,0 +1,102 @@
+import orjson
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+ipc = pytest.importorskip("pyarrow.ipc")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline  # noqa: E402
+from pipelines.columnar import ColumnarTranslationSink  # noqa: E402
+from tests.pipelines.examples.clinvar_records import (  # noqa: E402
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy  # noqa: E402
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def clinvar_input(tmp_path, dp):
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    return write_clinvar_gzip(tmp_path / "variations.jsonl.gz", records)
+
+
+def read_table(path, fmt):
+    if fmt == "parquet":
+        return pq.read_table(path)
+    return ipc.open_file(path).read_all()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_pipeline_writes_columnar_output(tmp_path, monkeypatch, dp, clinvar_input, fmt):
+    monkeypatch.chdir(tmp_path)
+    columnar_path = tmp_path / f"translations.{fmt}"
+
+    with ColumnarTranslationSink(columnar_path, fmt=fmt, row_group_size=2) as sink:
+        ClinvarTranslationPipeline(dp=dp).run(
+            inputfile=clinvar_input,
+            outputfile=tmp_path / "translations.jsonl",
+            invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+            invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+            columnar_sink=sink,
+        )
+
+    table = read_table(columnar_path, fmt)
+    jsonl_rows = [
+        orjson.loads(line)
+        for line in (tmp_path / "translations.jsonl").read_bytes().splitlines()
+    ]
+
+    assert table.num_rows == len(jsonl_rows) == 4
+    assert pa.types.is_dictionary(table.schema.field("refget_accession").type)
+
+    rows = table.to_pylist()
+    assert [row["line"] for row in rows] == [row["line"] for row in jsonl_rows]
+    assert {row["refseq_id"] for row in rows} == {REFERENCE_ACCESSION}
+    assert [row["state_type"] for row in rows] == [
+        "LiteralSequenceExpression",
+        "ReferenceLengthExpression",
+        "LiteralSequenceExpression",
+        "LiteralSequenceExpression",
+    ]
+    assert rows[0]["vrs_id"] == "ga4gh:VA.example-1001"
+    assert (rows[1]["start"], rows[1]["end"]) == (30, 45)
+    assert rows[1]["alt_sequence"] == "CAG" * 6
+    assert {row["molecule_type"] for row in rows} == {"dna"}
+    assert [orjson.loads(row["fhir_json"]) for row in rows] == [
+        row["fhir_allele"] for row in jsonl_rows
+    ]
+
+
+def test_columnar_output_adds_no_per_record_lookups(tmp_path, dp):
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    inputfile = write_clinvar_gzip(tmp_path / "variations.jsonl.gz", records * 10)
+
+    def lookups(name, columnar_sink=None):
+        dp.calls.clear()
+        ClinvarTranslationPipeline(dp=dp).run(
+            inputfile=inputfile,
+            outputfile=tmp_path / f"{name}.jsonl",
+            invalid_allele_path=tmp_path / f"{name}_invalid_alleles.jsonl",
+            invalid_fhir_path=tmp_path / f"{name}_invalid_fhir.jsonl",
+            stats_path=tmp_path / f"{name}_stats.json",
+            columnar_sink=columnar_sink,
+        )
+        return dp.calls["translate_sequence_identifier"]
+
+    plain = lookups("plain")
+    with ColumnarTranslationSink(tmp_path / "translations.parquet") as sink:
+        columnar = lookups("columnar", sink)
+
+    assert columnar == plain + 1
+
+
+def test_sink_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarTranslationSink(tmp_path / "out.csv", fmt="csv")
@@ -0,0 +1,119 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from ga4gh.vrs.models import Allele as VrsAllele  # noqa: E402
+
+from pipelines.columnar import (  # noqa: E402
+    ColumnarFhirToVrsTranslator,
+    ColumnarTranslationSink,
+    ColumnarVrsToFhirTranslator,
+    read_record_batches,
+)
+from profiles.allele import Allele as FhirAllele  # noqa: E402
+from tests.pipelines.examples.clinvar_records import (  # noqa: E402
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    UNKNOWN_REFGET_ACCESSION,
+    lse_member,
+    rle_member,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy  # noqa: E402
+from translators.vrs_to_fhir_allele import VrsToFhirAlleleTranslator  # noqa: E402
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def vrs_parquet(tmp_path, dp):
+    refget = dp.refget_accession(REFERENCE_ACCESSION)
+    table = pa.table(
+        {
+            "vrs_id": ["ga4gh:VA.example-1", None, None, None, None],
+            "refget_accession": [
+                refget,
+                refget,
+                refget,
+                UNKNOWN_REFGET_ACCESSION,
+                refget,
+            ],
+            "start": [4, 30, 10, 1, 20],
+            "end": [5, 45, 12, 2, 21],
+            "sequence": ["A", None, "TT", "T", None],
+            "length": [None, 18, None, None, None],
+            "repeat_subunit_length": [None, 3, None, None, None],
+        }
+    )
+    path = tmp_path / "vrs_alleles.parquet"
+    pq.write_table(table, path)
+    return path
+
+
+def expected_fhir(dp):
+    refget = dp.refget_accession(REFERENCE_ACCESSION)
+    members = [
+        lse_member(refget, 4, 5, "A", "ga4gh:VA.example-1"),
+        rle_member(refget, 30, 45, 18, 3),
+        lse_member(refget, 10, 12, "TT"),
+    ]
+    translator = VrsToFhirAlleleTranslator(dp=dp)
+    return [
+        translator.translate(VrsAllele(**member)).model_dump(exclude_none=True)
+        for member in members
+    ]
+
+
+def test_translate_batch_matches_row_translator(dp, vrs_parquet):
+    expected = expected_fhir(dp)
+    dp.calls.clear()
+
+    translator = ColumnarVrsToFhirTranslator(dp=dp)
+    (batch,) = read_record_batches(vrs_parquet)
+    results = translator.translate_batch(batch)
+
+    assert [type(result) for result in results[:3]] == [FhirAllele] * 3
+    assert [result.model_dump(exclude_none=True) for result in results[:3]] == expected
+    assert "No RefSeq ID found" in str(results[3])
+    assert "neither a literal sequence" in str(results[4])
+
+    # One alias lookup per distinct accession, one subunit fetch for the RLE row.
+    assert dp.calls["translate_sequence_identifier"] == 2
+    assert dp.calls["get_sequence"] == 1
+
+
+def test_state_types_classified_per_row(dp, vrs_parquet):
+    (batch,) = read_record_batches(vrs_parquet)
+    assert ColumnarVrsToFhirTranslator(dp=dp).classify_state_types(batch) == [
+        "LiteralSequenceExpression",
+        "ReferenceLengthExpression",
+        "LiteralSequenceExpression",
+        "LiteralSequenceExpression",
+        None,
+    ]
+
+
+def test_columnar_round_trip(tmp_path, dp, vrs_parquet):
+    output = tmp_path / "fhir_alleles.parquet"
+    with ColumnarTranslationSink(output) as sink:
+        counts = ColumnarVrsToFhirTranslator(dp=dp).translate_to_sink(
+            read_record_batches(vrs_parquet, batch_size=2), sink
+        )
+    assert counts == {"total_translated": 3, "total_failed": 2}
+
+    rows = pq.read_table(output).to_pylist()
+    assert [row["line"] for row in rows] == [0, 1, 2]
+    assert rows[1]["state_type"] == "ReferenceLengthExpression"
+    assert rows[1]["refseq_id"] == REFERENCE_ACCESSION
+
+    vrs_alleles = [
+        result
+        for batch in read_record_batches(output)
+        for result in ColumnarFhirToVrsTranslator().translate_batch(batch)
+    ]
+    assert [
+        (a.location.start, a.location.end, a.state.sequence.root) for a in vrs_alleles
+    ] == [(4, 5, "A"), (30, 45, "CAG" * 6), (10, 12, "TT")]
@@ -0,0 +1,112 @@
+import gzip
+import sys
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline
+from pipelines.estimate import (
+    CountingDataProxy,
+    _peak_rss_bytes,
+    estimate_run,
+    sample_lines,
+)
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def records(dp):
+    return clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+
+
+def write_block_gzip(path, records, lines_per_block=7):
+    """Write records as a concatenation of small gzip members, as bgzip does."""
+    lines = [orjson.dumps(record) + b"\n" for record in records]
+    with open(path, "wb") as f:
+        for start in range(0, len(lines), lines_per_block):
+            f.write(gzip.compress(b"".join(lines[start : start + lines_per_block])))
+    return path
+
+
+def test_seek_sampling_of_block_compressed_input(tmp_path, records):
+    inputfile = write_block_gzip(tmp_path / "variations.jsonl.gz", records * 400)
+    lines, sampling = sample_lines(inputfile, sample_size=50, seed=1)
+
+    assert sampling["method"] == "seek"
+    assert len(lines) == 50
+    assert all(orjson.loads(line)["id"].startswith("clinvar:") for line in lines)
+    assert sampling["total_lines"] == pytest.approx(2000, rel=0.2)
+
+
+def test_scan_sampling_of_single_member_input(tmp_path, records):
+    inputfile = write_clinvar_gzip(tmp_path / "variations.jsonl.gz", records * 40)
+    lines, sampling = sample_lines(inputfile, sample_size=30, seed=1)
+
+    assert sampling == {"method": "scan", "total_lines": 200}
+    assert len(lines) == 30
+
+
+def test_counting_dataproxy(dp):
+    counting = CountingDataProxy(dp)
+    counting.get_sequence(f"refseq:{REFERENCE_ACCESSION}", 0, 3)
+    counting.translate_sequence_identifier(f"refseq:{REFERENCE_ACCESSION}", "refseq")
+
+    assert counting.calls == {"get_sequence": 1, "translate_sequence_identifier": 1}
+
+
+def test_estimate_projects_from_sample(tmp_path, dp, records):
+    inputfile = write_block_gzip(tmp_path / "variations.jsonl.gz", records * 200)
+    pipeline = ClinvarTranslationPipeline(dp=dp)
+    estimate = estimate_run(pipeline, inputfile, sample_size=100, workers=4)
+
+    assert estimate["sampling"] == "seek"
+    assert estimate["sampled_lines"] == 100
+    assert set(estimate["seconds_per_line"]) == {
+        "decode",
+        "validate",
+        "translate",
+        "serialize",
+    }
+    assert estimate["dataproxy_calls_per_line"]["translate_sequence_identifier"] > 0
+    assert estimate["memory_bytes_per_record"] > 0
+
+    projection = estimate["projection"]
+    seconds_per_line = sum(estimate["seconds_per_line"].values())
+    assert projection["wall_seconds"] == pytest.approx(
+        estimate["estimated_total_lines"] * seconds_per_line / 4, abs=0.1
+    )
+    assert projection["peak_rss_bytes"] == 4 * (
+        estimate["baseline_rss_bytes"] + estimate["peak_record_bytes"]
+    )
+    assert projection["output_bytes"] > 0
+    # The pipeline's own data proxy is restored afterwards.
+    assert pipeline.vrs_translator.dp is dp
+
+
+@pytest.mark.parametrize(
+    ("platform", "expected"), [("linux", 2048 * 1024), ("darwin", 2048)]
+)
+def test_peak_rss_units_follow_platform(monkeypatch, platform, expected):
+    fake_resource = SimpleNamespace(
+        RUSAGE_SELF=0, getrusage=lambda who: SimpleNamespace(ru_maxrss=2048)
+    )
+    monkeypatch.setitem(sys.modules, "resource", fake_resource)
+    monkeypatch.setattr(sys, "platform", platform)
+    assert _peak_rss_bytes() == expected
+
+
+def test_peak_rss_without_resource_module(monkeypatch):
+    monkeypatch.setitem(sys.modules, "resource", None)
+    assert _peak_rss_bytes() == 0
@@ -0,0 +1,141 @@
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline
+from pipelines.incremental import (
+    IncrementalClinvarPipeline,
+    PriorRunIndex,
+    splice_line_number,
+)
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    lse_member,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def releases(dp):
+    refget = dp.refget_accession(REFERENCE_ACCESSION)
+    previous = clinvar_records(refget)
+
+    current = [record for record in previous if record["id"] != "clinvar:1005"]
+    current[2] = {
+        **current[2],
+        "members": current[2]["members"] + [lse_member(refget, 20, 21, "C")],
+    }
+    current.insert(
+        0, {"id": "clinvar:1006", "members": [lse_member(refget, 40, 41, "T")]}
+    )
+    return previous, current
+
+
+def read_jsonl(path):
+    return [orjson.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def run_incremental(tmp_path, dp, records, name, prior=None):
+    inputfile = write_clinvar_gzip(tmp_path / f"{name}.jsonl.gz", records)
+    return IncrementalClinvarPipeline(dp=dp).run_incremental(
+        inputfile=inputfile,
+        outputfile=tmp_path / f"{name}_translations.jsonl",
+        delta_path=tmp_path / f"{name}_delta.jsonl",
+        invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+        prior=prior,
+        tombstone_path=tmp_path / f"{name}_tombstones.jsonl",
+        stats_path=tmp_path / f"{name}_stats.json",
+    )
+
+
+def test_incremental_run_matches_full_run(tmp_path, monkeypatch, dp, releases):
+    monkeypatch.chdir(tmp_path)
+    previous, current = releases
+    run_incremental(tmp_path, dp, previous, "previous")
+
+    dp.calls.clear()
+    with PriorRunIndex(tmp_path / "previous_translations.jsonl") as prior:
+        summary = run_incremental(tmp_path, dp, current, "current", prior=prior)
+    incremental_calls = sum(dp.calls.values())
+
+    ClinvarTranslationPipeline(dp=dp).run(
+        inputfile=write_clinvar_gzip(tmp_path / "full.jsonl.gz", current),
+        outputfile=tmp_path / "full_translations.jsonl",
+        invalid_allele_path=tmp_path / "full_invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "full_invalid_fhir.jsonl",
+    )
+
+    assert read_jsonl(tmp_path / "current_translations.jsonl") == read_jsonl(
+        tmp_path / "full_translations.jsonl"
+    )
+    # Only the two new LiteralSequenceExpression members were translated; the RLE
+    # allele that needs SeqRepo was carried forward.
+    assert incremental_calls == 0
+    assert (
+        summary.records_unchanged,
+        summary.records_changed,
+        summary.records_new,
+        summary.records_removed,
+    ) == (3, 1, 1, 1)
+    assert (summary.members_carried_forward, summary.members_translated) == (3, 2)
+    # Every Allele member is accounted for: the unknown-sequence allele of an unchanged record
+    # failed last time, the member failing validation is in a changed record.
+    assert (summary.members_previously_failed, summary.total_failed) == (1, 1)
+    allele_members = sum(
+        member.get("type") == "Allele"
+        for record in current
+        for member in record["members"]
+    )
+    assert allele_members == (
+        summary.members_carried_forward
+        + summary.members_translated
+        + summary.members_previously_failed
+        + summary.total_failed
+    )
+
+
+def test_delta_and_tombstones(tmp_path, dp, releases):
+    previous, current = releases
+    run_incremental(tmp_path, dp, previous, "previous")
+    with PriorRunIndex(tmp_path / "previous_translations.jsonl") as prior:
+        run_incremental(tmp_path, dp, current, "current", prior=prior)
+
+    delta = read_jsonl(tmp_path / "current_delta.jsonl")
+    assert [row["line"] for row in delta] == [1, 4, 4]
+    assert [row["vrs_allele"]["state"]["sequence"] for row in delta] == ["T", "TT", "C"]
+
+    assert read_jsonl(tmp_path / "current_tombstones.jsonl") == [
+        {"id": "clinvar:1005", "reason": "removed"},
+        {"id": "clinvar:1003", "reason": "changed"},
+    ]
+
+
+def test_prior_index_from_another_translator_version_is_ignored(tmp_path, dp, releases):
+    previous, current = releases
+    run_incremental(tmp_path, dp, previous, "previous")
+
+    with PriorRunIndex(
+        tmp_path / "previous_translations.jsonl", stamp="fhir.moldef=0.0.0"
+    ) as prior:
+        assert prior.stale
+        summary = run_incremental(tmp_path, dp, current, "current", prior=prior)
+
+    assert (summary.records_unchanged, summary.records_new) == (0, 5)
+    assert summary.members_carried_forward == 0
+    assert summary.members_translated == 5
+
+
+def test_splice_line_number_keeps_remaining_bytes():
+    record = orjson.dumps({"line": 7, "vrs_allele": {"id": "x"}, "fhir_allele": {}})
+    spliced = splice_line_number(record + b"\n", 12)
+
+    assert spliced.endswith(record[record.index(b",") :] + b"\n")
+    assert orjson.loads(spliced)["line"] == 12
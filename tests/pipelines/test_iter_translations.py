@@ -0,0 +1,97 @@
+import itertools
+
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    lse_member,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def records(dp):
+    return clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+
+
+@pytest.mark.parametrize(
+    "encode", [orjson.dumps, lambda r: orjson.dumps(r).decode(), dict]
+)
+def test_accepts_lines_or_records(dp, records, encode):
+    results = list(
+        ClinvarTranslationPipeline(dp=dp).iter_translations(
+            [encode(record) for record in records]
+        )
+    )
+
+    assert [(result.line, result.kind) for result in results] == [
+        (1, "translated"),
+        (2, "translated"),
+        (3, "translated"),
+        (3, "invalid_allele"),
+        (4, "invalid_fhir"),
+        (5, "translated"),
+    ]
+    assert results[1].state_type == "ReferenceLengthExpression"
+    assert (
+        results[1].record["vrs_allele"]["state"]["type"] == "ReferenceLengthExpression"
+    )
+    assert results[1].record["fhir_allele"]["representation"][0]["literal"][
+        "value"
+    ] == ("CAG" * 6)
+
+
+def test_results_match_run_output(tmp_path, monkeypatch, dp, records):
+    monkeypatch.chdir(tmp_path)
+    inputfile = write_clinvar_gzip(
+        tmp_path / "variations.jsonl.gz", records, malformed_lines=1
+    )
+    ClinvarTranslationPipeline(dp=dp).run(
+        inputfile=inputfile,
+        outputfile=tmp_path / "translations.jsonl",
+        invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+    )
+
+    lines = [orjson.dumps(record) for record in records] + [b"{not json"]
+    by_kind = {}
+    for result in ClinvarTranslationPipeline(dp=dp).iter_translations(lines):
+        by_kind.setdefault(result.kind, []).append(result.record)
+
+    assert by_kind["decode_error"] == [None]
+    for kind, path in (
+        ("translated", "translations.jsonl"),
+        ("invalid_allele", "invalid_alleles.jsonl"),
+        ("invalid_fhir", "invalid_fhir.jsonl"),
+    ):
+        assert by_kind[kind] == [
+            orjson.loads(line) for line in (tmp_path / path).read_bytes().splitlines()
+        ]
+
+
+def test_consumes_source_lazily(dp):
+    refget = dp.refget_accession(REFERENCE_ACCESSION)
+    pulled = []
+
+    def endless():
+        for i in itertools.count():
+            pulled.append(i)
+            yield {"id": f"clinvar:{i}", "members": [lse_member(refget, 4, 5, "A")]}
+
+    results = ClinvarTranslationPipeline(dp=dp).iter_translations(
+        endless(), first_line=100
+    )
+    first_three = list(itertools.islice(results, 3))
+
+    assert [result.line for result in first_three] == [100, 101, 102]
+    assert len(pulled) == 3
@@ -0,0 +1,162 @@
+from functools import partial
+
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline, load_summary
+from pipelines.multi_file import (
+    MultiFileTranslationJob,
+    build_pipeline,
+    close_pipeline,
+    expand_inputs,
+    output_stem,
+    schedule_inputs,
+)
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+from translators.translation_cache import TranslationCache
+from vrs_tools.alias_index import AliasIndexDataProxy, write_alias_index
+from vrs_tools.dataproxy import NegativeCacheDataProxy, PersistentCacheDataProxy
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def inputs(tmp_path, dp):
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    input_dir = tmp_path / "inputs"
+    input_dir.mkdir()
+    return [
+        write_clinvar_gzip(input_dir / "small.jsonl.gz", records),
+        write_clinvar_gzip(input_dir / "large.jsonl.gz", records * 20),
+        write_clinvar_gzip(input_dir / "medium.jsonl.gz", records * 5),
+    ]
+
+
+def test_expand_inputs_and_schedule_largest_first(tmp_path, inputs):
+    files = expand_inputs([str(tmp_path / "inputs" / "*.jsonl.gz"), str(inputs[0])])
+
+    assert len(files) == 3
+    assert [path.name for path in schedule_inputs(files)] == [
+        "large.jsonl.gz",
+        "medium.jsonl.gz",
+        "small.jsonl.gz",
+    ]
+    assert output_stem(inputs[1]) == "large"
+    with pytest.raises(FileNotFoundError):
+        expand_inputs([str(tmp_path / "missing-*.jsonl.gz")])
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_job_writes_per_file_and_aggregate_summaries(tmp_path, dp, inputs, workers):
+    job = MultiFileTranslationJob(
+        ClinvarTranslationPipeline(dp=dp), output_dir=tmp_path / "out", workers=workers
+    )
+    summary = job.run([str(tmp_path / "inputs" / "*.jsonl.gz")])
+
+    per_file = {
+        stem: load_summary(tmp_path / "out" / f"{stem}_runtime_stats.txt")
+        for stem in ("small", "medium", "large")
+    }
+    assert [s.total_translated for s in per_file.values()] == [4, 20, 80]
+    assert summary.file_names == ["large.jsonl.gz", "medium.jsonl.gz", "small.jsonl.gz"]
+    assert summary.total_translated == 104
+    assert summary.total_failed == sum(s.total_failed for s in per_file.values())
+    assert summary.vrs_allele_types["rle_count"] == 26
+    assert summary.failed_files == {}
+
+    written = orjson.loads((tmp_path / "out" / "job_summary.json").read_bytes())
+    assert written["total_translated"] == 104
+    assert written["workers"] == workers
+    assert len((tmp_path / "out" / "large.jsonl").read_bytes().splitlines()) == 80
+
+
+def in_memory_pipeline(sequences):
+    return ClinvarTranslationPipeline(dp=InMemoryDataProxy(sequences))
+
+
+def test_process_workers_match_thread_workers(tmp_path, dp, inputs):
+    threaded = MultiFileTranslationJob(
+        ClinvarTranslationPipeline(dp=dp), output_dir=tmp_path / "threads", workers=2
+    ).run([str(tmp_path / "inputs" / "*.jsonl.gz")])
+    factory = partial(in_memory_pipeline, {REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+    processes = MultiFileTranslationJob(
+        output_dir=tmp_path / "processes", workers=2, pipeline_factory=factory
+    ).run([str(tmp_path / "inputs" / "*.jsonl.gz")])
+
+    assert (processes.worker_kind, threaded.worker_kind) == ("process", "thread")
+    assert processes.total_translated == threaded.total_translated == 104
+    for stem in ("small", "medium", "large"):
+        assert (tmp_path / "processes" / f"{stem}.jsonl").read_bytes() == (
+            tmp_path / "threads" / f"{stem}.jsonl"
+        ).read_bytes()
+
+
+def test_process_workers_share_cache_files(tmp_path, dp, inputs):
+    alias_index = tmp_path / "aliases.idx"
+    write_alias_index(
+        alias_index, [(dp.refget_accession(REFERENCE_ACCESSION), REFERENCE_ACCESSION)]
+    )
+    factory = partial(
+        build_pipeline,
+        translation_cache=tmp_path / "translations.sqlite",
+        dataproxy_cache=tmp_path / "dataproxy.sqlite",
+        seqrepo_snapshot="2024-12-20",
+        alias_index=alias_index,
+        dp=InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE}),
+    )
+    pipeline = factory()
+    layers = pipeline.vrs_translator.dp
+    assert isinstance(layers, AliasIndexDataProxy)
+    assert isinstance(layers.dp, NegativeCacheDataProxy)
+    assert isinstance(layers.dp.dp, PersistentCacheDataProxy)
+    close_pipeline(pipeline)
+
+    threaded = MultiFileTranslationJob(
+        ClinvarTranslationPipeline(dp=dp), output_dir=tmp_path / "threads", workers=3
+    ).run([str(tmp_path / "inputs" / "*.jsonl.gz")])
+    processes = MultiFileTranslationJob(
+        output_dir=tmp_path / "processes", workers=3, pipeline_factory=factory
+    ).run([str(tmp_path / "inputs" / "*.jsonl.gz")])
+
+    assert processes.total_translated == threaded.total_translated == 104
+    assert processes.failed_vrs_to_fhir_translation == (
+        threaded.failed_vrs_to_fhir_translation
+    )
+    for stem in ("small", "medium", "large"):
+        assert (tmp_path / "processes" / f"{stem}.jsonl").read_bytes() == (
+            tmp_path / "threads" / f"{stem}.jsonl"
+        ).read_bytes()
+    with TranslationCache(tmp_path / "translations.sqlite") as cache:
+        assert len(cache) == 4
+
+
+def test_failed_file_does_not_stop_the_job(tmp_path, dp, inputs):
+    (tmp_path / "inputs" / "broken.jsonl.gz").write_bytes(b"not gzip")
+    job = MultiFileTranslationJob(
+        ClinvarTranslationPipeline(dp=dp), output_dir=tmp_path / "out", workers=2
+    )
+    summary = job.run([str(tmp_path / "inputs" / "*.jsonl.gz")])
+
+    assert list(summary.failed_files) == ["broken.jsonl.gz"]
+    assert summary.total_translated == 104
+
+
+def test_duplicate_input_names_are_rejected(tmp_path, dp, inputs):
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "small.jsonl.gz").write_bytes(inputs[0].read_bytes())
+    job = MultiFileTranslationJob(
+        ClinvarTranslationPipeline(dp=dp), output_dir=tmp_path / "out"
+    )
+
+    with pytest.raises(ValueError, match="distinct names"):
+        job.run([str(inputs[0]), str(other / "small.jsonl.gz")])
@@ -0,0 +1,119 @@
+import multiprocessing
+
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import (
+    ClinvarTranslationPipeline,
+    load_summary,
+    merge_summaries,
+    parse_partition,
+)
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+NUM_PARTITIONS = 3
+
+
+@pytest.fixture
+def clinvar_input(tmp_path):
+    dp = InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    return write_clinvar_gzip(
+        tmp_path / "variations.jsonl.gz", records, malformed_lines=2
+    )
+
+
+def run_partition(tmp_path, inputfile, name, partition=None, partition_by="line"):
+    dp = InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+    ClinvarTranslationPipeline(dp=dp).run(
+        inputfile=inputfile,
+        outputfile=tmp_path / f"{name}.jsonl",
+        invalid_allele_path=tmp_path / f"{name}_invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / f"{name}_invalid_fhir.jsonl",
+        partition=partition,
+        partition_by=partition_by,
+        stats_path=tmp_path / f"{name}_stats.json",
+    )
+
+
+def read_lines(tmp_path, names, suffix):
+    return sorted(
+        line
+        for name in names
+        for line in (tmp_path / f"{name}{suffix}").read_bytes().splitlines()
+    )
+
+
+@pytest.mark.parametrize("partition_by", ["line", "id"])
+def test_partition_processes_union_matches_single_run(
+    tmp_path, clinvar_input, partition_by
+):
+    run_partition(tmp_path, clinvar_input, "single")
+
+    ctx = multiprocessing.get_context("fork")
+    names = [f"part{i}" for i in range(NUM_PARTITIONS)]
+    processes = [
+        ctx.Process(
+            target=run_partition,
+            args=(tmp_path, clinvar_input, name, (i, NUM_PARTITIONS), partition_by),
+        )
+        for i, name in enumerate(names)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    for suffix in (".jsonl", "_invalid_alleles.jsonl", "_invalid_fhir.jsonl"):
+        assert read_lines(tmp_path, names, suffix) == read_lines(
+            tmp_path, ["single"], suffix
+        )
+
+    lines_per_partition = [
+        {orjson.loads(line)["line"] for line in read_lines(tmp_path, [name], ".jsonl")}
+        for name in names
+    ]
+    assert sum(len(lines) for lines in lines_per_partition) == len(
+        set().union(*lines_per_partition)
+    )
+
+    merged = merge_summaries(
+        [load_summary(tmp_path / f"{name}_stats.json") for name in names]
+    )
+    single = load_summary(tmp_path / "single_stats.json")
+    for field in (
+        "file_name",
+        "total_lines_read",
+        "vrs_allele_seen",
+        "vrs_allele_types",
+        "total_translated",
+        "failed_vrs_allele_validation",
+        "failed_vrs_to_fhir_translation",
+        "total_failed",
+    ):
+        assert getattr(merged, field) == getattr(single, field)
+    assert merged.total_lines_read == 7
+
+
+def test_parse_partition():
+    assert parse_partition("2/4") == (2, 4)
+    for value in ("4/4", "-1/4", "1", "a/b"):
+        with pytest.raises(Exception, match="Invalid partition"):
+            parse_partition(value)
+
+
+def test_merge_rejects_mixed_inputs(tmp_path, clinvar_input):
+    run_partition(tmp_path, clinvar_input, "single")
+    summary = load_summary(tmp_path / "single_stats.json")
+    other = load_summary(tmp_path / "single_stats.json")
+    other.file_name = "other.jsonl.gz"
+
+    with pytest.raises(ValueError):
+        merge_summaries([summary, other])
@@ -0,0 +1,119 @@
+import io
+
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline, load_summary
+from pipelines.progress import ProgressReporter
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    lse_member,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_percent_rates_and_eta():
+    clock = FakeClock()
+    offset = {"value": 0}
+    stream = io.StringIO()
+    reporter = ProgressReporter(
+        total_bytes=1000,
+        offset_fn=lambda: offset["value"],
+        interval=10,
+        window=60,
+        stream=stream,
+        clock=clock,
+    )
+
+    for _ in range(50):
+        reporter.record("translated")
+    reporter.record("invalid_fhir")
+    clock.now, offset["value"] = 10.0, 250
+    reporter.tick()
+
+    status = reporter.snapshot()
+    assert status["percent"] == 25.0
+    assert status["eta_seconds"] == 30.0
+    assert status["rates_per_second"] == {
+        "translated": 5.0,
+        "invalid_allele": 0.0,
+        "invalid_fhir": 0.1,
+        "quarantined": 0.0,
+    }
+    assert stream.getvalue().startswith("[progress] 25.0%")
+
+
+def test_rates_use_rolling_window():
+    clock = FakeClock()
+    offset = {"value": 0}
+    reporter = ProgressReporter(
+        total_bytes=1000,
+        offset_fn=lambda: offset["value"],
+        interval=1000,
+        window=20,
+        stream=None,
+        clock=clock,
+    )
+    for second in range(1, 61):
+        clock.now = float(second)
+        offset["value"] += 10
+        if second <= 30:
+            reporter.record("translated")
+        reporter.snapshot()
+
+    # Nothing was translated in the last 30 seconds, so the windowed rate has dropped to zero.
+    status = reporter.snapshot()
+    assert status["rates_per_second"]["translated"] == 0.0
+    assert status["eta_seconds"] == pytest.approx(40.0)
+
+
+def test_pipeline_writes_status_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dp = InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+    refget = dp.refget_accession(REFERENCE_ACCESSION)
+    records = clinvar_records(refget)
+    oversized = {
+        "id": "clinvar:oversized",
+        "members": [lse_member(refget, 4, 5, "ACGT" * 50)],
+    }
+    inputfile = write_clinvar_gzip(
+        tmp_path / "variations.jsonl.gz", records * 20 + [oversized]
+    )
+    status_path = tmp_path / "status.json"
+
+    stream = io.StringIO()
+    progress = ProgressReporter(interval=0, stream=stream, status_path=status_path)
+    ClinvarTranslationPipeline(dp=dp, max_sequence_length=100).run(
+        inputfile=inputfile,
+        outputfile=tmp_path / "translations.jsonl",
+        invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+        progress=progress,
+    )
+
+    status = orjson.loads(status_path.read_bytes())
+    summary = load_summary("runtime_stats.txt")
+    assert status["done"] is True
+    assert status["percent"] == 100.0
+    assert status["total_bytes"] == inputfile.stat().st_size
+    assert status["lines_read"] == summary.total_lines_read
+    assert status["counts"] == {
+        "translated": summary.total_translated,
+        "invalid_allele": summary.failed_vrs_allele_validation,
+        "invalid_fhir": summary.failed_vrs_to_fhir_translation,
+        "quarantined": summary.quarantined,
+    }
+    assert summary.quarantined == 1
+    assert "quarantined=1 " in stream.getvalue().splitlines()[-1]
+    assert len(stream.getvalue().splitlines()) > 1
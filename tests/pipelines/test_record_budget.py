@@ -0,0 +1,104 @@
+import time
+
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline, load_summary
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    lse_member,
+    rle_member,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+def test_oversized_members_are_quarantined_untranslated(dp):
+    refget = dp.refget_accession(REFERENCE_ACCESSION)
+    records = [
+        {"id": "clinvar:1", "members": [lse_member(refget, 4, 5, "A")]},
+        {"id": "clinvar:2", "members": [lse_member(refget, 4, 5, "ACGT" * 50)]},
+        {"id": "clinvar:3", "members": [rle_member(refget, 6, 9, 10_000_000, 3)]},
+    ]
+    pipeline = ClinvarTranslationPipeline(dp=dp, max_sequence_length=100)
+    translate_to_dict = pipeline.vrs_translator.translate_to_dict
+    translated = []
+
+    def spy(vo):
+        translated.append(vo)
+        return translate_to_dict(vo)
+
+    pipeline.vrs_translator.translate_to_dict = spy
+    results = list(pipeline.iter_translations(records))
+
+    assert [(result.line, result.kind) for result in results] == [
+        (1, "translated"),
+        (2, "quarantined"),
+        (3, "quarantined"),
+    ]
+    assert [result.record["sequence_length"] for result in results[1:]] == [
+        200,
+        10_000_000,
+    ]
+    assert {result.record["reason"] for result in results[1:]} == {"size"}
+    assert results[2].record["vrs_allele"] == records[2]["members"][0]
+    assert len(translated) == 1
+
+
+def test_slow_members_are_quarantined_with_timing(tmp_path, monkeypatch, dp):
+    monkeypatch.chdir(tmp_path)
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    inputfile = write_clinvar_gzip(tmp_path / "variations.jsonl.gz", records)
+
+    pipeline = ClinvarTranslationPipeline(dp=dp, time_budget=0.05)
+    translate_to_dict = pipeline.vrs_translator.translate_to_dict
+
+    def slow_on_rle(vo):
+        if vo.state.type == "ReferenceLengthExpression":
+            time.sleep(0.1)
+        return translate_to_dict(vo)
+
+    pipeline.vrs_translator.translate_to_dict = slow_on_rle
+    pipeline.run(
+        inputfile=inputfile,
+        outputfile=tmp_path / "translations.jsonl",
+        invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+        quarantine_path=tmp_path / "quarantined.jsonl",
+    )
+
+    quarantined = [
+        orjson.loads(line)
+        for line in (tmp_path / "quarantined.jsonl").read_bytes().splitlines()
+    ]
+    translated = (tmp_path / "translations.jsonl").read_bytes().splitlines()
+    summary = load_summary("runtime_stats.txt")
+
+    assert [entry["line"] for entry in quarantined] == [2]
+    assert quarantined[0]["reason"] == "time"
+    assert quarantined[0]["seconds"] >= 0.1
+    assert "fhir_allele" in quarantined[0]
+    assert (summary.quarantined, summary.total_translated) == (1, 3)
+    assert len(translated) == 3
+    assert summary.total_failed == 2
+
+
+def test_no_quarantine_without_budget(tmp_path, monkeypatch, dp):
+    monkeypatch.chdir(tmp_path)
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    ClinvarTranslationPipeline(dp=dp).run(
+        inputfile=write_clinvar_gzip(tmp_path / "variations.jsonl.gz", records),
+        outputfile=tmp_path / "translations.jsonl",
+        invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+    )
+
+    assert not (tmp_path / "quarantined_alleles.jsonl").exists()
+    assert load_summary("runtime_stats.txt").quarantined == 0
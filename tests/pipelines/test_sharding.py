@@ -0,0 +1,90 @@
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline
+from pipelines.sharding import (
+    ShardedJsonlWriter,
+    read_manifest,
+    shard_for,
+    shard_key,
+    verify_manifest,
+)
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def clinvar_input(tmp_path, dp):
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    return write_clinvar_gzip(tmp_path / "variations.jsonl.gz", records)
+
+
+def run_pipeline(tmp_path, dp, inputfile, name, num_shards=None):
+    pipeline = ClinvarTranslationPipeline(dp=dp)
+    kwargs = dict(
+        inputfile=inputfile,
+        outputfile=tmp_path / f"{name}.jsonl",
+        invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+    )
+    if num_shards is None:
+        pipeline.run(**kwargs)
+        return None
+    with ShardedJsonlWriter(tmp_path / name, num_shards) as writer:
+        pipeline.run(**kwargs, sharded_writer=writer)
+    return read_manifest(tmp_path / name)
+
+
+def test_shards_partition_single_file_output(tmp_path, monkeypatch, dp, clinvar_input):
+    monkeypatch.chdir(tmp_path)
+    run_pipeline(tmp_path, dp, clinvar_input, "single")
+    manifest = run_pipeline(tmp_path, dp, clinvar_input, "sharded", num_shards=3)
+
+    assert not (tmp_path / "sharded.jsonl").exists()
+    single = sorted((tmp_path / "single.jsonl").read_bytes().splitlines())
+    sharded = []
+    for shard in manifest["shards"]:
+        lines = shard["path"].read_bytes().splitlines()
+        assert {
+            shard_for(shard_key(orjson.loads(line)["vrs_allele"]), 3) for line in lines
+        } <= {shard["shard"]}
+        sharded.extend(lines)
+
+    assert sorted(sharded) == single
+    assert manifest["total_records"] == 4
+    verify_manifest(tmp_path / "sharded")
+
+
+def test_sharding_is_deterministic(tmp_path, monkeypatch, dp, clinvar_input):
+    monkeypatch.chdir(tmp_path)
+    first = run_pipeline(tmp_path, dp, clinvar_input, "first", num_shards=4)
+    second = run_pipeline(tmp_path, dp, clinvar_input, "second", num_shards=4)
+
+    assert [shard.pop("path").name for shard in first["shards"]] == [
+        shard.pop("path").name for shard in second["shards"]
+    ]
+    assert first == second
+    assert shard_for("ga4gh:VA.example-1001", 4) == shard_for(
+        "ga4gh:VA.example-1001", 4
+    )
+
+
+def test_verify_manifest_detects_corruption(tmp_path):
+    with ShardedJsonlWriter(tmp_path, 2) as writer:
+        writer.write("ga4gh:VA.a", b'{"line":1}\n')
+        writer.write("ga4gh:VA.b", b'{"line":2}\n')
+
+    path = next(s["path"] for s in read_manifest(tmp_path)["shards"] if s["records"])
+    path.write_bytes(path.read_bytes() + b'{"line":3}\n')
+    with pytest.raises(ValueError):
+        verify_manifest(tmp_path)
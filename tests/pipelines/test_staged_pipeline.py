@@ -0,0 +1,168 @@
+import threading
+import time
+
+import orjson
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline, load_summary
+from pipelines.staged_translate import StagedClinvarTranslationPipeline
+from pipelines.stages import Stage, StagedPipeline
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+
+def make_dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def clinvar_input(tmp_path):
+    records = clinvar_records(make_dp().refget_accession(REFERENCE_ACCESSION))
+    return write_clinvar_gzip(
+        tmp_path / "variations.jsonl.gz", records * 10, malformed_lines=2
+    )
+
+
+def outputs(tmp_path, name):
+    return [
+        (tmp_path / f"{name}{suffix}").read_bytes()
+        for suffix in (".jsonl", "_invalid_alleles.jsonl", "_invalid_fhir.jsonl")
+    ]
+
+
+def jittered_square(item):
+    time.sleep((item % 7) / 5000)
+    return item * item
+
+
+def test_staged_pipeline_preserves_order():
+    staged = StagedPipeline(
+        [
+            Stage("square", jittered_square, workers=4),
+            Stage("negate", lambda item: -item, workers=2),
+        ],
+        queue_size=4,
+    )
+
+    assert list(staged.run(range(200))) == [-(i * i) for i in range(200)]
+    assert staged.stats["square"].items == staged.stats["negate"].items == 200
+    assert all(stats.max_queue_depth <= 4 for stats in staged.stats.values())
+
+
+def test_staged_pipeline_applies_backpressure():
+    produced = []
+    release = threading.Event()
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    def blocked(item):
+        release.wait()
+        return item
+
+    staged = StagedPipeline([Stage("blocked", blocked)], queue_size=2)
+    results = staged.run(source())
+    consumer = threading.Thread(target=lambda: produced.append(list(results)))
+    consumer.start()
+    time.sleep(0.3)
+
+    # One item in flight plus a full queue; the source is not drained ahead of the stage.
+    assert len(produced) <= 4
+    release.set()
+    consumer.join()
+    assert produced[-1] == list(range(100))
+
+
+def test_staged_pipeline_bounds_the_reorder_buffer():
+    produced = []
+    release = threading.Event()
+
+    def source():
+        for i in range(200):
+            produced.append(i)
+            yield i
+
+    def slow_first(item):
+        if item == 0:
+            release.wait()
+        return item
+
+    staged = StagedPipeline([Stage("slow", slow_first, workers=4)], queue_size=8)
+    results = staged.run(source())
+    consumer = threading.Thread(target=lambda: produced.append(list(results)))
+    consumer.start()
+    time.sleep(0.3)
+    ahead = len(produced)
+    release.set()
+    consumer.join()
+
+    # Items behind the stalled one finish, but only a window of `queue_size` is let in.
+    assert ahead <= 9
+    assert produced[-1] == list(range(200))
+    assert staged.max_reorder_depth <= 8
+
+
+def test_staged_pipeline_propagates_errors():
+    def fail_on_three(item):
+        if item == 3:
+            raise RuntimeError("boom")
+        return item
+
+    staged = StagedPipeline([Stage("fail", fail_on_three, workers=2)], queue_size=2)
+    with pytest.raises(RuntimeError, match="boom"):
+        list(staged.run(range(100)))
+
+
+@pytest.mark.parametrize(
+    "stage_config",
+    [
+        {"translate": ("thread", 4)},
+        {"decode": ("thread", 2), "validate": ("process", 2)},
+    ],
+)
+def test_staged_run_matches_sequential_run(tmp_path, clinvar_input, stage_config):
+    ClinvarTranslationPipeline(dp=make_dp()).run(
+        inputfile=clinvar_input,
+        outputfile=tmp_path / "single.jsonl",
+        invalid_allele_path=tmp_path / "single_invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "single_invalid_fhir.jsonl",
+        stats_path=tmp_path / "single_stats.json",
+    )
+
+    pipeline = StagedClinvarTranslationPipeline(
+        dp=make_dp(), stage_config=stage_config, queue_size=8
+    )
+    summary = pipeline.run_staged(
+        inputfile=clinvar_input,
+        outputfile=tmp_path / "staged.jsonl",
+        invalid_allele_path=tmp_path / "staged_invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "staged_invalid_fhir.jsonl",
+        stats_path=tmp_path / "staged_stats.json",
+        stage_stats_path=tmp_path / "stage_stats.json",
+    )
+
+    assert outputs(tmp_path, "staged") == outputs(tmp_path, "single")
+    single = load_summary(tmp_path / "single_stats.json")
+    assert (summary.total_lines_read, summary.vrs_allele_types) == (
+        single.total_lines_read,
+        single.vrs_allele_types,
+    )
+    assert (summary.total_translated, summary.total_failed) == (
+        single.total_translated,
+        single.total_failed,
+    )
+    assert summary.unknown_accessions == single.unknown_accessions
+
+    stage_stats = orjson.loads((tmp_path / "stage_stats.json").read_bytes())
+    assert list(stage_stats) == ["decode", "validate", "translate", "serialize"]
+    for stats in stage_stats.values():
+        assert stats["items"] == 52
+        assert 0 <= stats["utilization"] <= 1
+        assert stats["max_queue_depth"] <= 8
@@ -0,0 +1,142 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline, load_summary
+from pipelines.work_queue import (
+    WorkQueueWorker,
+    collect_work_queue,
+    plan_work_queue,
+)
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+
+
+def make_pipeline():
+    return ClinvarTranslationPipeline(
+        dp=InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+    )
+
+
+@pytest.fixture
+def clinvar_input(tmp_path):
+    dp = InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    return write_clinvar_gzip(
+        tmp_path / "variations.jsonl.gz", records * 3, malformed_lines=1
+    )
+
+
+@pytest.fixture
+def single_run(tmp_path, clinvar_input):
+    make_pipeline().run(
+        inputfile=clinvar_input,
+        outputfile=tmp_path / "single.jsonl",
+        invalid_allele_path=tmp_path / "single_invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "single_invalid_fhir.jsonl",
+        stats_path=tmp_path / "single_stats.json",
+    )
+    return tmp_path
+
+
+def collect(tmp_path, queue_dir):
+    return collect_work_queue(
+        queue_dir,
+        outputfile=tmp_path / "queue.jsonl",
+        invalid_allele_path=tmp_path / "queue_invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "queue_invalid_fhir.jsonl",
+        stats_path=tmp_path / "queue_stats.json",
+    )
+
+
+def assert_matches_single_run(tmp_path, merged):
+    for suffix in (".jsonl", "_invalid_alleles.jsonl", "_invalid_fhir.jsonl"):
+        assert (tmp_path / f"queue{suffix}").read_bytes() == (
+            tmp_path / f"single{suffix}"
+        ).read_bytes()
+    single = load_summary(tmp_path / "single_stats.json")
+    assert (merged.total_lines_read, merged.total_translated, merged.total_failed) == (
+        single.total_lines_read,
+        single.total_translated,
+        single.total_failed,
+    )
+
+
+def work(queue_dir, worker_id):
+    WorkQueueWorker(
+        queue_dir, pipeline=make_pipeline(), worker_id=worker_id, poll_interval=0.05
+    ).run()
+
+
+def test_plan_splits_on_line_boundaries(tmp_path, clinvar_input):
+    plan = plan_work_queue(clinvar_input, tmp_path / "queue", chunk_bytes=1500)
+
+    chunks = plan["chunks"]
+    assert len(chunks) > 1
+    assert chunks[0]["first_line"] == 1
+    assert sum(chunk["num_lines"] for chunk in chunks) == 16
+    for previous, chunk in zip(chunks, chunks[1:], strict=False):
+        assert chunk["first_line"] == previous["first_line"] + previous["num_lines"]
+        assert chunk["start_byte"] == previous["end_byte"]
+
+
+def test_workers_in_separate_processes_match_single_run(
+    tmp_path, clinvar_input, single_run
+):
+    queue_dir = tmp_path / "queue"
+    plan = plan_work_queue(clinvar_input, queue_dir, chunk_bytes=1500)
+
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=work, args=(queue_dir, f"worker-{i}")) for i in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert len(list((queue_dir / "done").iterdir())) == len(plan["chunks"])
+    assert not list((queue_dir / "leases").iterdir())
+    assert_matches_single_run(tmp_path, collect(tmp_path, queue_dir))
+
+
+def test_expired_lease_is_reclaimed(tmp_path, clinvar_input, single_run):
+    queue_dir = tmp_path / "queue"
+    plan = plan_work_queue(clinvar_input, queue_dir, chunk_bytes=1500)
+    dead = WorkQueueWorker(queue_dir, pipeline=make_pipeline(), worker_id="dead")
+    assert dead.try_claim(plan["chunks"][0]) is not None
+
+    live = WorkQueueWorker(
+        queue_dir, pipeline=make_pipeline(), worker_id="live", lease_seconds=60
+    )
+    assert live.try_claim(plan["chunks"][0]) is None
+    assert live.run(wait=False) == [chunk["chunk"] for chunk in plan["chunks"][1:]]
+    with pytest.raises(ValueError):
+        collect(tmp_path, queue_dir)
+
+    stale = time.time() - 120
+    os.utime(dead._lease_path(plan["chunks"][0]), (stale, stale))
+    assert live.run(wait=False) == [0]
+    assert_matches_single_run(tmp_path, collect(tmp_path, queue_dir))
+
+
+def test_lost_lease_discards_outputs(tmp_path, clinvar_input):
+    queue_dir = tmp_path / "queue"
+    plan = plan_work_queue(clinvar_input, queue_dir, chunk_bytes=1500)
+    chunk = plan["chunks"][0]
+    worker = WorkQueueWorker(queue_dir, pipeline=make_pipeline())
+
+    token = worker.try_claim(chunk)
+    worker._lease_path(chunk).write_bytes(b"someone-else")
+
+    assert worker.process(chunk, token) is False
+    assert not worker.is_done(chunk)
+    assert not list((queue_dir / "outputs").iterdir())
@@ -0,0 +1,116 @@
+import json
+import tracemalloc
+from copy import deepcopy
+
+import pytest
+
+from profiles.allele import Allele as FhirAllele
+from profiles.allele_view import AlleleView
+from tests.translations.examples.allele_test_data import fhir_synthetic_data
+
+
+@pytest.fixture
+def fhir_allele_data():
+    return deepcopy(fhir_synthetic_data)
+
+
+@pytest.fixture
+def fhir_allele_instance(fhir_allele_data):
+    return FhirAllele(**fhir_allele_data)
+
+
+def test_view_exposes_core_fields(fhir_allele_data):
+    view = AlleleView.from_json(fhir_allele_data)
+
+    assert view.refget_accession == "SQ.cQvw4UsHHRRlogxbWCB8W-mKD4AraM9y"
+    assert view.refseq_accession is None
+    assert (view.start, view.end) == (599, 600)
+    assert view.allele_state == "E"
+    assert (
+        "https://w3id.org/ga4gh/schema/vrs/2.0.1/json/Allele#properties/id",
+        "ga4gh:VA.j4XnsLZcdzDIYa5pvvXM7t1wn9OITr0L",
+    ) in view.identifiers
+
+
+def test_view_refseq_accession_from_contained_sequence():
+    data = {
+        "resourceType": "MolecularDefinition",
+        "contained": [
+            {
+                "resourceType": "MolecularDefinition",
+                "id": "ref-to-nc000002",
+                "moleculeType": {"coding": [{"code": "dna"}]},
+                "representation": [
+                    {
+                        "code": [
+                            {
+                                "coding": [
+                                    {
+                                        "system": "http://www.ncbi.nlm.nih.gov/refseq",
+                                        "code": "NC_000002.12",
+                                    }
+                                ]
+                            }
+                        ]
+                    }
+                ],
+            }
+        ],
+        "location": [
+            {
+                "sequenceLocation": {
+                    "coordinateInterval": {
+                        "startQuantity": {"value": 27453448.0},
+                        "endQuantity": {"value": 27453449.0},
+                    }
+                }
+            }
+        ],
+        "representation": [
+            {"focus": {"coding": [{"code": "allele-state"}]}, "literal": {"value": "T"}}
+        ],
+    }
+
+    view = AlleleView.from_json(json.dumps(data).encode())
+    assert view.refseq_accession == "NC_000002.12"
+    assert (view.start, view.end, view.allele_state) == (27453448, 27453449, "T")
+
+
+def test_view_from_model_matches_from_json(fhir_allele_data, fhir_allele_instance):
+    assert AlleleView.from_model(fhir_allele_instance) == AlleleView.from_json(
+        fhir_allele_data
+    )
+
+
+def test_view_promotes_back_to_model(fhir_allele_instance):
+    promoted = AlleleView.from_model(fhir_allele_instance).to_model()
+
+    assert isinstance(promoted, FhirAllele)
+    assert promoted.model_dump(exclude_none=True) == fhir_allele_instance.model_dump(
+        exclude_none=True
+    )
+
+
+def test_view_is_read_only(fhir_allele_data):
+    view = AlleleView.from_json(fhir_allele_data)
+    with pytest.raises(AttributeError):
+        view.start = 0
+    with pytest.raises(AttributeError):
+        view.extra = "value"
+
+
+def _traced_size(factory, count=50):
+    tracemalloc.start()
+    try:
+        items = [factory() for _ in range(count)]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(items) == count
+    return size
+
+
+def test_view_memory_reduction(fhir_allele_data):
+    model_size = _traced_size(lambda: FhirAllele(**fhir_allele_data))
+    view_size = _traced_size(lambda: AlleleView.from_json(fhir_allele_data))
+    assert model_size >= 10 * view_size
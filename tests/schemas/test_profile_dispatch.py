@@ -0,0 +1,142 @@
+import json
+from copy import deepcopy
+
+import pytest
+
+from exceptions.fhir import MissingAlleleState, UnknownProfileError
+from profiles.allele import Allele as FhirAllele
+from profiles.dispatch import ProfileDispatcher, detect_profile
+from profiles.sequence import Sequence as FhirSequence
+from profiles.variation import Variation as FhirVariation
+from tests.translations.examples.allele_test_data import fhir_synthetic_data
+
+FOCUS_SYSTEM = "http://hl7.org/fhir/uv/molecular-definition-data-types/CodeSystem/molecular-definition-focus"
+
+
+@pytest.fixture
+def valid_sequence():
+    return {
+        "resourceType": "MolecularDefinition",
+        "moleculeType": {
+            "coding": [
+                {
+                    "system": "http://hl7.org/fhir/sequence-type",
+                    "code": "dna",
+                    "display": "DNA Sequence",
+                }
+            ]
+        },
+        "representation": [{"literal": {"value": "C"}}],
+    }
+
+
+@pytest.fixture
+def valid_allele():
+    return deepcopy(fhir_synthetic_data)
+
+
+@pytest.fixture
+def valid_variation(valid_allele):
+    data = deepcopy(valid_allele)
+    data.pop("identifier", None)
+    data["representation"] = [
+        {
+            "focus": {
+                "coding": [
+                    {
+                        "system": FOCUS_SYSTEM,
+                        "code": "reference-state",
+                        "display": "Reference State",
+                    }
+                ]
+            },
+            "literal": {"value": "C"},
+        },
+        {
+            "focus": {
+                "coding": [
+                    {
+                        "system": FOCUS_SYSTEM,
+                        "code": "alternative-state",
+                        "display": "Alternative State",
+                    }
+                ]
+            },
+            "literal": {"value": "T"},
+        },
+    ]
+    return data
+
+
+def test_detect_profile(valid_sequence, valid_allele, valid_variation):
+    assert detect_profile(valid_sequence) == "Sequence"
+    assert detect_profile(valid_allele) == "Allele"
+    assert detect_profile(valid_variation) == "Variation"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"resourceType": "MolecularDefinition", "memberState": []},
+        {"resourceType": "MolecularDefinition", "location": [], "representation": []},
+        ["not", "an", "object"],
+    ],
+)
+def test_detect_profile_unknown(data):
+    with pytest.raises(UnknownProfileError):
+        detect_profile(data)
+
+
+def test_dispatch_validates_with_profile_class(
+    valid_sequence, valid_allele, valid_variation
+):
+    dispatcher = ProfileDispatcher()
+    results = [
+        dispatcher.validate(record)
+        for record in (valid_sequence, valid_allele, valid_variation)
+    ]
+
+    assert [name for name, _ in results] == ["Sequence", "Allele", "Variation"]
+    assert isinstance(results[0][1], FhirSequence)
+    assert isinstance(results[1][1], FhirAllele)
+    assert isinstance(results[2][1], FhirVariation)
+    assert dispatcher.counts == {"Sequence": 1, "Allele": 1, "Variation": 1}
+
+
+def test_dispatch_raises_profile_error(valid_allele):
+    data = deepcopy(valid_allele)
+    data["representation"].append(deepcopy(data["representation"][0]))
+
+    dispatcher = ProfileDispatcher()
+    with pytest.raises(MissingAlleleState):
+        dispatcher.validate(data)
+    assert dispatcher.failures == {"Allele": 1}
+
+
+def test_iter_validate_streams_jsonl_and_counts(
+    valid_sequence, valid_allele, valid_variation
+):
+    broken_allele = deepcopy(valid_allele)
+    broken_allele["representation"].append(deepcopy(broken_allele["representation"][0]))
+    lines = [
+        json.dumps(valid_sequence).encode(),
+        json.dumps(valid_allele).encode(),
+        b"\n",
+        json.dumps(broken_allele).encode(),
+        b"{not json",
+        json.dumps(valid_variation).encode(),
+        json.dumps({"resourceType": "MolecularDefinition", "memberState": []}).encode(),
+    ]
+
+    dispatcher = ProfileDispatcher()
+    names = [name for name, _ in dispatcher.iter_validate(lines, skip_invalid=True)]
+
+    assert names == ["Sequence", "Allele", "Variation"]
+    assert dispatcher.counts == {"Sequence": 1, "Allele": 1, "Variation": 1}
+    assert dispatcher.failures == {"Allele": 1, "unknown": 2}
+
+
+def test_iter_validate_raises_by_default(valid_allele):
+    stream = ProfileDispatcher().iter_validate([{"memberState": []}, valid_allele])
+    with pytest.raises(UnknownProfileError):
+        next(stream)
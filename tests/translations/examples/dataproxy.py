@@ -0,0 +1,59 @@
+from collections import Counter
+
+from bioutils.accessions import coerce_namespace
+from ga4gh.core import sha512t24u
+from ga4gh.vrs.dataproxy import _DataProxy
+
+
+class InMemoryDataProxy(_DataProxy):
+    """A SeqRepo-free data proxy backed by a dict of RefSeq accession -> sequence.
+
+    Each sequence is also addressable by its `ga4gh:SQ.*` refget accession, mirroring the
+    aliases a SeqRepo-backed proxy returns. Calls are tallied in `calls` so tests can assert
+    how often the underlying store was hit.
+    """
+
+    def __init__(self, sequences):
+        self.calls = Counter()
+        self._records = {}
+        self._aliases = {}
+        for accession, sequence in sequences.items():
+            refget = f"ga4gh:SQ.{sha512t24u(sequence.encode())}"
+            record = {
+                "length": len(sequence),
+                "alphabet": "".join(sorted(set(sequence))),
+                "aliases": [f"refseq:{accession}", refget],
+                "sequence": sequence,
+            }
+            self._records[accession] = record
+            for alias in record["aliases"]:
+                self._aliases[alias] = record
+
+    def refget_accession(self, accession):
+        """Return the `SQ.*` refget accession for a RefSeq accession."""
+        return self._records[accession]["aliases"][1].split("ga4gh:")[-1]
+
+    def _lookup(self, identifier):
+        try:
+            return self._aliases[coerce_namespace(identifier)]
+        except (KeyError, ValueError) as e:
+            raise KeyError(identifier) from e
+
+    def get_sequence(self, identifier, start=None, end=None):
+        self.calls["get_sequence"] += 1
+        return self._lookup(identifier)["sequence"][start:end]
+
+    def get_metadata(self, identifier):
+        self.calls["get_metadata"] += 1
+        record = self._lookup(identifier)
+        return {key: value for key, value in record.items() if key != "sequence"}
+
+    def translate_sequence_identifier(self, identifier, namespace=None):
+        self.calls["translate_sequence_identifier"] += 1
+        try:
+            aliases = self.get_metadata(identifier)["aliases"]
+        except KeyError as e:
+            raise KeyError(identifier) from e
+        if namespace is not None:
+            aliases = [a for a in aliases if a.startswith(f"{namespace}:")]
+        return aliases
@@ -0,0 +1,83 @@
+import pytest
+from ga4gh.core import sha512t24u
+from ga4gh.vrs.models import Allele as VrsAllele
+
+from conventions.refseq_identifiers import translate_sequence_id
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    rle_member,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+from translators.vrs_to_fhir_allele import VrsToFhirAlleleTranslator
+from vrs_tools.alias_index import (
+    AliasIndexDataProxy,
+    RefgetAliasIndex,
+    write_alias_index,
+)
+
+
+def digest(i):
+    return sha512t24u(f"sequence-{i}".encode())
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def index_path(tmp_path, dp):
+    aliases = [(f"SQ.{digest(i)}", f"NC_{i:06d}.1") for i in range(500)]
+    aliases.append((f"ga4gh:SQ.{digest(7)}", "refseq:NG_000007.2"))
+    aliases.append((dp.refget_accession(REFERENCE_ACCESSION), REFERENCE_ACCESSION))
+    path = tmp_path / "aliases.idx"
+    write_alias_index(path, aliases)
+    return path
+
+
+def test_lookup(index_path):
+    with RefgetAliasIndex(index_path) as index:
+        assert len(index) == 502
+        assert index.lookup(f"ga4gh:SQ.{digest(42)}") == ["NC_000042.1"]
+        assert index.lookup(digest(7)) == ["NC_000007.1", "NG_000007.2"]
+        assert index.lookup(f"SQ.{sha512t24u(b'unknown')}") == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not-an-index"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError, match="not a refget alias index"):
+        RefgetAliasIndex(path)
+
+
+def test_translators_resolve_aliases_from_index(index_path, dp):
+    member = rle_member(dp.refget_accession(REFERENCE_ACCESSION), 30, 45, 18, 3)
+    expected = VrsToFhirAlleleTranslator(dp=dp).translate_to_dict(VrsAllele(**member))
+    dp.calls.clear()
+
+    with RefgetAliasIndex(index_path) as index:
+        indexed = AliasIndexDataProxy(dp, index)
+        assert (
+            translate_sequence_id(indexed, VrsAllele(**member)) == REFERENCE_ACCESSION
+        )
+        translator = VrsToFhirAlleleTranslator(dp=indexed)
+        assert translator.translate_to_dict(VrsAllele(**member)) == expected
+
+    # Only the reference subsequence is fetched; no alias lookups reach the data proxy.
+    assert set(dp.calls) == {"get_sequence"}
+
+
+def test_unindexed_identifiers_fall_back_to_dataproxy(tmp_path, dp):
+    path = tmp_path / "empty.idx"
+    write_alias_index(path, [])
+    refget = f"ga4gh:{dp.refget_accession(REFERENCE_ACCESSION)}"
+
+    with RefgetAliasIndex(path) as index:
+        aliases = AliasIndexDataProxy(dp, index).translate_sequence_identifier(
+            refget, namespace="refseq"
+        )
+
+    assert aliases == [f"refseq:{REFERENCE_ACCESSION}"]
+    assert dp.calls["translate_sequence_identifier"] == 1
@@ -0,0 +1,149 @@
+import multiprocessing
+import sqlite3
+
+import pytest
+from ga4gh.vrs.models import Allele as VrsAllele
+
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    lse_member,
+    rle_member,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+from translators.vrs_to_fhir_allele import VrsToFhirAlleleTranslator
+from vrs_tools.dataproxy import PersistentCacheDataProxy, seqrepo_snapshot_id
+
+
+def make_dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+REFGET_ACCESSION = make_dp().refget_accession(REFERENCE_ACCESSION)
+
+
+def translate_alleles(dp):
+    return [
+        VrsToFhirAlleleTranslator(dp=dp).translate_to_dict(VrsAllele(**member))
+        for member in (
+            rle_member(REFGET_ACCESSION, 30, 45, 18, 3),
+            lse_member(REFGET_ACCESSION, 4, 5, "A"),
+        )
+    ]
+
+
+def test_second_process_is_served_from_disk(tmp_path):
+    backing = make_dp()
+    with PersistentCacheDataProxy(backing, tmp_path / "dp.sqlite", "2024-12-20") as dp:
+        expected = translate_alleles(dp)
+        cold_calls = sum(backing.calls.values())
+
+    backing = make_dp()
+    with PersistentCacheDataProxy(backing, tmp_path / "dp.sqlite", "2024-12-20") as dp:
+        assert translate_alleles(dp) == expected
+        assert dp.misses == 0
+    assert cold_calls > 0
+    assert sum(backing.calls.values()) == 0
+
+
+def test_new_snapshot_invalidates_cache(tmp_path):
+    with PersistentCacheDataProxy(
+        make_dp(), tmp_path / "dp.sqlite", "2024-12-20"
+    ) as dp:
+        translate_alleles(dp)
+
+    backing = make_dp()
+    with PersistentCacheDataProxy(backing, tmp_path / "dp.sqlite", "2025-06-01") as dp:
+        translate_alleles(dp)
+        assert dp.misses > 0
+    assert sum(backing.calls.values()) > 0
+
+
+def test_large_sequences_are_not_stored(tmp_path):
+    backing = make_dp()
+    with PersistentCacheDataProxy(
+        backing, tmp_path / "dp.sqlite", "2024-12-20", max_sequence_length=10
+    ) as dp:
+        dp.get_sequence(REFERENCE_ACCESSION, 0, 5)
+        dp.get_sequence(REFERENCE_ACCESSION)
+        dp.get_sequence(REFERENCE_ACCESSION, 0, 5)
+        dp.get_sequence(REFERENCE_ACCESSION)
+
+    assert backing.calls["get_sequence"] == 3
+
+
+def _read_in_child(path, queue):
+    backing = make_dp()
+    dp = PersistentCacheDataProxy(backing, path, "2024-12-20")
+    translate_alleles(dp)
+    dp.close()
+    queue.put(sum(backing.calls.values()))
+
+
+def test_cache_is_shared_between_processes(tmp_path):
+    path = tmp_path / "dp.sqlite"
+    with PersistentCacheDataProxy(make_dp(), path, "2024-12-20") as dp:
+        translate_alleles(dp)
+
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_read_in_child, args=(path, queue)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [queue.get() for _ in workers] == [0, 0, 0]
+
+
+def test_two_writers_share_the_file(tmp_path):
+    path = tmp_path / "dp.sqlite"
+    # Two connections to one file behave like two processes sharing it.
+    with (
+        PersistentCacheDataProxy(make_dp(), path, "2024-12-20") as first,
+        PersistentCacheDataProxy(make_dp(), path, "2024-12-20") as second,
+    ):
+        first.get_sequence(REFERENCE_ACCESSION, 0, 5)
+        second.get_sequence(REFERENCE_ACCESSION, 5, 10)
+        second.flush()
+        first.flush()
+
+        assert not first.degraded and not second.degraded
+
+    backing = make_dp()
+    with PersistentCacheDataProxy(backing, path, "2024-12-20") as dp:
+        dp.get_sequence(REFERENCE_ACCESSION, 0, 5)
+        dp.get_sequence(REFERENCE_ACCESSION, 5, 10)
+    assert not backing.calls
+
+
+def test_locked_cache_degrades_to_the_backing_proxy(tmp_path):
+    path = tmp_path / "dp.sqlite"
+    expected = translate_alleles(make_dp())
+    backing = make_dp()
+    with PersistentCacheDataProxy(
+        backing, path, "2024-12-20", commit_every=1, timeout=0.05
+    ) as dp:
+        locker = sqlite3.connect(path, isolation_level=None)
+        locker.execute("BEGIN IMMEDIATE")
+        try:
+            assert translate_alleles(dp) == expected
+        finally:
+            locker.execute("ROLLBACK")
+            locker.close()
+
+        assert dp.degraded
+        calls = sum(backing.calls.values())
+        dp.get_sequence(REFERENCE_ACCESSION, 0, 5)
+        assert sum(backing.calls.values()) == calls + 1
+
+
+@pytest.mark.parametrize(
+    ("uri", "expected"),
+    [
+        ("seqrepo+file:///usr/local/share/seqrepo/2024-12-20", "2024-12-20"),
+        ("seqrepo+http://localhost:5001/seqrepo", None),
+    ],
+)
+def test_seqrepo_snapshot_id(uri, expected):
+    assert seqrepo_snapshot_id(uri) == expected
@@ -0,0 +1,113 @@
+import multiprocessing
+import random
+
+import pytest
+from hgvs.exceptions import HGVSParseError
+
+from vrs_tools import hgvs_tools
+from vrs_tools.hgvs_tools import (
+    HgvsParseCache,
+    HgvsToolsLite,
+    parse_simple_hgvs,
+    shared_parser,
+)
+
+EXPRESSIONS = [
+    "NC_000019.10:g.44908822C>T",
+    "NC_000013.11:g.32936732_32936733del",
+    "NM_000551.4:c.292_293insA",
+]
+
+
+def test_instances_share_one_parser():
+    assert HgvsToolsLite().parser is shared_parser()
+    assert HgvsToolsLite().parser is HgvsToolsLite().parser
+
+
+def test_parse_results_are_cached_by_expression():
+    cache = HgvsParseCache(maxsize=2)
+    tools = HgvsToolsLite(parse_cache=cache)
+
+    first = [tools.parse(expr) for expr in EXPRESSIONS]
+    again = tools.parse(EXPRESSIONS[-1])
+
+    assert [str(sv) for sv in first] == EXPRESSIONS
+    assert str(again) == EXPRESSIONS[-1]
+    assert again is not first[-1]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 3, 2)
+
+
+def test_unparseable_expressions_are_not_cached():
+    cache = HgvsParseCache()
+    tools = HgvsToolsLite(parse_cache=cache)
+
+    assert tools.parse("not hgvs") is None
+    with pytest.raises(HGVSParseError):
+        tools.parse("NC_000019.10:g.C>T")
+    assert len(cache) == 0
+
+
+def _parser_is_built():
+    return hgvs_tools._parser is not None
+
+
+def test_forked_workers_inherit_a_prebuilt_parser():
+    shared_parser()
+    with multiprocessing.get_context("fork").Pool(1) as pool:
+        assert pool.apply(_parser_is_built)
+
+
+def simple_corpus(seed=48, size=3000):
+    """Random g. and c. expressions of every shape the fast path reads."""
+    rng = random.Random(seed)  # noqa: S311
+
+    def bases(low, high):
+        return "".join(rng.choices("ACGTN", k=rng.randint(low, high)))
+
+    expressions = []
+    for _ in range(size):
+        ac = rng.choice(["NC_000019.10", "NG_012232.1", "NM_000551.4", "NR_046018.2"])
+        kind = "c" if ac.startswith(("NM", "NR")) else "g"
+        start = rng.randint(1, 10_000_000)
+        end = start + rng.randint(0, 9)
+        pos = str(start) if end == start or rng.random() < 0.2 else f"{start}_{end}"
+        edit = rng.choice(
+            [
+                f"{bases(1, 1)}>{bases(1, 1)}",
+                f"del{bases(0, 4)}",
+                f"del{bases(0, 3)}ins{bases(1, 4)}",
+                f"ins{bases(1, 6)}",
+                f"dup{bases(0, 4)}",
+                f"{bases(0, 3)}=",
+            ]
+        )
+        expressions.append(f"{ac}:{kind}.{pos}{edit}")
+    return expressions
+
+
+def test_fast_path_matches_full_parser():
+    tools = HgvsToolsLite(parse_cache=HgvsParseCache())
+    for expr in simple_corpus():
+        edit = parse_simple_hgvs(expr)
+        assert edit is not None, expr
+        assert edit == tools.edit_from_variant(tools.parse(expr)), expr
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "NM_000551.4:c.100+5A>G",
+        "NM_000551.4:c.-5del",
+        "NM_000551.4:c.*12_*13insT",
+        "NC_000013.11:g.32936732_32936734del3",
+        "NC_000019.10:g.44908822c>t",
+        "NM_000551.4(VHL):c.292_293insA",
+        "ENST00000256474.3:c.292_293insA",
+    ],
+)
+def test_other_shapes_fall_back_to_full_parser(expr):
+    tools = HgvsToolsLite(parse_cache=HgvsParseCache())
+
+    assert parse_simple_hgvs(expr) is None
+    if tools.parse(expr) is not None:
+        assert tools.parse_edit(expr) == tools.edit_from_variant(tools.parse(expr))
@@ -0,0 +1,142 @@
+import pickle
+import random
+
+import pytest
+from ga4gh.vrs.models import Allele, Range
+from ga4gh.vrs.normalize import normalize as vrs_normalize
+
+from exceptions.utils import ReferenceWindowExhaustedError
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+from vrs_tools.local_normalize import normalize_allele
+from vrs_tools.normalizer import VariantNormalizer
+
+ACCESSION = "NC_000002.12"
+
+
+def make_sequence(seed=45, length=4000):
+    """A random sequence interleaved with homopolymers and short and long tandem repeats."""
+    rng = random.Random(seed)  # noqa: S311
+    parts = []
+    while sum(map(len, parts)) < length:
+        parts.append("".join(rng.choices("ACGT", k=rng.randint(5, 60))))
+        unit = "".join(rng.choices("ACGT", k=rng.choice([1, 1, 2, 3, 4, 6])))
+        parts.append(unit * rng.randint(2, 40))
+    return "".join(parts)
+
+
+SEQUENCE = make_sequence()
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({ACCESSION: SEQUENCE})
+
+
+def allele(refget, start, end, alt):
+    return Allele(
+        location={
+            "type": "SequenceLocation",
+            "sequenceReference": {
+                "type": "SequenceReference",
+                "refgetAccession": refget,
+            },
+            "start": start,
+            "end": end,
+        },
+        state={"type": "LiteralSequenceExpression", "sequence": alt},
+    )
+
+
+def corpus(refget, seed=0, size=600):
+    """Random substitutions, indels, repeat expansions and contractions, and reference alleles."""
+    rng = random.Random(seed)  # noqa: S311
+    alleles = []
+    for _ in range(size):
+        start = rng.randrange(len(SEQUENCE))
+        end = min(len(SEQUENCE), start + rng.choice([0, 0, 1, 1, 2, 3, 4, 6, 9]))
+        ref = SEQUENCE[start:end]
+        kind = rng.choice(["random", "repeat", "delete", "reference", "flanked"])
+        if kind == "random":
+            alt = "".join(rng.choices("ACGT", k=rng.randint(0, 5)))
+        elif kind == "repeat":
+            alt = ref * rng.randint(2, 4)
+        elif kind == "delete":
+            alt = ""
+        elif kind == "reference":
+            alt = ref
+        else:
+            alt = ref[:1] + "".join(rng.choices("ACGT", k=rng.randint(0, 4))) + ref[1:]
+        alleles.append(allele(refget, start, end, alt))
+    # Alleles at both ends of the sequence.
+    alleles += [
+        allele(refget, 0, 0, SEQUENCE[:2]),
+        allele(refget, 0, 3, ""),
+        allele(refget, len(SEQUENCE), len(SEQUENCE), SEQUENCE[-3:]),
+        allele(refget, len(SEQUENCE) - 2, len(SEQUENCE), ""),
+    ]
+    return alleles
+
+
+def dump(allele):
+    return allele.model_dump(exclude_none=True)
+
+
+@pytest.mark.parametrize(
+    "reference", [SEQUENCE, SEQUENCE.encode()], ids=["str", "bytes"]
+)
+@pytest.mark.parametrize("rle_seq_limit", [50, 0, None])
+def test_matches_ga4gh_normalize(dp, reference, rle_seq_limit):
+    refget = dp.refget_accession(ACCESSION)
+    for a in corpus(refget):
+        expected = vrs_normalize(a, dp, rle_seq_limit=rle_seq_limit)
+        local = normalize_allele(a, reference, rle_seq_limit=rle_seq_limit)
+        assert dump(local) == dump(expected), dump(a)
+
+
+def test_matches_ga4gh_normalize_for_indefinite_ranges(dp):
+    refget = dp.refget_accession(ACCESSION)
+    repeat = SEQUENCE.index("AAAA")
+    a = allele(refget, repeat + 1, repeat + 2, "")
+    a.location.start = Range([None, repeat + 1])
+    a.location.end = Range([repeat + 2, None])
+
+    assert dump(normalize_allele(a, SEQUENCE)) == dump(vrs_normalize(a, dp))
+
+
+def test_partial_windows_report_the_side_to_widen(dp):
+    refget = dp.refget_accession(ACCESSION)
+    start = SEQUENCE.index("AAAA")
+    a = allele(refget, start + 2, start + 2, "A")
+    view = memoryview(SEQUENCE.encode())
+
+    with pytest.raises(ReferenceWindowExhaustedError) as excinfo:
+        normalize_allele(a, view[start + 1 : start + 50], start + 1, len(SEQUENCE))
+    assert excinfo.value.side == "left"
+    restored = pickle.loads(pickle.dumps(excinfo.value))  # noqa: S301
+    assert (restored.args, restored.side) == (excinfo.value.args, "left")
+
+    window = view[start - 10 : start + 200]
+    assert dump(normalize_allele(a, window, start - 10, len(SEQUENCE))) == dump(
+        vrs_normalize(a, dp)
+    )
+
+
+def test_variant_normalizer_local_engine(dp):
+    refget = dp.refget_accession(ACCESSION)
+    alleles = corpus(refget, seed=1, size=200)
+    expected = [VariantNormalizer(dp=dp).normalize(a) for a in alleles]
+    ga4gh_calls = dp.calls["get_sequence"]
+    dp.calls.clear()
+
+    # A tiny window forces the engine to widen it around the longer repeats.
+    local = VariantNormalizer(dp=dp, engine="local", window=2)
+    assert [dump(local.normalize(a)) for a in alleles] == [dump(a) for a in expected]
+    assert dp.calls["get_sequence"] < ga4gh_calls / 3
+    assert [dump(a) for a in local.normalize_many(alleles, padding=20)] == [
+        dump(a) for a in expected
+    ]
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError, match="Unknown normalization engine"):
+        VariantNormalizer(dp=InMemoryDataProxy({}), engine="fast")
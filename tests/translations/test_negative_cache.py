@@ -0,0 +1,96 @@
+import pytest
+from ga4gh.vrs.models import Allele as VrsAllele
+
+from conventions.refseq_identifiers import translate_sequence_id
+from exceptions.utils import UnknownAccessionError
+from pipelines.clinvar_translate import (
+    ClinvarTranslationPipeline,
+    load_summary,
+    merge_summaries,
+)
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    UNKNOWN_REFGET_ACCESSION,
+    lse_member,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+from vrs_tools.dataproxy import NegativeCacheDataProxy
+
+UNKNOWN = f"ga4gh:{UNKNOWN_REFGET_ACCESSION}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+def unknown_allele():
+    member = lse_member(UNKNOWN_REFGET_ACCESSION, 1, 2, "T")
+    del member["location"]["sequenceReference"]["moleculeType"]
+    return member
+
+
+def test_unknown_accession_is_remembered_until_ttl(dp):
+    clock = FakeClock()
+    cached = NegativeCacheDataProxy(dp, ttl=60, clock=clock)
+    allele = VrsAllele(**unknown_allele())
+
+    for _ in range(100):
+        with pytest.raises(UnknownAccessionError) as excinfo:
+            translate_sequence_id(cached, allele)
+    assert excinfo.value.accession == UNKNOWN
+    assert dp.calls["translate_sequence_identifier"] == 1
+    assert cached.negative_hits == 99
+    assert cached.unknown == {UNKNOWN: 100}
+
+    clock.now = 61
+    with pytest.raises(UnknownAccessionError):
+        translate_sequence_id(cached, allele)
+    assert dp.calls["translate_sequence_identifier"] == 2
+
+
+def test_known_accessions_pass_through(dp):
+    cached = NegativeCacheDataProxy(dp)
+    refget = f"ga4gh:{dp.refget_accession(REFERENCE_ACCESSION)}"
+
+    assert cached.translate_sequence_identifier(refget, namespace="refseq") == [
+        f"refseq:{REFERENCE_ACCESSION}"
+    ]
+    assert cached.translate_sequence_identifier(refget, namespace="NCBI") == []
+    assert cached.translate_sequence_identifier(refget, namespace="NCBI") == []
+    assert cached.get_sequence(REFERENCE_ACCESSION, 0, 3) == REFERENCE_SEQUENCE[:3]
+    assert dp.calls["translate_sequence_identifier"] == 2
+    assert cached.unknown == {refget: 2}
+
+
+def test_pipeline_reports_unknown_accessions(tmp_path, monkeypatch, dp):
+    monkeypatch.chdir(tmp_path)
+    refget = dp.refget_accession(REFERENCE_ACCESSION)
+    records = [
+        {"id": f"clinvar:{i}", "members": [unknown_allele()]} for i in range(50)
+    ] + [{"id": "clinvar:50", "members": [lse_member(refget, 4, 5, "A")]}]
+    inputfile = write_clinvar_gzip(tmp_path / "variations.jsonl.gz", records)
+
+    pipeline = ClinvarTranslationPipeline(dp=NegativeCacheDataProxy(dp))
+    pipeline.run(
+        inputfile=inputfile,
+        outputfile=tmp_path / "translations.jsonl",
+        invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+        invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+    )
+
+    summary = load_summary("runtime_stats.txt")
+    assert summary.failed_vrs_to_fhir_translation == 50
+    assert summary.unknown_accessions == {UNKNOWN: 50}
+    assert dp.calls["get_metadata"] <= 2
+    assert merge_summaries([summary, summary]).unknown_accessions == {UNKNOWN: 100}
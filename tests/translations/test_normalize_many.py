@@ -0,0 +1,125 @@
+import itertools
+
+import pytest
+from ga4gh.vrs.models import Allele
+
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+from vrs_tools import normalizer
+from vrs_tools.dataproxy import SequenceWindowDataProxy
+from vrs_tools.normalizer import VariantNormalizer
+
+ACCESSION = "NC_000001.11"
+
+
+def make_sequence():
+    """A pseudo-random sequence with a few tandem repeats, including a 120-base one."""
+    bases = "".join("ACGT"[(i * 7 + i // 5 + (i * i) % 11) % 4] for i in range(3000))
+    return (
+        bases[:400]
+        + "CAG" * 10
+        + bases[400:1200]
+        + "AT" * 60
+        + bases[1200:2500]
+        + "GGC" * 8
+        + bases[2500:]
+    )
+
+
+SEQUENCE = make_sequence()
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({ACCESSION: SEQUENCE})
+
+
+def allele(refget, start, end, alt):
+    return Allele(
+        location={
+            "type": "SequenceLocation",
+            "sequenceReference": {
+                "type": "SequenceReference",
+                "refgetAccession": refget,
+            },
+            "start": start,
+            "end": end,
+        },
+        state={"type": "LiteralSequenceExpression", "sequence": alt},
+    )
+
+
+def test_normalize_many_matches_normalize(dp):
+    refget = dp.refget_accession(ACCESSION)
+    repeat_start = SEQUENCE.index("ATATAT")
+    specs = [
+        (403, 406, ""),  # CAG deletion inside a repeat
+        (400, 400, "CAG"),  # CAG insertion at the start of the repeat
+        (410, 411, "T"),  # substitution
+        (repeat_start + 2, repeat_start + 2, "AT"),  # insertion rolling over 120 bases
+        (repeat_start + 10, repeat_start + 14, ""),
+        (2900, 2903, "GGC"),
+        (2950, 2950, "GGCGGC"),
+        (3100, 3101, "A"),
+        (50, 52, "TT"),
+    ]
+    alleles = [allele(refget, *spec) for spec in specs]
+
+    expected = [
+        VariantNormalizer(dp=dp).normalize(a.model_copy(deep=True)) for a in alleles
+    ]
+    single_calls = dp.calls["get_sequence"]
+    dp.calls.clear()
+    batched = VariantNormalizer(dp=dp).normalize_many(alleles, padding=20)
+
+    assert [a.model_dump(exclude_none=True) for a in batched] == [
+        a.model_dump(exclude_none=True) for a in expected
+    ]
+    assert dp.calls["get_sequence"] < single_calls / 5
+
+
+class ReadRecordingDataProxy(InMemoryDataProxy):
+    def __init__(self, sequences):
+        super().__init__(sequences)
+        self.reads = []
+
+    def get_sequence(self, identifier, start=None, end=None):
+        self.reads.append((start, end))
+        return super().get_sequence(identifier, start, end)
+
+
+def test_dense_alleles_are_split_into_capped_windows(monkeypatch):
+    dp = ReadRecordingDataProxy({ACCESSION: SEQUENCE})
+    refget = dp.refget_accession(ACCESSION)
+    # Every allele is within 2 * padding of the next, so without the cap they form one cluster.
+    alleles = [allele(refget, p, p + 1, "T") for p in range(100, 3000, 30)]
+    expected = [
+        VariantNormalizer(dp=dp).normalize(a.model_copy(deep=True)) for a in alleles
+    ]
+    monkeypatch.setattr(normalizer, "_MAX_WINDOW_LENGTH", 300)
+    dp.reads.clear()
+
+    batched = VariantNormalizer(dp=dp).normalize_many(alleles, padding=20)
+
+    assert [a.model_dump(exclude_none=True) for a in batched] == [
+        a.model_dump(exclude_none=True) for a in expected
+    ]
+    windows = [end - start for start, end in dp.reads]
+    assert len(windows) >= 9
+    assert max(windows) <= 300 + 2 * 20
+
+
+def test_windows_grow_past_their_edges(dp):
+    identifier = f"ga4gh:{dp.refget_accession(ACCESSION)}"
+    windows = SequenceWindowDataProxy(dp, growth=50)
+    windows.load_window(identifier, 1000, 1100)
+
+    for start, end in itertools.pairwise(range(1000, 1300, 25)):
+        assert windows.get_sequence(identifier, start, end) == SEQUENCE[start:end]
+    assert windows.get_sequence(identifier, 980, 1010) == SEQUENCE[980:1010]
+    assert windows.get_sequence(identifier, 5000, 5010) == SEQUENCE[5000:5010]
+    assert (
+        windows.get_sequence(identifier, len(SEQUENCE) - 5, len(SEQUENCE) + 5)
+        == (SEQUENCE[-5:])
+    )
+    # One load, four extensions to the right, one to the left; the distant reads went through.
+    assert windows.fetches == 6
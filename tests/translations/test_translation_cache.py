@@ -0,0 +1,197 @@
+import sqlite3
+
+import orjson
+import pytest
+from ga4gh.vrs.models import Allele as VrsAllele
+
+from pipelines.clinvar_translate import ClinvarTranslationPipeline
+from profiles.allele import Allele as FhirAllele
+from tests.pipelines.examples.clinvar_records import (
+    REFERENCE_ACCESSION,
+    REFERENCE_SEQUENCE,
+    clinvar_records,
+    lse_member,
+    rle_member,
+    write_clinvar_gzip,
+)
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+from translators import translation_cache
+from translators.translation_cache import (
+    TranslationCache,
+    translation_version_stamp,
+    vrs_cache_key,
+)
+from translators.vrs_to_fhir_allele import VrsToFhirAlleleTranslator
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy({REFERENCE_ACCESSION: REFERENCE_SEQUENCE})
+
+
+@pytest.fixture
+def rle_allele(dp):
+    return rle_member(dp.refget_accession(REFERENCE_ACCESSION), 30, 45, 18, 3)
+
+
+def test_repeated_allele_served_from_cache(tmp_path, dp, rle_allele):
+    expected = VrsToFhirAlleleTranslator(dp=dp).translate(VrsAllele(**rle_allele))
+    dp.calls.clear()
+
+    with TranslationCache(tmp_path / "cache.sqlite") as cache:
+        translator = VrsToFhirAlleleTranslator(dp=dp, cache=cache)
+        first = translator.translate(VrsAllele(**rle_allele))
+        calls_after_first = sum(dp.calls.values())
+        second = translator.translate(VrsAllele(**rle_allele))
+
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    assert calls_after_first > 0
+    assert sum(dp.calls.values()) == calls_after_first
+    assert isinstance(second, FhirAllele)
+    assert (
+        first.model_dump(exclude_none=True)
+        == second.model_dump(exclude_none=True)
+        == expected.model_dump(exclude_none=True)
+    )
+
+
+def test_translate_leaves_the_input_allele_unchanged(tmp_path, dp, rle_allele):
+    with TranslationCache(tmp_path / "cache.sqlite") as cache:
+        translator = VrsToFhirAlleleTranslator(dp=dp, cache=cache)
+        miss, hit = VrsAllele(**rle_allele), VrsAllele(**rle_allele)
+        translator.translate(miss)
+        translator.translate(hit)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+    uncached = VrsAllele(**rle_allele)
+    VrsToFhirAlleleTranslator(dp=dp).translate(uncached)
+
+    for allele in (miss, hit, uncached):
+        assert allele.model_dump(exclude_none=True) == VrsAllele(
+            **rle_allele
+        ).model_dump(exclude_none=True)
+
+
+def test_cache_persists_across_instances(tmp_path, dp, rle_allele):
+    path = tmp_path / "cache.sqlite"
+    with TranslationCache(path) as cache:
+        VrsToFhirAlleleTranslator(dp=dp, cache=cache).translate_to_dict(
+            VrsAllele(**rle_allele)
+        )
+
+    dp.calls.clear()
+    with TranslationCache(path) as cache:
+        assert len(cache) == 1
+        fhir = VrsToFhirAlleleTranslator(dp=dp, cache=cache).translate_to_dict(
+            VrsAllele(**rle_allele)
+        )
+    assert not dp.calls
+    assert fhir["representation"][0]["literal"]["value"] == "CAG" * 6
+
+
+def test_key_covers_non_digest_fields(dp):
+    refget = dp.refget_accession(REFERENCE_ACCESSION)
+    plain = VrsAllele(**lse_member(refget, 4, 5, "A"))
+    named = VrsAllele(**lse_member(refget, 4, 5, "A", "ga4gh:VA.example-1"))
+
+    assert vrs_cache_key(plain) != vrs_cache_key(named)
+    assert vrs_cache_key(plain) == vrs_cache_key(plain.model_dump(exclude_none=True))
+
+
+def test_version_stamp_change_clears_cache(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    with TranslationCache(path) as cache:
+        cache.put("key", {"resourceType": "MolecularDefinition"})
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE meta SET value = 'stale' WHERE key = 'version_stamp'")
+    conn.close()
+
+    with TranslationCache(path) as cache:
+        assert len(cache) == 0
+        assert cache.get("key") is None
+
+
+def test_translator_source_change_changes_version_stamp(tmp_path, monkeypatch):
+    package = tmp_path / "fake_translator"
+    package.mkdir()
+    module = package / "__init__.py"
+    module.write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(tmp_path)
+    monkeypatch.setattr(translation_cache, "TRANSLATOR_PACKAGES", ("fake_translator",))
+
+    def stamp():
+        translation_cache.translator_source_digest.cache_clear()
+        return translation_version_stamp()
+
+    before = stamp()
+    assert stamp() == before
+    module.write_text("VALUE = 2\n")
+    assert stamp() != before
+    translation_cache.translator_source_digest.cache_clear()
+
+
+def test_pipeline_reuses_cache_across_runs(tmp_path, monkeypatch, dp):
+    monkeypatch.chdir(tmp_path)
+    records = clinvar_records(dp.refget_accession(REFERENCE_ACCESSION))
+    inputfile = write_clinvar_gzip(tmp_path / "variations.jsonl.gz", records)
+
+    def run(name):
+        with TranslationCache(tmp_path / "cache.sqlite") as cache:
+            ClinvarTranslationPipeline(dp=dp, cache=cache).run(
+                inputfile=inputfile,
+                outputfile=tmp_path / f"{name}.jsonl",
+                invalid_allele_path=tmp_path / "invalid_alleles.jsonl",
+                invalid_fhir_path=tmp_path / "invalid_fhir.jsonl",
+            )
+        return [
+            orjson.loads(line)
+            for line in (tmp_path / f"{name}.jsonl").read_bytes().splitlines()
+        ]
+
+    first = run("first")
+    dp.calls.clear()
+    second = run("second")
+
+    assert len(first) == 4
+    assert first == second
+    # Only the allele that failed translation goes back to the data proxy.
+    assert dp.calls["get_sequence"] == 0
+    assert first[1]["vrs_allele"]["state"]["type"] == "ReferenceLengthExpression"
+
+
+def test_two_writers_share_the_file(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    # Two connections to one file behave like two processes sharing it.
+    with TranslationCache(path) as first, TranslationCache(path) as second:
+        for i in range(5):
+            first.put(f"first-{i}", {"id": i})
+        for i in range(5):
+            second.put(f"second-{i}", {"id": i})
+        second.flush()
+        first.flush()
+
+        assert first.errors == second.errors == 0
+        assert first.get("second-0") == b'{"id":0}'
+        assert len(second) == 10
+
+
+def test_locked_cache_does_not_fail_translation(tmp_path, dp, rle_allele):
+    path = tmp_path / "cache.sqlite"
+    expected = VrsToFhirAlleleTranslator(dp=dp).translate_to_dict(
+        VrsAllele(**rle_allele)
+    )
+    with TranslationCache(path, commit_every=1, timeout=0.05) as cache:
+        locker = sqlite3.connect(path, isolation_level=None)
+        locker.execute("BEGIN IMMEDIATE")
+        try:
+            translator = VrsToFhirAlleleTranslator(dp=dp, cache=cache)
+            assert translator.translate_to_dict(VrsAllele(**rle_allele)) == expected
+            assert cache.errors == 1
+        finally:
+            locker.execute("ROLLBACK")
+            locker.close()
+
+        assert translator.translate_to_dict(VrsAllele(**rle_allele)) == expected
+        assert (cache.hits, cache.misses) == (0, 2)
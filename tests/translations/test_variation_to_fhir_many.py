@@ -0,0 +1,232 @@
+import random
+
+import pytest
+
+from exceptions.utils import UnknownAccessionError
+from tests.translations.examples.dataproxy import InMemoryDataProxy
+from translators import variation_to_fhir
+from translators.variation_to_fhir import VariationToFhirTranslator
+
+rng = random.Random(49)  # noqa: S311
+SEQUENCES = {
+    "NC_000019.10": "".join(rng.choices("ACGT", k=20_000)),
+    "NC_000013.11": "".join(rng.choices("ACGT", k=5_000)),
+}
+
+
+class StrictDataProxy(InMemoryDataProxy):
+    """Rejects reads that run outside the sequence, as a SeqRepo-backed proxy may."""
+
+    def get_sequence(self, identifier, start=None, end=None):
+        length = self._lookup(identifier)["length"]
+        if start is not None and not 0 <= start <= end <= length:
+            raise ValueError(f"Out of range read {identifier}[{start}:{end}]")
+        return super().get_sequence(identifier, start, end)
+
+
+class AccessionCheckingDataProxy(InMemoryDataProxy):
+    """Reports unknown sequences as `UnknownAccessionError`, naming the accession."""
+
+    def get_sequence(self, identifier, start=None, end=None):
+        try:
+            return super().get_sequence(identifier, start, end)
+        except KeyError as e:
+            raise UnknownAccessionError(
+                f"Unknown sequence ID '{identifier}'.", accession=identifier
+            ) from e
+
+
+@pytest.fixture
+def dp():
+    return InMemoryDataProxy(SEQUENCES)
+
+
+@pytest.fixture
+def strict_dp():
+    return StrictDataProxy(SEQUENCES)
+
+
+def spdi_corpus(seed=0, size=400):
+    rng = random.Random(seed)  # noqa: S311
+    spdis = []
+    for _ in range(size):
+        accession = rng.choice(list(SEQUENCES))
+        position = rng.randrange(len(SEQUENCES[accession]))
+        deleted = SEQUENCES[accession][position : position + rng.randint(0, 5)]
+        if rng.random() < 0.5:
+            deleted = str(len(deleted))
+        inserted = "".join(rng.choices("ACGT", k=rng.randint(0, 4)))
+        spdis.append(f"{accession}:{position}:{deleted}:{inserted}")
+    return spdis
+
+
+def outcome(translate, expression):
+    try:
+        return translate(expression).model_dump(exclude_none=True)
+    except Exception as e:
+        return type(e)
+
+
+def dump_many(results):
+    return [
+        type(r) if isinstance(r, Exception) else r.model_dump(exclude_none=True)
+        for r in results
+    ]
+
+
+def test_translate_spdi_many_matches_translate(dp):
+    spdis = spdi_corpus() + [
+        "NC_000019.10:19998:5:",
+        "NC_000019.10:100:AC",
+        "NC_000019.10:x:1:T",
+        "NC_999999.1:10:1:T",
+        12345,
+    ]
+    translator = VariationToFhirTranslator(dp=dp)
+    expected = [outcome(lambda s: translator.translate(s, "spdi"), s) for s in spdis]
+    dp.calls.clear()
+
+    results = VariationToFhirTranslator(dp=dp).translate_spdi_many(spdis)
+
+    assert dump_many(results) == expected
+    assert dp.calls["translate_sequence_identifier"] == 3
+    # Positions are dense enough that each sequence is read once.
+    assert dp.calls["get_sequence"] == 2
+
+
+def test_distant_deletions_are_read_separately(dp):
+    spdis = ["NC_000019.10:100:3:", "NC_000019.10:5000:3:", "NC_000019.10:5010:3:"]
+
+    results = VariationToFhirTranslator(dp=dp).translate_spdi_many(spdis, gap=100)
+
+    assert [r.representation[0].literal.value for r in results] == [
+        SEQUENCES["NC_000019.10"][p : p + 3] for p in (100, 5000, 5010)
+    ]
+    assert dp.calls["get_sequence"] == 2
+
+
+def test_profiles_of_one_sequence_share_no_models(dp, monkeypatch):
+    monkeypatch.setattr(variation_to_fhir, "_SEQUENCE_VALUES_MAXSIZE", 1)
+    translator = VariationToFhirTranslator(dp=dp)
+    first, second = translator.translate_spdi_many(
+        ["NC_000019.10:100:3:", "NC_000019.10:200:3:"]
+    )
+    expected = second.model_dump(exclude_none=True)
+
+    first.location[0].sequenceLocation.sequenceContext.display = "changed"
+    first.moleculeType.coding[0].code = "changed"
+    first.location[0].sequenceLocation.coordinateInterval.coordinateSystem.origin = None
+    third = translator.translate_spdi_many(["NC_000019.10:200:3:"])[0]
+
+    assert second.model_dump(exclude_none=True) == expected
+    assert third.model_dump(exclude_none=True) == expected
+
+    translator.translate_spdi_many(["NC_000013.11:10:1:T"])
+    assert list(translator._sequence_values) == [("NC_000013.11", "spdi")]
+
+
+def test_translate_spdi_many_keeps_rejected_reads_to_their_rows(strict_dp):
+    end = len(SEQUENCES["NC_000019.10"])
+    spdis = [
+        "NC_000019.10:10:2:T",
+        "NC_000019.10:-5:3:",
+        f"NC_000019.10:{end - 20}:2:",
+        f"NC_000019.10:{end - 10}:30:",
+    ]
+    translator = VariationToFhirTranslator(dp=strict_dp)
+    expected = [outcome(lambda s: translator.translate(s, "spdi"), s) for s in spdis]
+
+    results = VariationToFhirTranslator(dp=strict_dp).translate_spdi_many(spdis)
+
+    assert dump_many(results) == expected
+    assert [type(r) for r in results][1::2] == [ValueError, ValueError]
+
+
+def hgvs_corpus(seed=0, size=400):
+    rng = random.Random(seed)  # noqa: S311
+    expressions = []
+    for _ in range(size):
+        accession = rng.choice(list(SEQUENCES))
+        sequence = SEQUENCES[accession]
+        start = rng.randint(1, len(sequence) - 10)
+        end = start + rng.randint(0, 4)
+        span = str(start) if end == start else f"{start}_{end}"
+        ref = sequence[start - 1]
+        inserted = "".join(rng.choices("ACGT", k=rng.randint(1, 4)))
+        posedit = rng.choice(
+            [
+                f"{start}{ref}>{'A' if ref == 'T' else 'T'}",
+                f"{span}del",
+                f"{span}delins{inserted}",
+                f"{start}_{start + 1}ins{inserted}",
+                f"{span}dup",
+                f"{span}=",
+                f"{start}_{start + 1}inv",
+            ]
+        )
+        expressions.append(f"{accession}:g.{posedit}")
+    return expressions
+
+
+def test_translate_hgvs_many_matches_translate(dp):
+    expressions = hgvs_corpus() + [
+        "NC_000019.10:g.100_101insTT",
+        "NC_000019.10:g.19999_20000del",
+        "NM_000551.4:c.100+5A>G",
+        "NC_999999.1:g.10del",
+        "not hgvs",
+    ]
+    translator = VariationToFhirTranslator(dp=dp)
+    expected = [
+        outcome(lambda e: translator.translate(e, "hgvs"), e) for e in expressions
+    ]
+    dp.calls.clear()
+
+    results = VariationToFhirTranslator(dp=dp).translate_hgvs_many(expressions)
+
+    assert dump_many(results) == expected
+    assert {ValueError, KeyError} <= {e for e in expected if isinstance(e, type)}
+    # One merged read per sequence, plus one for the unknown accession.
+    assert dp.calls["get_sequence"] == 3
+
+
+def test_translate_hgvs_many_in_a_process_pool(dp):
+    expressions = hgvs_corpus(seed=1, size=60)
+    translator = VariationToFhirTranslator(dp=dp)
+    expected = dump_many(translator.translate_hgvs_many(expressions))
+
+    results = translator.translate_hgvs_many(expressions, processes=2, chunksize=16)
+
+    assert dump_many(results) == expected
+
+
+def test_translate_hgvs_many_returns_worker_errors_intact():
+    expressions = hgvs_corpus(seed=2, size=8)
+    expressions[3:3] = ["NC_999999.1:g.10del", "NC_000019.10:g.100_101insTT"]
+    translator = VariationToFhirTranslator(dp=AccessionCheckingDataProxy(SEQUENCES))
+    expected = translator.translate_hgvs_many(expressions)
+
+    results = translator.translate_hgvs_many(expressions, processes=2, chunksize=2)
+
+    assert dump_many(results) == dump_many(expected)
+    error = results[3]
+    assert isinstance(error, UnknownAccessionError)
+    assert (error.args, error.accession) == (expected[3].args, "NC_999999.1")
+
+
+def test_translate_hgvs_many_keeps_rejected_reads_to_their_rows(strict_dp):
+    end = len(SEQUENCES["NC_000013.11"])
+    expressions = [
+        f"NC_000013.11:g.{end - 20}_{end - 19}del",
+        f"NC_000013.11:g.{end - 10}_{end + 100}del",
+        f"NC_000013.11:g.{end - 5}dup",
+    ]
+    translator = VariationToFhirTranslator(dp=strict_dp)
+    expected = [
+        outcome(lambda e: translator.translate(e, "hgvs"), e) for e in expressions
+    ]
+
+    results = VariationToFhirTranslator(dp=strict_dp).translate_hgvs_many(expressions)
+
+    assert dump_many(results) == expected
+    assert [isinstance(r, Exception) for r in results] == [False, True, False]